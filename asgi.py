@@ -0,0 +1,404 @@
+"""
+ASGI entry point for the Property Management API.
+
+Serves the API from an asyncio event loop, e.g.:
+
+    uvicorn asgi:app --workers 4
+
+The hot read endpoints are answered natively on an ``AsyncSession``
+(asyncpg on PostgreSQL, aiosqlite on SQLite), so a worker keeps serving
+other requests while it waits on the database:
+
+    - GET /<resource>/             (keyset paginated list, ?limit=&after=)
+    - GET /<resource>/<id>/        (single object)
+
+for tenants, tenancies, properties, property managers and support workers.
+They reuse the models, the compiled serializers, the response cache and the
+ETags of the Flask app: the body, ETag, Cache-Control, Vary and
+Content-Encoding headers and the cache entries are the same as the Flask
+view's, compressed with the same negotiated encoding and size threshold
+(``utils.compression``).
+
+Like the Flask views, native reads go to a read replica from
+DATABASE_REPLICA_URLS (round-robin, sharing the health of
+``utils.replicas``) and read the table versions in the same session as the
+data. Calls that block (a Redis cache backend or version store,
+compression) run in a worker thread with ``asyncio.to_thread`` so they
+never stall the event loop.
+
+Differences from the Flask views: native responses have no Server-Timing
+header and are not seen by the query monitor (``utils.query_monitor``), so
+query budgets and N+1 logging only apply to requests served by Flask.
+
+Every other request, including lists with extra query parameters (streaming,
+search, sparse fieldsets), is passed to the Flask app created by
+``main.create_app`` through ``asgiref``'s WsgiToAsgi adapter, which runs it
+in a thread pool.
+
+"""
+
+# Standard library imports
+import asyncio
+import os
+import re
+from urllib.parse import parse_qsl
+
+# Third-party imports
+from asgiref.wsgi import WsgiToAsgi
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+# Application modules
+from main import create_app
+from extensions import cache, compression
+from utils.etag import etag_for
+from utils.serializers import serialize
+from utils.pagination import is_ascii_integer
+from utils.table_versions import DatabaseVersions, versions_select
+from models.tenant import Tenant
+from models.tenancy import Tenancy
+from models.property import Property
+from models.property_manager import PropertyManager
+from models.support_worker import SupportWorker
+from schemas.tenant_schema import tenant_schema, tenants_schema
+from schemas.tenancy_schema import tenancy_schema, tenancies_schema
+from schemas.property_schema import property_schema, properties_schema
+from schemas.property_manager_schema import property_manager_schema, property_managers_schema
+from schemas.support_worker_schema import support_worker_schema, support_workers_schema
+
+# URL prefix -> (model, list schema, single schema, 404 description)
+RESOURCES = {
+    "tenants": (Tenant, tenants_schema, tenant_schema, "Tenant does not exist"),
+    "tenancies": (Tenancy, tenancies_schema, tenancy_schema, "Tenancy does not exist"),
+    "properties": (Property, properties_schema, property_schema, "Property does not exist"),
+    "property_managers": (
+        PropertyManager, property_managers_schema, property_manager_schema,
+        "Property Manager does not exist"
+    ),
+    "support_workers": (
+        SupportWorker, support_workers_schema, support_worker_schema,
+        "Support Worker does not exist"
+    ),
+}
+
+ROUTE = re.compile(r"^/(?P<resource>[a-z_]+)/(?:(?P<id>\d+)/)?$")
+
+# Async drivers replacing the configured sync driver
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_database_url(url):
+    """
+    Return the asyncio equivalent of a database URL.
+
+    Args:
+        url (str): Sync URL, e.g. ``postgresql+psycopg2://...``.
+
+    Returns:
+        URL: The same database with an async driver (asyncpg, aiosqlite).
+
+    Raises:
+        ValueError: If the database has no supported async driver.
+    """
+    url = make_url(url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver for {url.get_backend_name()}; set ASYNC_DATABASE_URL")
+    return url.set(drivername=driver)
+
+
+def async_engine_options(options, url):
+    """
+    Adapt the sync ``SQLALCHEMY_ENGINE_OPTIONS`` to an async engine.
+
+    The instrumented QueuePool is sync-only, so the async engine uses its
+    default pool with the same sizing. asyncpg takes the statement timeout
+    as a server setting instead of libpq ``options``.
+    """
+    options = dict(options)
+    options.pop("poolclass", None)
+    connect_args = options.pop("connect_args", {})
+    timeout = re.search(r"statement_timeout=(\d+)", connect_args.get("options", ""))
+    if timeout and url.get_backend_name() == "postgresql":
+        options["connect_args"] = {"server_settings": {"statement_timeout": timeout.group(1)}}
+    return options
+
+
+class AsyncAPI:
+    """
+    ASGI application serving the native async routes and delegating the rest.
+
+    Attributes:
+        flask_app (Flask): The WSGI application (config, JSON provider, fallback).
+        fallback (WsgiToAsgi): ASGI adapter around ``flask_app``.
+        engine (AsyncEngine): Async engine for the primary database.
+        sessions (async_sessionmaker): Factory for per-request AsyncSessions.
+        router (ReplicaRouter): The Flask app's read replicas and their health.
+        replica_engines (dict[str, AsyncEngine]): Async engine per replica name.
+    """
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.fallback = WsgiToAsgi(flask_app)
+        config = flask_app.config
+        url = make_url(
+            os.environ.get("ASYNC_DATABASE_URL")
+            or async_database_url(config["SQLALCHEMY_DATABASE_URI"])
+        )
+        self.engine = create_async_engine(
+            url, **async_engine_options(config.get("SQLALCHEMY_ENGINE_OPTIONS", {}), url)
+        )
+        self.sessions = async_sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.router = flask_app.extensions["replicas"]
+        replica_options = config.get("DATABASE_REPLICA_ENGINE_OPTIONS", {})
+        self.replica_engines = {}
+        for replica, replica_url in zip(self.router.replicas, config.get("DATABASE_REPLICA_URLS", [])):
+            async_url = async_database_url(replica_url)
+            self.replica_engines[replica.name] = create_async_engine(
+                async_url, **async_engine_options(replica_options.get(replica_url, {}), async_url)
+            )
+        self.default_limit = config.get("PAGINATION_DEFAULT_LIMIT", 50)
+        self.max_limit = config.get("PAGINATION_MAX_LIMIT", 500)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] == "http" and scope["method"] == "GET":
+            handled = await self._dispatch(scope, send)
+            if handled:
+                return
+        await self.fallback(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def dispose(self):
+        """Close the connections of the primary and replica engines."""
+        for engine in (self.engine, *self.replica_engines.values()):
+            await engine.dispose()
+
+    async def _dispatch(self, scope, send):
+        """Serve a request natively; return False to hand it to Flask."""
+        match = ROUTE.match(scope["path"])
+        if not match or match["resource"] not in RESOURCES:
+            return False
+        headers = dict(scope["headers"])
+        args = parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)
+        if b"application/x-ndjson" in headers.get(b"accept", b""):
+            return False
+
+        model, many_schema, schema, not_found = RESOURCES[match["resource"]]
+        if match["id"] is not None:
+            if args:
+                return False
+            await self._get_one(scope, send, headers, model, schema, int(match["id"]), not_found)
+            return True
+
+        page = self._page_args(args)
+        if page is None:
+            # Unknown or invalid parameters: let Flask answer (or reject) them
+            return False
+        await self._get_page(scope, send, headers, args, model, many_schema, page)
+        return True
+
+    def _page_args(self, args):
+        """Return ``(limit, after)`` if ``args`` only holds valid paging parameters."""
+        values = dict(args)
+        if len(values) != len(args) or set(values) - {"limit", "after"}:
+            return None
+        limit, after = values.get("limit"), values.get("after")
+        if limit is not None and not is_ascii_integer(limit):
+            return None
+        if after is not None and not is_ascii_integer(after):
+            return None
+        limit = int(limit) if limit is not None else self.default_limit
+        if limit < 1:
+            return None
+        return min(limit, self.max_limit), int(after) if after is not None else None
+
+    async def _connect_replica(self):
+        """
+        Open an AsyncSession on the next healthy read replica, round-robin.
+
+        Connecting up front means an unreachable replica is skipped (and
+        taken out of rotation for every worker thread) before any query is
+        sent to it. Versions kept outside the database can be ahead of a
+        lagging replica, so with CACHE_VERSION_STORE="backend" reads use
+        the primary, as in the Flask app.
+
+        Returns:
+            AsyncSession | None: The connected session, or None to use the primary.
+        """
+        if not self.replica_engines or not isinstance(cache.version_store, DatabaseVersions):
+            return None
+        for _ in range(len(self.router.replicas)):
+            replica, due = self.router.next_replica()
+            if not (replica.healthy or due):
+                continue
+            session = self.sessions(bind=self.replica_engines[replica.name])
+            try:
+                await session.connection()
+            except (DBAPIError, OSError):
+                await session.close()
+                self.router.mark_unhealthy(replica)
+                continue
+            if due:
+                self.router.mark_healthy(replica)
+            self.router.record_read(replica)
+            return session
+        return None
+
+    async def _session(self):
+        """Return the session for a native read, on a replica if one is available."""
+        return await self._connect_replica() or self.sessions()
+
+    async def _version_stamp(self, session, table_names):
+        """
+        Read the versions of ``table_names`` and return ``(versions, stamp)``.
+
+        The "database" version store is read in ``session``, i.e. on the
+        same database (replica) as the data, before the data; other stores
+        may do network I/O (Redis), so they are read in a worker thread.
+        """
+        store = cache.version_store
+        if not isinstance(store, DatabaseVersions):
+            def read():
+                versions = store.versions(table_names)
+                return versions, cache.version_stamp(table_names, versions)
+            return await asyncio.to_thread(read)
+        try:
+            found = dict((await session.execute(versions_select(table_names))).all())
+        except DBAPIError as e:
+            await session.rollback()
+            store.unavailable(e)
+            found = {}
+        resolved = store.resolve(table_names, found)
+        versions = tuple(resolved[name] for name in table_names)
+        return versions, cache.version_stamp(table_names, versions)
+
+    async def _get_one(self, scope, send, headers, model, schema, object_id, not_found):
+        """Serve a single object with the same ETag as the Flask view."""
+        table_names = (model.__tablename__,)
+        encoding = _negotiate(headers)
+        async with await self._session() as session:
+            _, stamp = await self._version_stamp(session, table_names)
+            etag = etag_for(scope["path"], [], _representation(encoding), table_names, stamp)
+            if _etag_matches(headers.get(b"if-none-match", b"").decode("latin-1"), etag):
+                await _send(send, 304, b"", [(b"etag", f'"{etag}"'.encode())])
+                return
+            obj = await session.get(model, object_id)
+        if obj is None:
+            body = {"error": "Not Found", "description": not_found, "status_code": 404}
+            await self._send_json(send, encoding, 404, body)
+            return
+        body, content_encoding = await _compress(self._json_body(serialize(schema, obj)), encoding)
+        await _send(send, 200, body, [
+            (b"content-type", b"application/json"),
+            (b"etag", f'"{etag}"'.encode()),
+            (b"cache-control", b"no-cache"),
+            *_encoding_headers(content_encoding),
+        ])
+
+    async def _get_page(self, scope, send, headers, args, model, many_schema, page):
+        """Serve a list page with the same ETag and response cache as the Flask view."""
+        table_names = (model.__tablename__,)
+        encoding = _negotiate(headers)
+        async with await self._session() as session:
+            versions, stamp = await self._version_stamp(session, table_names)
+            etag = etag_for(scope["path"], args, _representation(encoding), table_names, stamp)
+            if _etag_matches(headers.get(b"if-none-match", b"").decode("latin-1"), etag):
+                await _send(send, 304, b"", [(b"etag", f'"{etag}"'.encode())])
+                return
+
+            key = cache.key_for(scope["path"], args, table_names, encoding, versions)
+            entry = await asyncio.to_thread(cache.backend.get, key)
+            cache.record(hit=entry is not None)
+            if entry is not None:
+                body, content_encoding, x_cache = entry[0], entry[3], b"HIT"
+            else:
+                limit, after = page
+                stmt = select(model)
+                if after is not None:
+                    stmt = stmt.where(model.id > after)
+                stmt = stmt.order_by(model.id).limit(limit + 1)
+                rows = (await session.scalars(stmt)).all()
+                next_cursor = None
+                if len(rows) > limit:
+                    rows = rows[:limit]
+                    next_cursor = rows[-1].id
+                body = self._json_body({"data": serialize(many_schema, rows), "next_cursor": next_cursor})
+                body, content_encoding = await _compress(body, encoding)
+                await asyncio.to_thread(cache.backend.set, key, (body, 200, "application/json", content_encoding))
+                x_cache = b"MISS"
+
+        await _send(send, 200, body, [
+            (b"content-type", b"application/json"),
+            (b"etag", f'"{etag}"'.encode()),
+            (b"cache-control", b"no-cache"),
+            (b"x-cache", x_cache),
+            *_encoding_headers(content_encoding),
+        ])
+
+    def _json_body(self, data):
+        """Encode ``data`` exactly as the Flask app's ``jsonify`` would."""
+        return self.flask_app.json.response(data).get_data()
+
+    async def _send_json(self, send, encoding, status, data):
+        body, content_encoding = await _compress(self._json_body(data), encoding)
+        await _send(send, status, body, [
+            (b"content-type", b"application/json"), *_encoding_headers(content_encoding)
+        ])
+
+
+def _negotiate(headers):
+    """Return the encoding negotiated from the request's Accept-Encoding header, or None."""
+    return compression.negotiate(headers.get(b"accept-encoding", b"").decode("latin-1"))
+
+
+def _representation(encoding):
+    """Return the ETag representation of a JSON response with ``encoding``, as ``compute_etag`` does."""
+    return f"json+{encoding}" if encoding else "json"
+
+
+async def _compress(body, encoding):
+    """Compress ``body`` as the Flask app would, in a worker thread; return ``(body, content_encoding)``."""
+    if encoding is None or len(body) < compression.min_size:
+        return body, None
+    return await asyncio.to_thread(compression.compress, body, encoding), encoding
+
+
+def _encoding_headers(content_encoding):
+    """Return the Vary and Content-Encoding headers of a compressible JSON response."""
+    headers = [(b"vary", b"Accept-Encoding")] if compression.enabled else []
+    if content_encoding:
+        headers.append((b"content-encoding", content_encoding.encode()))
+    return headers
+
+
+def _etag_matches(if_none_match, etag):
+    """
+    Return True if an If-None-Match header lists ``etag`` as a strong ETag
+    (or is ``*``), matching werkzeug's ``ETags.contains``.
+    """
+    candidates = [value.strip() for value in if_none_match.split(",") if value.strip()]
+    return "*" in candidates or f'"{etag}"' in candidates
+
+
+async def _send(send, status, body, headers):
+    """Send a complete HTTP response."""
+    headers = [*headers, (b"content-length", str(len(body)).encode())]
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+app = AsyncAPI(create_app())
@@ -0,0 +1,9 @@
+"""
+Benchmarks Package
+
+Standalone scripts for measuring the performance of the Property Management
+API. They are not part of the application and are run manually, e.g.
+
+    python -m benchmarks.serializer_benchmark
+
+"""
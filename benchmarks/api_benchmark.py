@@ -0,0 +1,463 @@
+"""
+API Benchmark
+
+Drives every route of the five resource blueprints (properties,
+property_managers, support_workers, tenancies, tenants) through the Flask
+test client and records, per route, throughput (requests/sec), p50/p95/p99
+latency, errors and the number of SQL queries per request (read from the
+Server-Timing header). The results are written to a JSON report that a
+later run can be compared against to catch regressions. The response cache
+is disabled so every request hits the database.
+
+Usage:
+    python -m benchmarks.api_benchmark --scale 1 --output baseline.json
+    python -m benchmarks.api_benchmark --compare baseline.json --tolerance 0.2
+    python -m benchmarks.api_benchmark --database-url postgresql+psycopg2://... --only tenancies
+
+Without --database-url a temporary SQLite file is used. An empty database
+is seeded with ``seeding.ScaleSeeder`` (--scale 1 is 1,000 properties and
+10,000 tenancies); an existing one is used as it is. Write routes create,
+update, link and delete rows; DELETE and single-link routes act on rows
+inserted for the purpose before timing starts. Purge routes are timed up to
+their 202 response; the background jobs they start are not.
+
+With --compare the run exits non-zero if a route's p95 latency or
+throughput is worse than the baseline by more than --tolerance, or if it
+runs more queries per request than in the baseline.
+
+"""
+
+# Standard library imports
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import re
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timezone
+
+from benchmarks.tenancy_search_benchmark import percentile
+
+BLUEPRINTS = ("properties", "property_managers", "support_workers", "tenancies", "tenants")
+BULK_ITEMS = 10
+SERVER_TIMING = re.compile(r'desc="(\d+) quer')
+
+
+class Fixtures:
+    """
+    Row ids available to the request factories.
+
+    Attributes:
+        ids (dict[str, list[int]]): Existing ids per table name.
+        fresh (dict[str, list[int]]): Ids of rows inserted for DELETE and
+            link routes, consumed one per request.
+        rng (random.Random): Seeded generator picking ids and values.
+    """
+
+    def __init__(self, ids, seed):
+        self.ids = ids
+        self.fresh = {}
+        self.rng = random.Random(seed)
+        self.counter = 0
+
+    def pick(self, table):
+        return self.rng.choice(self.ids[table])
+
+    def take(self, table):
+        return self.fresh[table].pop()
+
+    def unique(self):
+        self.counter += 1
+        return self.counter
+
+
+# ------------------------------------------------------------
+# Request bodies
+# ------------------------------------------------------------
+def _manager(fx):
+    n = fx.unique()
+    return {"name": f"Bench Manager {n}", "phone": "0400000000", "email": f"manager{n}@example.com"}
+
+
+def _property(fx):
+    return {
+        "address": f"{fx.unique()} Benchmark Street, Mildura, Vic, 3500",
+        "property_manager_id": fx.pick("property_manager"),
+    }
+
+
+def _worker(fx):
+    n = fx.unique()
+    return {"name": f"Bench Worker {n}", "phone": "0400000000", "email": f"worker{n}@example.com"}
+
+
+def _tenant(fx):
+    n = fx.unique()
+    return {
+        "name": f"Bench Tenant {n}", "date_of_birth": "1980-01-01",
+        "phone": "0400000000", "email": f"tenant{n}@example.com",
+    }
+
+
+def _tenancy(fx):
+    return {
+        "property_id": fx.pick("property"), "start_date": date.today().isoformat(),
+        "end_date": None, "tenancy_status": "Sign-Up",
+    }
+
+
+def _transitions(fx):
+    ids = fx.rng.sample(fx.ids["tenancy"], min(BULK_ITEMS, len(fx.ids["tenancy"])))
+    return [{"id": tenancy_id, "fields": {"tenancy_status": "Tenanted"}} for tenancy_id in ids]
+
+
+def _bulk(body):
+    return lambda fx: [body(fx) for _ in range(BULK_ITEMS)]
+
+
+def _get(url):
+    return lambda fx: ("GET", url, None)
+
+
+def _by_id(method, prefix, table, body=None):
+    return lambda fx: (method, f"/{prefix}/{fx.pick(table)}/", body(fx) if body else None)
+
+
+def _post(url, body):
+    return lambda fx: ("POST", url, body(fx))
+
+
+def _delete(prefix, table):
+    return lambda fx: ("DELETE", f"/{prefix}/{fx.take(table)}/", None)
+
+
+def _purge(prefix, table):
+    return lambda fx: ("POST", f"/{prefix}/purge", {"ids": [fx.take(table) for _ in range(BULK_ITEMS)]})
+
+
+# Endpoint -> request factory returning (method, url, JSON body)
+ROUTES = {
+    # Properties
+    "properties.get_properties": _get("/properties/"),
+    "properties.get_property": _by_id("GET", "properties", "property"),
+    "properties.search_properties": _get("/properties/search?q=Avenue"),
+    "properties.get_properties_with_managers": _get("/properties/property_managers"),
+    "properties.get_property_graphs": _get("/properties/graph?include=manager,tenancies.tenants"),
+    "properties.get_property_graph": lambda fx: (
+        "GET", f"/properties/{fx.pick('property')}/graph?include=manager,tenancies.tenants", None
+    ),
+    "properties.get_properties_occupancy": _get("/properties/occupancy?occupied=true"),
+    "properties.get_property_occupancy": lambda fx: (
+        "GET", f"/properties/{fx.pick('property')}/occupancy", None
+    ),
+    "properties.create_property": _post("/properties/", _property),
+    "properties.create_properties_bulk": _post("/properties/bulk", _bulk(_property)),
+    "properties.update_property": _by_id(
+        "PUT", "properties", "property", lambda fx: {"address": f"{fx.unique()} Updated Street"}
+    ),
+    "properties.delete_property": _delete("properties", "property"),
+    "properties.purge_properties": _purge("properties", "property"),
+    # Property managers
+    "property_managers.get_property_managers": _get("/property_managers/"),
+    "property_managers.get_property_manager": _by_id("GET", "property_managers", "property_manager"),
+    "property_managers.get_property_managers_with_properties": _get("/property_managers/properties"),
+    "property_managers.create_property_manager": _post("/property_managers/", _manager),
+    "property_managers.update_property_manager": _by_id(
+        "PUT", "property_managers", "property_manager", lambda fx: {"phone": "0400000001"}
+    ),
+    "property_managers.delete_property_manager": _delete("property_managers", "property_manager"),
+    "property_managers.purge_property_managers": _purge("property_managers", "property_manager"),
+    # Support workers
+    "support_workers.get_support_workers": _get("/support_workers/"),
+    "support_workers.get_support_worker": _by_id("GET", "support_workers", "support_worker"),
+    "support_workers.search_support_workers": _get("/support_workers/search?q=smith"),
+    "support_workers.get_support_workers_tenants": _get("/support_workers/tenants"),
+    "support_workers.create_support_worker": _post("/support_workers/", _worker),
+    "support_workers.update_support_worker": _by_id(
+        "PUT", "support_workers", "support_worker", lambda fx: {"phone": "0400000001"}
+    ),
+    "support_workers.delete_support_worker": _delete("support_workers", "support_worker"),
+    "support_workers.purge_support_workers": _purge("support_workers", "support_worker"),
+    "support_workers.link_tenant": lambda fx: (
+        "POST", f"/support_workers/{fx.pick('support_worker')}/link_tenant/{fx.take('tenant')}/", None
+    ),
+    # Tenancies
+    "tenancies.get_tenancies": _get("/tenancies/"),
+    "tenancies.get_tenancy": _by_id("GET", "tenancies", "tenancy"),
+    "tenancies.search_tenancies": _get("/tenancies/search?status=Tenanted&sort=-start_date"),
+    "tenancies.get_tenancies_with_properties": _get("/tenancies/properties"),
+    "tenancies.get_tenancies_with_tenants": _get("/tenancies/tenants"),
+    "tenancies.create_tenancy": _post("/tenancies/", _tenancy),
+    "tenancies.create_tenancies_bulk": _post("/tenancies/bulk", _bulk(_tenancy)),
+    "tenancies.update_tenancy": _by_id(
+        "PUT", "tenancies", "tenancy", lambda fx: {"tenancy_status": "Tenanted"}
+    ),
+    "tenancies.update_tenancies": lambda fx: ("PATCH", "/tenancies/", _transitions(fx)),
+    "tenancies.delete_tenancy": _delete("tenancies", "tenancy"),
+    "tenancies.purge_tenancies": _purge("tenancies", "tenancy"),
+    "tenancies.link_tenant": lambda fx: (
+        "POST", f"/tenancies/{fx.pick('tenancy')}/link_tenant/{fx.take('tenant')}/", None
+    ),
+    # Tenants
+    "tenants.get_tenants": _get("/tenants/"),
+    "tenants.get_tenant": _by_id("GET", "tenants", "tenant"),
+    "tenants.search_tenants": _get("/tenants/search?q=jones"),
+    "tenants.get_tenants_support_workers": _get("/tenants/support_workers"),
+    "tenants.get_tenants_with_tenancies": _get("/tenants/tenancies"),
+    "tenants.create_tenant": _post("/tenants/", _tenant),
+    "tenants.create_tenants_bulk": _post("/tenants/bulk", _bulk(_tenant)),
+    "tenants.update_tenant": _by_id("PUT", "tenants", "tenant", lambda fx: {"phone": "0400000001"}),
+    "tenants.delete_tenant": _delete("tenants", "tenant"),
+    "tenants.purge_tenants": _purge("tenants", "tenant"),
+    "tenants.link_tenancy": lambda fx: (
+        "POST", f"/tenants/{fx.take('tenant')}/link_tenancy/{fx.pick('tenancy')}/", None
+    ),
+    "tenants.link_support_worker": lambda fx: (
+        "POST", f"/tenants/{fx.take('tenant')}/link_support_worker/{fx.pick('support_worker')}/", None
+    ),
+    "tenants.link_tenancies_bulk": lambda fx: ("POST", "/tenants/link_tenancies", [
+        {"tenant_id": fx.take("tenant"), "tenancy_id": fx.pick("tenancy")} for _ in range(BULK_ITEMS)
+    ]),
+    "tenants.link_support_workers_bulk": lambda fx: ("POST", "/tenants/link_support_workers", [
+        {"tenant_id": fx.take("tenant"), "support_worker_id": fx.pick("support_worker")}
+        for _ in range(BULK_ITEMS)
+    ]),
+}
+
+# Fresh rows each route consumes per request
+FRESH = {
+    "properties.delete_property": ("property", 1),
+    "property_managers.delete_property_manager": ("property_manager", 1),
+    "support_workers.delete_support_worker": ("support_worker", 1),
+    "support_workers.link_tenant": ("tenant", 1),
+    "tenancies.delete_tenancy": ("tenancy", 1),
+    "tenancies.link_tenant": ("tenant", 1),
+    "tenants.delete_tenant": ("tenant", 1),
+    "tenants.link_tenancy": ("tenant", 1),
+    "tenants.link_support_worker": ("tenant", 1),
+    "tenants.link_tenancies_bulk": ("tenant", BULK_ITEMS),
+    "tenants.link_support_workers_bulk": ("tenant", BULK_ITEMS),
+    "properties.purge_properties": ("property", BULK_ITEMS),
+    "property_managers.purge_property_managers": ("property_manager", BULK_ITEMS),
+    "support_workers.purge_support_workers": ("support_worker", BULK_ITEMS),
+    "tenancies.purge_tenancies": ("tenancy", BULK_ITEMS),
+    "tenants.purge_tenants": ("tenant", BULK_ITEMS),
+}
+
+
+# Seeder argument generating each independent table
+SEEDER_COUNTS = {
+    "property_manager": "managers", "support_worker": "support_workers", "tenant": "tenants",
+}
+
+
+def fresh_rows(db, table, count, fx):
+    """Insert ``count`` unlinked rows into ``table`` and return their ids."""
+    from models.property import Property
+    from models.tenancy import Tenancy
+    from seeding import ScaleSeeder
+
+    before = db.session.scalar(db.text(f"SELECT COALESCE(MAX(id), 0) FROM {table}"))
+    if table == "property":
+        db.session.execute(Property.__table__.insert(), [_property(fx) for _ in range(count)])
+    elif table == "tenancy":
+        db.session.execute(Tenancy.__table__.insert(), [
+            {**_tenancy(fx), "start_date": date.today()} for _ in range(count)
+        ])
+    else:
+        db.session.commit()
+        counts = dict.fromkeys(("managers", "properties", "support_workers", "tenants", "tenancies"), 0)
+        counts[SEEDER_COUNTS[table]] = count
+        ScaleSeeder(**counts, workers_per_tenant=0, seed=fx.unique()).run(
+            db.engine, echo=lambda message: None
+        )
+    db.session.commit()
+    return list(range(before + 1, before + count + 1))
+
+
+def run_route(client, factory, fx, warmup, requests):
+    """
+    Send ``warmup`` + ``requests`` requests built by ``factory`` and time the latter.
+
+    Returns:
+        dict: Throughput, latency percentiles, query counts and status codes.
+    """
+    samples, queries, statuses, errors, example = [], [], {}, 0, None
+    for i in range(warmup + requests):
+        method, url, body = factory(fx)
+        started = time.perf_counter()
+        response = client.open(url, method=method, json=body)
+        elapsed = time.perf_counter() - started
+        if i < warmup:
+            continue
+        example = example or f"{method} {url}"
+        samples.append(elapsed * 1000)
+        statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+        errors += response.status_code >= 400
+        match = SERVER_TIMING.search(response.headers.get("Server-Timing", ""))
+        if match:
+            queries.append(int(match.group(1)))
+    total = sum(samples) / 1000
+    return {
+        "example": example,
+        "requests": requests,
+        "rps": round(requests / total, 1) if total else None,
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "queries_mean": round(statistics.mean(queries), 2) if queries else None,
+        "queries_max": max(queries) if queries else None,
+        "errors": errors,
+        "statuses": statuses,
+    }
+
+
+def compare(report, baseline, tolerance):
+    """
+    Compare a report with a baseline report.
+
+    Returns:
+        list[str]: One line per regression.
+    """
+    regressions = []
+    for endpoint, result in report["routes"].items():
+        before = baseline["routes"].get(endpoint)
+        if before is None:
+            continue
+        if result["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{endpoint}: p95 {before['p95_ms']}ms -> {result['p95_ms']}ms")
+        if before["rps"] and result["rps"] and result["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(f"{endpoint}: throughput {before['rps']} -> {result['rps']} req/s")
+        if (result["queries_max"] or 0) > (before["queries_max"] or 0):
+            regressions.append(
+                f"{endpoint}: queries per request {before['queries_max']} -> {result['queries_max']}"
+            )
+        if result["errors"] > before["errors"]:
+            regressions.append(f"{endpoint}: errors {before['errors']} -> {result['errors']}")
+    return regressions
+
+
+def main():
+    """Seed the database if empty, drive every route and write the JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="seed size multiplier for an empty database")
+    parser.add_argument("--requests", type=int, default=200, help="timed requests per route")
+    parser.add_argument("--warmup", type=int, default=10, help="untimed requests per route")
+    parser.add_argument("--only", action="append", help="blueprint or endpoint prefix to run (repeatable)")
+    parser.add_argument("--database-url", help="database to use (default: temporary SQLite file)")
+    parser.add_argument("--output", default="api_benchmark.json", help="JSON report path")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for data and requests")
+    args = parser.parse_args()
+
+    # Configure before the application modules read the environment
+    os.environ["CACHE_BACKEND"] = "null"
+    os.environ["SERVER_TIMING"] = "true"
+    os.environ["QUERY_BUDGET_ENFORCE"] = "false"
+    os.environ["DATABASE_URL"] = args.database_url or "sqlite:///" + os.path.join(
+        tempfile.mkdtemp(prefix="api-benchmark-"), "benchmark.db"
+    )
+
+    from main import create_app
+    from extensions import db
+    from migrations import MIGRATIONS
+    from seeding import TABLES, ScaleSeeder
+
+    app = create_app()
+    # Report failing routes as 500s instead of aborting the run
+    app.config["PROPAGATE_EXCEPTIONS"] = False
+    # Failures are counted in the report; keep tracebacks and budget warnings out of the table
+    logging.disable(logging.CRITICAL)
+
+    fx = None
+    with app.app_context():
+        db.create_all()
+        if db.session.scalar(db.select(db.func.count()).select_from(TABLES[0])) == 0:
+            started = time.perf_counter()
+            inserted = ScaleSeeder(
+                managers=max(1, int(20 * args.scale)),
+                properties=max(1, int(1_000 * args.scale)),
+                support_workers=max(1, int(100 * args.scale)),
+                tenants=max(BULK_ITEMS, int(5_000 * args.scale)),
+                tenancies=max(1, int(10_000 * args.scale)),
+                seed=args.seed,
+            ).run(db.engine, echo=lambda message: None)
+            print(f"Seeded {sum(inserted.values())} rows in {time.perf_counter() - started:.1f}s")
+        for step in MIGRATIONS:
+            step(db.engine, echo=lambda message: None)
+
+        fx = Fixtures({
+            table.name: list(db.session.scalars(db.select(table.c.id)))
+            for table in TABLES[:5]
+        }, args.seed)
+
+        endpoints = [
+            rule.endpoint for rule in app.url_map.iter_rules()
+            if rule.endpoint.split(".")[0] in BLUEPRINTS
+        ]
+        missing = sorted(set(endpoints) - set(ROUTES))
+        if missing:
+            print(f"Warning: no benchmark for {', '.join(missing)}")
+
+        selected = [
+            endpoint for endpoint in ROUTES
+            if endpoint in endpoints
+            and (not args.only or any(endpoint.startswith(prefix) for prefix in args.only))
+        ]
+        # Reads first, then writes, deletes last so the data set stays stable for the reads
+        selected.sort(key=lambda endpoint: (
+            endpoint.split(".")[1].startswith(("delete_", "purge_")),
+            not endpoint.split(".")[1].startswith(("get_", "search_"))
+        ))
+
+        per_route = args.warmup + args.requests
+        for endpoint in selected:
+            if endpoint in FRESH:
+                table, per_request = FRESH[endpoint]
+                fx.fresh.setdefault(table, [])
+                fx.fresh[table] += fresh_rows(db, table, per_route * per_request, fx)
+        dialect = db.engine.dialect.name
+
+    client = app.test_client()
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "dialect": dialect,
+            "python": platform.python_version(),
+            "rows": {table: len(ids) for table, ids in fx.ids.items()},
+            "requests": args.requests,
+            "warmup": args.warmup,
+        },
+        "routes": {},
+    }
+
+    print(f"{'endpoint':<58}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'queries':>9}{'errors':>8}")
+    for endpoint in selected:
+        result = run_route(client, ROUTES[endpoint], fx, args.warmup, args.requests)
+        report["routes"][endpoint] = result
+        print(
+            f"{endpoint:<58}{result['rps'] or 0:>9.1f}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}"
+            f"{result['p99_ms']:>9.2f}{result['queries_max'] if result['queries_max'] is not None else '-':>9}"
+            f"{result['errors']:>8}"
+        )
+
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(report, output, indent=2)
+    print(f"Report written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            regressions = compare(report, json.load(baseline_file), args.tolerance)
+        if regressions:
+            print("\n".join(regressions))
+            raise SystemExit(f"{len(regressions)} regressions against {args.compare}")
+        print(f"No regressions against {args.compare} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+ASGI vs WSGI Load Test
+
+Starts the API twice, under gunicorn sync workers (``main:create_app()``)
+and under uvicorn (``asgi:app``) with the same number of workers, then
+drives each with the same number of concurrent keep-alive clients for a
+fixed duration and reports requests/sec and latency percentiles.
+
+The response cache is disabled in both servers so every request reaches
+the database. Point DATABASE_URL at a seeded database first, e.g.:
+
+    flask db create && flask db seed
+    python -m benchmarks.asgi_load_test --clients 500 --duration 30
+
+Already running servers can be measured instead with --wsgi-url/--asgi-url.
+
+"""
+
+# Standard library imports
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = ["/tenants/", "/tenancies/?limit=20", "/properties/1/", "/tenants/1/"]
+
+
+class Client:
+    """Minimal HTTP/1.1 keep-alive client over asyncio streams (no dependencies)."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def get(self, path):
+        """Send a GET request and return the status code, reconnecting if needed."""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {self.host}\r\nConnection: keep-alive\r\n\r\n".encode()
+        )
+        await self.writer.drain()
+
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split()[1])
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int((await self.reader.readline()).strip(), 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        else:
+            await self.reader.readexactly(int(headers.get("content-length", 0)))
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+        self.reader = self.writer = None
+
+
+async def worker(client, paths, deadline, latencies, errors, offset):
+    """Issue requests in a loop until the deadline, recording latencies in ms."""
+    index = offset
+    while time.perf_counter() < deadline:
+        path = paths[index % len(paths)]
+        index += 1
+        started = time.perf_counter()
+        try:
+            status = await client.get(path)
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            errors.append(path)
+            await client.close()
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+        if status >= 400:
+            errors.append(path)
+    await client.close()
+
+
+async def run_load(base_url, clients, duration, paths):
+    """
+    Drive one server with ``clients`` concurrent connections for ``duration`` seconds.
+
+    Returns:
+        dict: Completed requests, errors, requests/sec and latency percentiles.
+    """
+    url = urlsplit(base_url)
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        worker(Client(url.hostname, url.port or 80), paths, deadline, latencies, errors, offset)
+        for offset in range(clients)
+    ))
+    elapsed = time.perf_counter() - started
+    ordered = sorted(latencies)
+
+    def percentile(pct):
+        return ordered[max(0, int(round(pct / 100 * len(ordered))) - 1)] if ordered else None
+
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(ordered) if ordered else None,
+        "p99": percentile(99),
+    }
+
+
+def start_server(command, port, env):
+    """Start a server process and wait until it accepts connections."""
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"{command[0]} exited with code {process.returncode}")
+        try:
+            asyncio.run(asyncio.wait_for(asyncio.open_connection("127.0.0.1", port), 1))
+            return process
+        except (OSError, asyncio.TimeoutError):
+            time.sleep(0.2)
+    process.terminate()
+    raise SystemExit(f"{command[0]} did not start on port {port}")
+
+
+def main():
+    """Run the load test against both servers and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=500, help="concurrent connections")
+    parser.add_argument("--duration", type=float, default=30, help="seconds per server")
+    parser.add_argument("--workers", type=int, default=4, help="server worker processes")
+    parser.add_argument("--path", action="append", dest="paths", help="path to request (repeatable)")
+    parser.add_argument("--wsgi-url", help="measure a running WSGI server instead of starting one")
+    parser.add_argument("--asgi-url", help="measure a running ASGI server instead of starting one")
+    args = parser.parse_args()
+    paths = args.paths or DEFAULT_PATHS
+
+    env = dict(os.environ, CACHE_BACKEND="null")
+    servers = [
+        ("WSGI (gunicorn sync)", args.wsgi_url, 8101, [
+            sys.executable, "-m", "gunicorn", "--workers", str(args.workers),
+            "--bind", "127.0.0.1:8101", "--backlog", "4096", "main:create_app()"
+        ]),
+        ("ASGI (uvicorn)", args.asgi_url, 8102, [
+            sys.executable, "-m", "uvicorn", "--workers", str(args.workers),
+            "--host", "127.0.0.1", "--port", "8102", "--backlog", "4096",
+            "--no-access-log", "asgi:app"
+        ]),
+    ]
+
+    print(f"{args.clients} clients, {args.duration:g}s per server, paths: {', '.join(paths)}")
+    print(f"{'server':<22}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+    for name, url, port, command in servers:
+        process = None
+        if url is None:
+            process = start_server(command, port, env)
+            url = f"http://127.0.0.1:{port}"
+        try:
+            result = asyncio.run(run_load(url, args.clients, args.duration, paths))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+        p50 = f"{result['p50']:.1f}" if result["p50"] is not None else "-"
+        p99 = f"{result['p99']:.1f}" if result["p99"] is not None else "-"
+        print(f"{name:<22}{result['requests']:>10}{result['errors']:>8}{result['rps']:>10.0f}{p50:>10}{p99:>10}")
+
+
+if __name__ == "__main__":
+    main()
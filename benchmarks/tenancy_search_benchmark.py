@@ -0,0 +1,150 @@
+"""
+Tenancy Search Benchmark
+
+Seeds a large tenancy table (one million rows by default), creates the
+search indexes and measures the latency of GET /tenancies/search through the
+Flask test client for a set of typical queries, reporting p50/p95/p99 in
+milliseconds. The response cache is disabled so every request hits the
+database.
+
+Usage:
+    python -m benchmarks.tenancy_search_benchmark --rows 1000000
+    python -m benchmarks.tenancy_search_benchmark --database-url postgresql+psycopg2://...
+
+Without --database-url a temporary SQLite file is used. An existing database
+is only seeded if its tenancy table is empty.
+
+"""
+
+# Standard library imports
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+STATUSES = ("Sign-Up", "Tenanted", "Vacant")
+PROPERTIES = 1000
+BATCH_SIZE = 10_000
+
+
+def seed(db, rows):
+    """
+    Insert ``rows`` tenancies spread over 25 years and PROPERTIES properties.
+
+    Roughly a third of the tenancies are ongoing (no end date).
+    """
+    from models.property_manager import PropertyManager
+    from models.property import Property
+    from models.tenancy import Tenancy
+
+    db.session.execute(db.insert(PropertyManager), [
+        {"name": "Benchmark Manager", "email": "manager@example.com", "phone": "0400000000"}
+    ])
+    db.session.execute(db.insert(Property), [
+        {"address": f"{i} Benchmark Street, Mildura, Vic, 3500", "property_manager_id": 1}
+        for i in range(1, PROPERTIES + 1)
+    ])
+    for offset in range(0, rows, BATCH_SIZE):
+        batch = []
+        for i in range(offset, min(offset + BATCH_SIZE, rows)):
+            start = date(2000, 1, 1) + timedelta(days=(i * 7919) % 9125)
+            batch.append({
+                "property_id": i % PROPERTIES + 1,
+                "start_date": start,
+                "end_date": None if i % 3 == 0 else start + timedelta(days=90 + i % 640),
+                "tenancy_status": STATUSES[i % 3],
+            })
+        db.session.execute(Tenancy.__table__.insert(), batch)
+    db.session.commit()
+
+
+def percentile(samples, pct):
+    """Return the ``pct`` percentile (nearest rank) of a list of samples."""
+    ordered = sorted(samples)
+    return ordered[max(0, int(round(pct / 100 * len(ordered))) - 1)]
+
+
+def measure(client, url, requests, follow_cursor=False):
+    """
+    Time ``requests`` GETs of ``url`` and return the latencies in milliseconds.
+
+    With ``follow_cursor`` each request fetches the page after the previous
+    one, restarting from the first page at the end of the results.
+    """
+    samples, cursor = [], None
+    for _ in range(requests):
+        target = f"{url}&after={cursor}" if cursor else url
+        started = time.perf_counter()
+        response = client.get(target)
+        samples.append((time.perf_counter() - started) * 1000)
+        if response.status_code != 200:
+            raise SystemExit(f"{target}: HTTP {response.status_code} {response.get_data(as_text=True)}")
+        if follow_cursor:
+            cursor = response.get_json()["next_cursor"]
+    return samples
+
+
+def main():
+    """Seed the database, run the queries and print a latency table."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="tenancies to seed")
+    parser.add_argument("--requests", type=int, default=500, help="requests per query")
+    parser.add_argument("--database-url", help="database to use (default: temporary SQLite file)")
+    parser.add_argument("--target-ms", type=float, default=10.0, help="p99 budget in milliseconds")
+    args = parser.parse_args()
+
+    # Configure before the application modules read the environment
+    os.environ["CACHE_BACKEND"] = "null"
+    os.environ["DATABASE_URL"] = args.database_url or "sqlite:///" + os.path.join(
+        tempfile.mkdtemp(prefix="tenancy-search-"), "benchmark.db"
+    )
+
+    from main import create_app
+    from extensions import db
+    from models.tenancy import Tenancy
+    from migrations import create_indexes
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        if db.session.scalar(db.select(db.func.count()).select_from(Tenancy)) == 0:
+            started = time.perf_counter()
+            seed(db, args.rows)
+            print(f"Seeded {args.rows} tenancies in {time.perf_counter() - started:.1f}s")
+        create_indexes(db.engine, echo=lambda message: None)
+        if db.engine.dialect.name == "postgresql":
+            with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                conn.exec_driver_sql("ANALYZE tenancy")
+        else:
+            with db.engine.begin() as conn:
+                conn.exec_driver_sql("ANALYZE")
+
+    client = app.test_client()
+    cases = [
+        ("status", "/tenancies/search?status=Tenanted", False),
+        ("status IN, by start_date", "/tenancies/search?status=Tenanted,Vacant&sort=start_date", False),
+        ("status, newest first", "/tenancies/search?status=Vacant&sort=-start_date", False),
+        ("start/end range", "/tenancies/search?start_date=2010-01-01&end_date=2012-12-31&sort=start_date", False),
+        ("overlap", "/tenancies/search?active_from=2012-06-01&active_to=2012-06-30&sort=-start_date", False),
+        ("property", "/tenancies/search?property_id=42", False),
+        ("paging by start_date", "/tenancies/search?status=Tenanted&sort=start_date&limit=100", True),
+    ]
+
+    failures = 0
+    print(f"{'query':<28}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}")
+    for name, url, follow_cursor in cases:
+        measure(client, url, 10, follow_cursor)  # warm up
+        samples = measure(client, url, args.requests, follow_cursor)
+        p99 = percentile(samples, 99)
+        failures += p99 > args.target_ms
+        print(f"{name:<28}{statistics.median(samples):>10.2f}{percentile(samples, 95):>10.2f}{p99:>10.2f}")
+
+    if failures:
+        raise SystemExit(f"{failures} queries exceeded the p99 budget of {args.target_ms}ms")
+    print(f"All queries within the p99 budget of {args.target_ms}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,18 +4,28 @@ Database CLI commands for Flask app.
 Provides commands to:
 - drop all tables
 - create all tables
+- migrate existing tables (online index builds)
+- refresh the materialized dashboard views
+- rebuild the property occupancy read model
+- copy a SQLite database to local replica stand-ins
 - seed the database with initial data
+- bulk-generate synthetic data at scale
 
 """
 # Standard library imports
 from datetime import date
 
 # Third-party imports
+import click
 from flask import Blueprint, jsonify
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 # Application module
-from extensions import db
+from extensions import db, replicas
+from migrations import MIGRATIONS, remove_duplicate_links
+from seeding import ScaleSeeder
+from utils.dashboard import refresh_views
+from utils.occupancy import rebuild_occupancy
 from models.property_manager import PropertyManager
 from models.property import Property
 from models.support_worker import SupportWorker
@@ -41,6 +51,62 @@ def create_db():
     db.create_all()
     print("Tables created!✅")
 
+@db_commands.cli.command("migrate")
+@click.option("--dedupe", is_flag=True, help="Delete duplicate junction rows so unique indexes can be built.")
+def migrate_db(dedupe):
+    """Apply schema changes (e.g. new indexes) to an existing database, online."""
+    if dedupe:
+        remove_duplicate_links(db.engine)
+    failed = []
+    for step in MIGRATIONS:
+        failed.extend(step(db.engine) or [])
+    if failed:
+        print(f"Migration incomplete, failed: {', '.join(failed)} ❌")
+        print("Re-run with --dedupe if a unique index failed on duplicate rows.")
+    else:
+        print("Database migrated!🔧")
+
+@db_commands.cli.command("refresh-dashboard")
+def refresh_dashboard():
+    """Refresh the materialized dashboard views (e.g. from cron)."""
+    if not refresh_views():
+        print("refresh-dashboard needs DASHBOARD_MATERIALIZED on a PostgreSQL database ❌")
+        return
+    print("Dashboard refreshed!📊")
+
+@db_commands.cli.command("refresh-occupancy")
+def refresh_occupancy():
+    """
+    Rebuild the property occupancy read model (e.g. nightly from cron, as
+    tenancies start and end with the calendar rather than with a request).
+    """
+    occupied = rebuild_occupancy()
+    print(f"Occupancy refreshed ({occupied} occupied properties)!🏠")
+
+@db_commands.cli.command("clone-replicas")
+def clone_replicas():
+    """
+    Copy the primary SQLite database to each SQLite replica in DATABASE_REPLICA_URLS.
+
+    For local testing of read replica routing only; real replicas are kept
+    in sync by the database server's replication.
+    """
+    if db.engine.dialect.name != "sqlite" or not replicas.replicas:
+        print("clone-replicas needs a SQLite DATABASE_URL and SQLite DATABASE_REPLICA_URLS ❌")
+        return
+    for replica in replicas.replicas:
+        if replica.engine.dialect.name != "sqlite":
+            print(f"Skipped {replica.name}: not a SQLite database")
+            continue
+        source = db.engine.raw_connection()
+        target = replica.engine.raw_connection()
+        try:
+            source.driver_connection.backup(target.driver_connection)
+        finally:
+            source.close()
+            target.close()
+        print(f"Copied primary to {replica.name}!📋")
+
 @db_commands.cli.command("seed")
 def seed_db():
     """
@@ -276,4 +342,37 @@ def seed_db():
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({"error": "Database error", "details": str(e)}), 500
+    rebuild_occupancy()
     print("Table seeded!🌱")
+
+@db_commands.cli.command("seed-scale")
+@click.option("--managers", default=100, show_default=True, help="Property managers to generate.")
+@click.option("--properties", default=10_000, show_default=True, help="Properties to generate.")
+@click.option("--support-workers", default=500, show_default=True, help="Support workers to generate.")
+@click.option("--tenants", default=50_000, show_default=True, help="Tenants to generate.")
+@click.option("--tenancies", default=100_000, show_default=True, help="Tenancies to generate.")
+@click.option("--tenants-per-tenancy", default=2, show_default=True, help="Maximum tenants linked to each tenancy.")
+@click.option("--workers-per-tenant", default=1, show_default=True, help="Maximum support workers linked to each tenant.")
+@click.option("--batch-size", default=10_000, show_default=True, help="Rows per COPY/INSERT batch.")
+@click.option("--seed", default=42, show_default=True, help="Random seed; the same seed generates the same data.")
+def seed_scale(
+    managers, properties, support_workers, tenants, tenancies,
+    tenants_per_tenancy, workers_per_tenant, batch_size, seed
+):
+    """
+    Bulk-generate referentially consistent synthetic data (e.g. millions of rows).
+
+    Rows are added after any existing data, using COPY on PostgreSQL and
+    batched executemany INSERTs elsewhere.
+    """
+    if properties and not managers or tenancies and not properties:
+        print("Properties need --managers and tenancies need --properties ❌")
+        return
+    seeder = ScaleSeeder(
+        managers, properties, support_workers, tenants, tenancies,
+        tenants_per_tenancy=tenants_per_tenancy, workers_per_tenant=workers_per_tenant,
+        batch_size=batch_size, seed=seed,
+    )
+    inserted = seeder.run(db.engine)
+    rebuild_occupancy()
+    print(f"Seeded {sum(inserted.values())} rows!🌱")
@@ -11,6 +11,17 @@ Provides different configurations for:
 # Standard library imports
 import os
 
+# Application module
+from utils.pool import InstrumentedQueuePool
+
+
+def _env_bool(name, default):
+    """Read a boolean environment variable ("1", "true", "yes" or "on")."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
 class Config(object):
     """
     Base configuration class.
@@ -18,6 +29,117 @@ class Config(object):
     Provides access to environment variables and default settings
     common to all environments.
     """
+    # Default and maximum page sizes for keyset paginated collection endpoints
+    PAGINATION_DEFAULT_LIMIT = int(os.environ.get("PAGINATION_DEFAULT_LIMIT", 50))
+    PAGINATION_MAX_LIMIT = int(os.environ.get("PAGINATION_MAX_LIMIT", 500))
+    # Rows fetched per keyset batch when streaming NDJSON exports
+    STREAM_BATCH_SIZE = int(os.environ.get("STREAM_BATCH_SIZE", 1000))
+
+    # Maximum number of items accepted by a single bulk request
+    BULK_MAX_ITEMS = int(os.environ.get("BULK_MAX_ITEMS", 5000))
+
+    # Response cache: "lru" (in-process), "redis" or "null" (disabled)
+    CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "lru")
+    # Redis URL for the "redis" backend; "local://" uses an in-process stand-in
+    CACHE_REDIS_URL = os.environ.get("CACHE_REDIS_URL", "local://")
+    CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", 1024))
+    # Safety-net expiry in seconds; entries are normally invalidated on commit
+    CACHE_DEFAULT_TTL = int(os.environ.get("CACHE_DEFAULT_TTL", 300))
+    # Where table versions (cache keys and ETags) live: "database" (the table_version
+    # table, bumped after each commit; shared by all workers) or "backend"
+    # (the cache backend's counters: per process for "lru", so only with a single worker)
+    CACHE_VERSION_STORE = os.environ.get("CACHE_VERSION_STORE", "database")
+
+    # Connection pool (PostgreSQL); each environment sets its own defaults
+    DB_POOL_SIZE = 5
+    DB_MAX_OVERFLOW = 5
+    # Seconds to wait for a free connection before failing the request
+    DB_POOL_TIMEOUT = 10
+    # Seconds after which a connection is replaced, before the server drops it
+    DB_POOL_RECYCLE = 1800
+    # Test each connection with a lightweight ping on checkout
+    DB_POOL_PRE_PING = True
+    # Server-side statement timeout in milliseconds (0 disables it)
+    DB_STATEMENT_TIMEOUT_MS = 0
+
+    # Add a Server-Timing header with each request's query count and database time
+    SERVER_TIMING = _env_bool("SERVER_TIMING", True)
+    # Log statements (N+1 lazy loads) repeated this many times in one request
+    QUERY_REPEAT_THRESHOLD = int(os.environ.get("QUERY_REPEAT_THRESHOLD", 5))
+    # Fail requests exceeding their declared query budget instead of logging a warning
+    QUERY_BUDGET_ENFORCE = _env_bool("QUERY_BUDGET_ENFORCE", False)
+
+    # Background jobs (bulk purges): concurrent jobs per process, and seconds results are kept
+    JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 1))
+    JOB_RESULT_TTL = int(os.environ.get("JOB_RESULT_TTL", 3600))
+
+    # Replay the stored response of a POST retried with the same Idempotency-Key header,
+    # for IDEMPOTENCY_TTL seconds after the first request
+    IDEMPOTENCY_ENABLED = _env_bool("IDEMPOTENCY_ENABLED", True)
+    IDEMPOTENCY_TTL = int(os.environ.get("IDEMPOTENCY_TTL", 86400))
+    # Seconds after which a key whose request never stored a response (e.g. the worker
+    # died) is taken over by a retry; keep it above the slowest request
+    IDEMPOTENCY_CLAIM_TIMEOUT = int(os.environ.get("IDEMPOTENCY_CLAIM_TIMEOUT", 60))
+
+    # Compress responses with the best of COMPRESSION_ENCODINGS the client accepts
+    # ("br" needs brotli, "zstd" needs zstandard; missing ones are skipped)
+    COMPRESSION_ENABLED = _env_bool("COMPRESSION_ENABLED", True)
+    COMPRESSION_ENCODINGS = os.environ.get("COMPRESSION_ENCODINGS", "zstd,br,gzip")
+    # Buffered bodies smaller than this many bytes are sent uncompressed
+    COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", 1024))
+
+    # Serve /dashboard/ from materialized views refreshed by "flask db refresh-dashboard"
+    # (PostgreSQL only; other databases always compute it live)
+    DASHBOARD_MATERIALIZED = _env_bool("DASHBOARD_MATERIALIZED", False)
+
+    # Seconds a failed read replica is skipped before it is health checked again
+    REPLICA_RETRY_INTERVAL = int(os.environ.get("REPLICA_RETRY_INTERVAL", 30))
+
+    def engine_options(self, url):
+        """
+        Return the ``create_engine`` options for a database URL.
+
+        Every DB_* setting can be overridden with an environment variable of
+        the same name. Pool options are only applied to server databases;
+        SQLite keeps Flask-SQLAlchemy's defaults.
+        """
+        options = {"pool_pre_ping": _env_bool("DB_POOL_PRE_PING", self.DB_POOL_PRE_PING)}
+        if url.startswith("sqlite"):
+            return options
+
+        options.update({
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": int(os.environ.get("DB_POOL_SIZE", self.DB_POOL_SIZE)),
+            "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", self.DB_MAX_OVERFLOW)),
+            "pool_timeout": float(os.environ.get("DB_POOL_TIMEOUT", self.DB_POOL_TIMEOUT)),
+            "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", self.DB_POOL_RECYCLE)),
+        })
+        statement_timeout = int(os.environ.get("DB_STATEMENT_TIMEOUT_MS", self.DB_STATEMENT_TIMEOUT_MS))
+        if statement_timeout and url.startswith("postgresql"):
+            options["connect_args"] = {"options": f"-c statement_timeout={statement_timeout}"}
+        return options
+
+    @property
+    def SQLALCHEMY_ENGINE_OPTIONS(self):
+        """Return the engine options for the primary database."""
+        return self.engine_options(self.SQLALCHEMY_DATABASE_URI)
+
+    @property
+    def DATABASE_REPLICA_URLS(self):
+        """
+        Return the read replica URLs from DATABASE_REPLICA_URLS (comma separated).
+
+        GET requests are routed to these databases; an empty list sends all
+        traffic to DATABASE_URL.
+        """
+        value = os.environ.get("DATABASE_REPLICA_URLS", "")
+        return [url.strip() for url in value.split(",") if url.strip()]
+
+    @property
+    def DATABASE_REPLICA_ENGINE_OPTIONS(self):
+        """Return the engine options for each read replica URL."""
+        return {url: self.engine_options(url) for url in self.DATABASE_REPLICA_URLS}
+
     @property
     def SQLALCHEMY_DATABASE_URI(self):
         """
@@ -35,14 +157,29 @@ class Config(object):
 class DevelopmentConfig(Config):
     """Development environment configuration."""
     DEBUG = True
+    DB_POOL_SIZE = 2
+    DB_MAX_OVERFLOW = 3
 
 class ProductionConfig(Config):
-    """Production environment configuration."""
-    pass
+    """
+    Production environment configuration.
+
+    Sized per gunicorn worker: workers x (pool size + overflow) must stay
+    below the server's connection limit. Connections are recycled well
+    before typical serverless idle timeouts.
+    """
+    DB_POOL_SIZE = 5
+    DB_MAX_OVERFLOW = 10
+    DB_POOL_RECYCLE = 300
+    DB_STATEMENT_TIMEOUT_MS = 30000
 
 class TestingConfig(Config):
     """Testing environment configuration."""
     TESTING = True
+    QUERY_BUDGET_ENFORCE = _env_bool("QUERY_BUDGET_ENFORCE", True)
+    DB_POOL_SIZE = 1
+    DB_MAX_OVERFLOW = 2
+    DB_POOL_TIMEOUT = 5
 
 # Determine which configuration to use based on FLASK_ENV environment variable
 environment = os.environ.get("FLASK_ENV")
@@ -7,6 +7,9 @@ all controllers easily without importing them individually.
 
 """
 
+from controllers.dashboard_controller import dashboard_bp
+from controllers.jobs_controller import jobs_bp
+from controllers.metrics_controller import metrics_bp
 from controllers.property_controller import properties_bp
 from controllers.property_manager_controller import property_managers_bp
 from controllers.support_worker_controller import support_workers_bp
@@ -18,5 +21,8 @@ registerable_controllers = [
     property_managers_bp,
     support_workers_bp,
     tenancies_bp,
-    tenants_bp
+    tenants_bp,
+    dashboard_bp,
+    jobs_bp,
+    metrics_bp
 ]
@@ -0,0 +1,49 @@
+"""
+Dashboard Controller
+
+Handles the portfolio dashboard routes, including:
+- Retrieving portfolio aggregates (properties per manager, tenancies by
+  status, tenants per support worker, occupied and vacant properties)
+- Refreshing the materialized dashboard views (PostgreSQL)
+
+"""
+
+from flask import Blueprint, jsonify
+from sqlalchemy.exc import SQLAlchemyError
+
+# Application modules
+from extensions import cache, query_monitor
+from utils.etag import conditional
+from utils.dashboard import DASHBOARD_TABLES, dashboard_data, refresh_views
+
+# Blueprint setup
+dashboard_bp = Blueprint(
+    'dashboard', __name__, url_prefix="/dashboard"
+)
+
+# ============================================================
+# GET: Portfolio Dashboard
+# ============================================================
+@dashboard_bp.route("/", methods=["GET"])
+@conditional(*DASHBOARD_TABLES)
+@cache.cached(*DASHBOARD_TABLES)
+@query_monitor.budget(4)
+def get_dashboard():
+    """Return portfolio aggregates computed in SQL."""
+    try:
+        return jsonify(dashboard_data()), 200
+    except SQLAlchemyError as e:
+        return jsonify({"error": str(e)}), 500
+
+# ============================================================
+# POST: Refresh Materialized Dashboard
+# ============================================================
+@dashboard_bp.route("/refresh", methods=["POST"])
+def refresh_dashboard():
+    """Refresh the materialized dashboard views (DASHBOARD_MATERIALIZED on PostgreSQL)."""
+    try:
+        if not refresh_views():
+            return jsonify({"error": "Materialized dashboard is not enabled"}), 400
+        return jsonify({"message": "Dashboard refreshed"}), 200
+    except SQLAlchemyError as e:
+        return jsonify({"error": str(e)}), 500
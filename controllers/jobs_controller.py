@@ -0,0 +1,28 @@
+"""
+Jobs Controller
+
+Handles routes for background jobs started by other endpoints, including:
+- Retrieving the status and result of a job (e.g. a bulk purge)
+
+"""
+
+from flask import Blueprint, jsonify, abort
+
+# Application modules
+from extensions import jobs
+
+# Blueprint setup
+jobs_bp = Blueprint(
+    'jobs', __name__, url_prefix="/jobs"
+)
+
+# ============================================================
+# GET: Job Status by ID
+# ============================================================
+@jobs_bp.route("/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """Return a job's status, and its result once it has finished."""
+    job = jobs.get(job_id)
+    if job is None:
+        return abort(404, description="Job does not exist or has expired")
+    return jsonify(job.to_dict()), 200
@@ -0,0 +1,37 @@
+"""
+Metrics Controller
+
+Handles read-only operational routes, including:
+- Response cache hit/miss counters
+- Database connection pool usage and read replica health
+
+"""
+
+from flask import Blueprint, jsonify
+
+# Application modules
+from extensions import db, cache, replicas
+from utils.pool import pool_stats
+
+# Blueprint setup
+metrics_bp = Blueprint(
+    'metrics', __name__, url_prefix="/metrics"
+)
+
+# ============================================================
+# GET: Response Cache Statistics
+# ============================================================
+@metrics_bp.route("/cache", methods=["GET"])
+def get_cache_stats():
+    """Return response cache hit/miss counters."""
+    return jsonify(cache.stats()), 200
+
+# ============================================================
+# GET: Connection Pool Statistics
+# ============================================================
+@metrics_bp.route("/pool", methods=["GET"])
+def get_pool_stats():
+    """Return connection pool usage: checked out, overflow and checkout wait times."""
+    stats = pool_stats(db.engine)
+    stats["replicas"] = replicas.stats()
+    return jsonify(stats), 200
@@ -4,24 +4,50 @@ Property Controller
 Handles all routes related to Property resources, including:
 - Retrieving all properties
 - Retrieving a single property
+- Searching properties by a fragment of their address
 - Getting properties with nested property managers
+- Getting property graphs with the relationships named in ?include=
+- Getting property occupancy (current tenancy and tenants) from its read model
 - Creating, updating, and deleting properties
+- Bulk purging properties (with their tenancies and tenancy links) as a background job
+- Bulk creating properties from a JSON array
 
 """
 
-from flask import Blueprint, jsonify, request, abort
+from flask import Blueprint, jsonify, request, abort, url_for
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from marshmallow import ValidationError
 
 # Application modules
-from extensions import db
+from extensions import db, cache, query_monitor, jobs
+from utils.pagination import paginate, page_response
+from utils.serializers import serialize
+from utils.bulk import bulk_create, bulk_response, purge_ids, bulk_purge
+from utils.projection import paginate_projected
+from utils.streaming import wants_stream, stream_response
+from utils.etag import conditional
+from utils.fieldsets import sparse, sparse_options
+from utils.versioning import expected_versions, check_version, stale
+from utils.text_search import text_search
+from utils.graph import get_include_plan
+from utils.occupancy import get_occupancy, occupancy_page
 from models.property import Property
+from models.property_manager import PropertyManager
+from models.property_occupancy import PropertyOccupancy
+from models.support_worker import SupportWorker
+from models.tenancy import Tenancy
+from models.tenant import Tenant
+from models.tenant_support_worker import TenantSupportWorker
+from models.tenant_tenancy import TenantTenancy
 from schemas.property_schema import (
     property_schema,
     properties_schema,
-    properties_with_manager_schema
+    properties_with_manager_schema,
+    property_with_manager_schema
 )
+from schemas.property_occupancy_schema import property_occupancy_schema, property_occupancies_schema
 
 
 # # Blueprint setup
@@ -31,12 +57,18 @@ properties_bp = Blueprint('properties', __name__, url_prefix="/properties")
 # GET: All Properties
 # ============================================================
 @properties_bp.route("/", methods=["GET"])
+@conditional(Property)
+@cache.cached(Property)
+@query_monitor.budget(1)
 def get_properties():
-    """Return a list of all properties."""
+    """Return a page of properties, paginated by ID (?limit=&after=)."""
     try:
-        stmt = db.select(Property)
-        properties_list = db.session.scalars(stmt).all()
-        return jsonify(properties_schema.dump(properties_list)), 200
+        schema = sparse(properties_schema)
+        stmt = db.select(Property).options(*sparse_options(Property, schema))
+        if wants_stream():
+            return stream_response(stmt, Property, sparse(property_schema))
+        properties_list, next_cursor = paginate(stmt, Property)
+        return jsonify(page_response(serialize(schema, properties_list), next_cursor)), 200
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
 
@@ -44,13 +76,32 @@ def get_properties():
 # GET: Single Property by ID
 # ============================================================
 @properties_bp.route("/<int:property_id>/", methods=["GET"])
+@conditional(Property)
+@query_monitor.budget(1)
 def get_property(property_id):
     """Return a single property by its ID, or 404 if not found."""
     try:
-        prop = db.get(Property, property_id)
+        schema = sparse(property_schema)
+        prop = db.session.get(Property, property_id, options=sparse_options(Property, schema))
         if not prop:
             return abort(404, description="Property does not exist")
-        return jsonify(property_schema.dump(prop)), 200
+        return jsonify(serialize(schema, prop)), 200
+    except SQLAlchemyError as e:
+        return jsonify({"error": str(e)}), 500
+
+# ============================================================
+# GET: Search Properties
+# ============================================================
+@properties_bp.route("/search", methods=["GET"])
+@conditional(Property)
+@cache.cached(Property)
+@query_monitor.budget(2)
+def search_properties():
+    """Return a page of properties whose address matches ?q=, best match first."""
+    try:
+        schema = sparse(properties_schema)
+        results, next_cursor = text_search(Property, [Property.address], sparse_options(Property, schema))
+        return jsonify(page_response(serialize(schema, results), next_cursor)), 200
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
 
@@ -58,12 +109,103 @@ def get_property(property_id):
 # GET: Properties with Nested Property Managers
 # ============================================================
 @properties_bp.route("/property_managers", methods=["GET"])
+@conditional(Property, PropertyManager)
+@cache.cached(Property, PropertyManager)
+@query_monitor.budget(2)
 def get_properties_with_managers():
-    """Return all properties including their associated property managers."""
+    """Return a page of properties including their associated property managers."""
+    try:
+        schema = sparse(properties_with_manager_schema)
+        stmt = db.select(Property).options(selectinload(Property.property_manager), *sparse_options(Property, schema))
+        if wants_stream():
+            return stream_response(stmt, Property, sparse(property_with_manager_schema))
+        properties_list, next_cursor = paginate_projected(Property, schema)
+        return jsonify(page_response(serialize(schema, properties_list), next_cursor)), 200
+    except SQLAlchemyError as e:
+        return jsonify({"error": str(e)}), 500
+
+# Every table a property graph can include
+GRAPH_TABLES = (
+    Property, PropertyManager, Tenancy, TenantTenancy, Tenant, TenantSupportWorker, SupportWorker
+)
+
+# ============================================================
+# GET: Property Graphs
+# ============================================================
+@properties_bp.route("/graph", methods=["GET"])
+@conditional(*GRAPH_TABLES)
+@cache.cached(*GRAPH_TABLES)
+def get_property_graphs():
+    """
+    Return a page of properties with the relationships named in ?include=,
+    e.g. ?include=manager,tenancies.tenants.support_workers.
+    """
+    try:
+        plan = get_include_plan(Property)
+        query_monitor.expect(plan.query_bound)
+        schema = sparse(plan.schema)
+        stmt = db.select(Property).options(*plan.options, *sparse_options(Property, schema))
+        properties_list, next_cursor = paginate(stmt, Property)
+        return jsonify(page_response(serialize(schema, properties_list, many=True), next_cursor)), 200
+    except SQLAlchemyError as e:
+        return jsonify({"error": str(e)}), 500
+
+# ============================================================
+# GET: Single Property Graph
+# ============================================================
+@properties_bp.route("/<int:property_id>/graph", methods=["GET"])
+@conditional(*GRAPH_TABLES)
+@cache.cached(*GRAPH_TABLES)
+def get_property_graph(property_id):
+    """Return a property with the relationships named in ?include=, or 404 if not found."""
+    try:
+        plan = get_include_plan(Property)
+        query_monitor.expect(plan.query_bound)
+        schema = sparse(plan.schema)
+        stmt = (
+            db.select(Property)
+            .where(Property.id == property_id)
+            .options(*plan.options, *sparse_options(Property, schema))
+        )
+        prop = db.session.scalars(stmt).first()
+        if not prop:
+            return abort(404, description="Property does not exist")
+        return jsonify(serialize(schema, prop)), 200
+    except SQLAlchemyError as e:
+        return jsonify({"error": str(e)}), 500
+
+# ============================================================
+# GET: Property Occupancies
+# ============================================================
+@properties_bp.route("/occupancy", methods=["GET"])
+@conditional(Property, PropertyOccupancy)
+@cache.cached(Property, PropertyOccupancy)
+@query_monitor.budget(1)
+def get_properties_occupancy():
+    """
+    Return a page of properties with their current tenancy and tenants,
+    read from the occupancy read model (?occupied=true|false, ?limit=&after=).
+    """
+    try:
+        rows, next_cursor = occupancy_page()
+        return jsonify(page_response(serialize(property_occupancies_schema, rows), next_cursor)), 200
+    except SQLAlchemyError as e:
+        return jsonify({"error": str(e)}), 500
+
+# ============================================================
+# GET: Single Property Occupancy
+# ============================================================
+@properties_bp.route("/<int:property_id>/occupancy", methods=["GET"])
+@conditional(Property, PropertyOccupancy)
+@cache.cached(Property, PropertyOccupancy)
+@query_monitor.budget(1)
+def get_property_occupancy(property_id):
+    """Return whether a property is occupied, by which tenancy and tenants, or 404 if not found."""
     try:
-        stmt = db.select(Property).options(selectinload(Property.managers))
-        properties_list = db.session.scalars(stmt).all()
-        return jsonify(properties_with_manager_schema.dump(properties_list)), 200
+        row = get_occupancy(property_id)
+        if not row:
+            return abort(404, description="Property does not exist")
+        return jsonify(serialize(property_occupancy_schema, row)), 200
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
 
@@ -89,20 +231,52 @@ def create_property():
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
+# ============================================================
+# POST: Bulk Create Properties
+# ============================================================
+@properties_bp.route("/bulk", methods=["POST"])
+def create_properties_bulk():
+    """
+    Create many properties from a JSON array in a single transaction.
+
+    Valid items are inserted with one multi-row INSERT; invalid items are
+    reported by index in "errors" without aborting the valid ones.
+    """
+    try:
+        created, errors = bulk_create(
+            Property,
+            property_schema,
+            properties_schema,
+            request.json,
+            ["address", "property_manager_id"],
+            references={"property_manager_id": PropertyManager}
+        )
+        return bulk_response(created, errors)
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
 # ============================================================
 # PUT: Update Property by ID
 # ============================================================
 @properties_bp.route("/<int:property_id>/", methods=["PUT"])
 def update_property(property_id):
-    """Update an existing property with provided fields."""
+    """
+    Update an existing property with provided fields.
+
+    Send the version_id last read in an If-Match header or in the body to get
+    409 Conflict instead of overwriting a newer change.
+    """
     try:
-        property_fields = property_schema.load(request.json, partial=True)
-        prop = db.get(Property, property_id)
+        payload, header_versions, body_version = expected_versions(request.json)
+        property_fields = property_schema.load(payload, partial=True)
+        prop = db.session.get(Property, property_id)
 
         if not prop:
             return abort(404, description="Property does not exist")
+        check_version(prop, header_versions, body_version)
 
-        for key in ["name", "address", "type"]:
+        for key in ["address", "property_manager_id"]:
             if key in property_fields:
                 setattr(prop, key, property_fields[key])
 
@@ -110,6 +284,9 @@ def update_property(property_id):
         return jsonify(property_schema.dump(prop)), 200
     except ValidationError as ve:
         return jsonify({"error": ve.messages}), 400
+    except StaleDataError:
+        db.session.rollback()
+        return stale(Property, property_id)
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
@@ -118,15 +295,44 @@ def update_property(property_id):
 # DELETE: Delete Property by ID
 # ============================================================
 @properties_bp.route("/<int:property_id>/", methods=["DELETE"])
+@query_monitor.budget(3)
 def delete_property(property_id):
-    """Delete a property by its ID and return the deleted record."""
+    """
+    Delete a property by its ID and return the deleted record.
+
+    Dependent rows are removed by the database's ON DELETE CASCADE foreign
+    keys without being loaded. An If-Match header with the version_id last
+    read makes a newer change answer 409 Conflict instead.
+    """
     try:
-        prop = db.get(Property, property_id)
+        _, header_versions, _ = expected_versions()
+        prop = db.session.get(Property, property_id)
         if not prop:
             return abort(404, description="Property not found")
+        check_version(prop, header_versions, None)
         db.session.delete(prop)
         db.session.commit()
         return jsonify(property_schema.dump(prop)), 200
+    except ValidationError as ve:
+        return jsonify({"error": ve.messages}), 400
+    except StaleDataError:
+        db.session.rollback()
+        return stale(Property, property_id)
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
+
+# ============================================================
+# POST: Bulk Purge Properties (background job)
+# ============================================================
+@properties_bp.route("/purge", methods=["POST"])
+def purge_properties():
+    """
+    Delete many properties and their tenancies and tenancy links as a background job.
+
+    Takes {"ids": [...]} and answers 202 with the job; GET /jobs/<job_id>
+    returns the number of rows deleted per table once it has finished.
+    """
+    ids = purge_ids(request.json)
+    job = jobs.submit("purge property", bulk_purge, Property, ids)
+    return jsonify(job.to_dict()), 202, {"Location": url_for("jobs.get_job", job_id=job.id)}
@@ -6,17 +6,26 @@ Handles all routes related to Property Manager resources, including:
 - Retrieving a single property manager
 - Retrieving property managers with nested properties
 - Creating, updating, and deleting property managers
+- Bulk purging property managers (with their properties, tenancies and tenancy links) as a background job
 
 """
 
-from flask import Blueprint, jsonify, request, abort
-from sqlalchemy.orm import selectinload
+from flask import Blueprint, jsonify, request, abort, url_for
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from marshmallow import ValidationError
 
 # Application modules
-from extensions import db
+from extensions import db, cache, query_monitor, jobs
+from utils.pagination import paginate, page_response
+from utils.serializers import serialize
+from utils.bulk import purge_ids, bulk_purge
+from utils.projection import paginate_projected
+from utils.etag import conditional
+from utils.fieldsets import sparse, sparse_options
+from utils.versioning import expected_versions, check_version, stale
 from models.property_manager import PropertyManager
+from models.property import Property
 from schemas.property_manager_schema import (
     property_manager_schema,
     property_managers_schema,
@@ -32,12 +41,16 @@ property_managers_bp = Blueprint(
 # GET: All Property Managers
 # ============================================================
 @property_managers_bp.route("/", methods=["GET"])
+@conditional(PropertyManager)
+@cache.cached(PropertyManager)
+@query_monitor.budget(1)
 def get_property_managers():
-    """Return a list of all property managers."""
+    """Return a page of property managers, paginated by ID (?limit=&after=)."""
     try:
-        stmt = db.select(PropertyManager)
-        managers_list = db.session.scalars(stmt).all()
-        return jsonify(property_managers_schema.dump(managers_list)), 200
+        schema = sparse(property_managers_schema)
+        stmt = db.select(PropertyManager).options(*sparse_options(PropertyManager, schema))
+        managers_list, next_cursor = paginate(stmt, PropertyManager)
+        return jsonify(page_response(serialize(schema, managers_list), next_cursor)), 200
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
 
@@ -45,13 +58,16 @@ def get_property_managers():
 # GET: Single Property Manager by ID
 # ============================================================
 @property_managers_bp.route("/<int:property_manager_id>/", methods=["GET"])
+@conditional(PropertyManager)
+@query_monitor.budget(1)
 def get_property_manager(property_manager_id):
     """Return a single property manager by ID, or 404 if not found."""
     try:
-        manager = db.get(PropertyManager, property_manager_id)
+        schema = sparse(property_manager_schema)
+        manager = db.session.get(PropertyManager, property_manager_id, options=sparse_options(PropertyManager, schema))
         if not manager:
             return abort(404, description="Property Manager does not exist")
-        return jsonify(property_manager_schema.dump(manager)), 200
+        return jsonify(serialize(schema, manager)), 200
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
 
@@ -59,12 +75,15 @@ def get_property_manager(property_manager_id):
 # GET: Property Managers with Nested Properties
 # ============================================================
 @property_managers_bp.route("/properties", methods=["GET"])
+@conditional(PropertyManager, Property)
+@cache.cached(PropertyManager, Property)
+@query_monitor.budget(2)
 def get_property_managers_with_properties():
-    """Return all property managers including their associated properties."""
+    """Return a page of property managers including their associated properties."""
     try:
-        stmt = db.select(PropertyManager).options(selectinload(PropertyManager.properties))
-        managers = db.session.scalars(stmt).all()
-        return jsonify(property_managers_with_properties_schema.dump(managers)), 200
+        schema = sparse(property_managers_with_properties_schema)
+        managers, next_cursor = paginate_projected(PropertyManager, schema)
+        return jsonify(page_response(serialize(schema, managers), next_cursor)), 200
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
 
@@ -95,13 +114,20 @@ def create_property_manager():
 # ============================================================
 @property_managers_bp.route("/<int:property_manager_id>/", methods=["PUT"])
 def update_property_manager(property_manager_id):
-    """Update an existing property manager with provided fields."""
+    """
+    Update an existing property manager with provided fields.
+
+    Send the version_id last read in an If-Match header or in the body to get
+    409 Conflict instead of overwriting a newer change.
+    """
     try:
-        manager_fields = property_manager_schema.load(request.json, partial=True)
-        manager_obj = db.get(PropertyManager, property_manager_id)
+        payload, header_versions, body_version = expected_versions(request.json)
+        manager_fields = property_manager_schema.load(payload, partial=True)
+        manager_obj = db.session.get(PropertyManager, property_manager_id)
 
         if not manager_obj:
             return abort(404, description="Property Manager does not exist")
+        check_version(manager_obj, header_versions, body_version)
 
         for key in ["name", "phone", "email"]:
             if key in manager_fields:
@@ -111,6 +137,9 @@ def update_property_manager(property_manager_id):
         return jsonify(property_manager_schema.dump(manager_obj)), 200
     except ValidationError as ve:
         return jsonify({"error": ve.messages}), 400
+    except StaleDataError:
+        db.session.rollback()
+        return stale(PropertyManager, property_manager_id)
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
@@ -119,15 +148,44 @@ def update_property_manager(property_manager_id):
 # DELETE: Delete Property Manager by ID
 # ============================================================
 @property_managers_bp.route("/<int:property_manager_id>/", methods=["DELETE"])
+@query_monitor.budget(3)
 def delete_property_manager(property_manager_id):
-    """Delete a property manager by ID and return the deleted record."""
+    """
+    Delete a property manager by ID and return the deleted record.
+
+    Dependent rows are removed by the database's ON DELETE CASCADE foreign
+    keys without being loaded. An If-Match header with the version_id last
+    read makes a newer change answer 409 Conflict instead.
+    """
     try:
-        manager = db.get(PropertyManager, property_manager_id)
+        _, header_versions, _ = expected_versions()
+        manager = db.session.get(PropertyManager, property_manager_id)
         if not manager:
             return abort(404, description="Property Manager not found")
+        check_version(manager, header_versions, None)
         db.session.delete(manager)
         db.session.commit()
         return jsonify(property_manager_schema.dump(manager)), 200
+    except ValidationError as ve:
+        return jsonify({"error": ve.messages}), 400
+    except StaleDataError:
+        db.session.rollback()
+        return stale(PropertyManager, property_manager_id)
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
+
+# ============================================================
+# POST: Bulk Purge Property Managers (background job)
+# ============================================================
+@property_managers_bp.route("/purge", methods=["POST"])
+def purge_property_managers():
+    """
+    Delete many property managers and their properties, tenancies and tenancy links as a background job.
+
+    Takes {"ids": [...]} and answers 202 with the job; GET /jobs/<job_id>
+    returns the number of rows deleted per table once it has finished.
+    """
+    ids = purge_ids(request.json)
+    job = jobs.submit("purge property_manager", bulk_purge, PropertyManager, ids)
+    return jsonify(job.to_dict()), 202, {"Location": url_for("jobs.get_job", job_id=job.id)}
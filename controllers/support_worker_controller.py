@@ -4,18 +4,28 @@ Support Worker Controller
 Handles all routes related to Support Worker resources, including:
 - Retrieving all support workers
 - Retrieving a single support worker
+- Searching support workers by partial name
 - Retrieving support workers with nested tenants
 - Creating, updating, and deleting support workers
+- Bulk purging support workers (with their tenant links) as a background job
 
 """
 
-from flask import Blueprint, jsonify, request, abort
-from sqlalchemy.orm import selectinload
+from flask import Blueprint, jsonify, request, abort, url_for
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from marshmallow import ValidationError
 
 # Application modules
-from extensions import db
+from extensions import db, cache, query_monitor, jobs
+from utils.pagination import paginate, page_response
+from utils.serializers import serialize
+from utils.bulk import purge_ids, bulk_purge
+from utils.projection import paginate_projected
+from utils.etag import conditional
+from utils.fieldsets import sparse, sparse_options
+from utils.versioning import expected_versions, check_version, stale
+from utils.text_search import text_search
 from models.support_worker import SupportWorker
 from models.tenant import Tenant
 from models.tenant_support_worker import TenantSupportWorker
@@ -34,12 +44,16 @@ support_workers_bp = Blueprint(
 # GET: All Support Workers
 # ============================================================
 @support_workers_bp.route("/", methods=["GET"])
+@conditional(SupportWorker)
+@cache.cached(SupportWorker)
+@query_monitor.budget(1)
 def get_support_workers():
-    """Return a list of all support workers."""
+    """Return a page of support workers, paginated by ID (?limit=&after=)."""
     try:
-        stmt = db.select(SupportWorker)
-        workers_list = db.session.scalars(stmt).all()
-        return jsonify(support_workers_schema.dump(workers_list)), 200
+        schema = sparse(support_workers_schema)
+        stmt = db.select(SupportWorker).options(*sparse_options(SupportWorker, schema))
+        workers_list, next_cursor = paginate(stmt, SupportWorker)
+        return jsonify(page_response(serialize(schema, workers_list), next_cursor)), 200
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
 
@@ -47,13 +61,32 @@ def get_support_workers():
 # GET: Single Support Worker by ID
 # ============================================================
 @support_workers_bp.route("/<int:support_worker_id>/", methods=["GET"])
+@conditional(SupportWorker)
+@query_monitor.budget(1)
 def get_support_worker(support_worker_id):
     """Return a single support worker by ID, or 404 if not found."""
     try:
-        worker = db.get(SupportWorker, support_worker_id)
+        schema = sparse(support_worker_schema)
+        worker = db.session.get(SupportWorker, support_worker_id, options=sparse_options(SupportWorker, schema))
         if not worker:
             return abort(404, description="Support Worker does not exist")
-        return jsonify(support_worker_schema.dump(worker)), 200
+        return jsonify(serialize(schema, worker)), 200
+    except SQLAlchemyError as e:
+        return jsonify({"error": str(e)}), 500
+
+# ============================================================
+# GET: Search Support Workers
+# ============================================================
+@support_workers_bp.route("/search", methods=["GET"])
+@conditional(SupportWorker)
+@cache.cached(SupportWorker)
+@query_monitor.budget(2)
+def search_support_workers():
+    """Return a page of support workers whose name matches ?q=, best match first."""
+    try:
+        schema = sparse(support_workers_schema)
+        results, next_cursor = text_search(SupportWorker, [SupportWorker.name], sparse_options(SupportWorker, schema))
+        return jsonify(page_response(serialize(schema, results), next_cursor)), 200
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
 
@@ -61,12 +94,15 @@ def get_support_worker(support_worker_id):
 # GET: Support Workers with Nested Tenants
 # ============================================================
 @support_workers_bp.route("/tenants", methods=["GET"])
+@conditional(SupportWorker, TenantSupportWorker, Tenant)
+@cache.cached(SupportWorker, TenantSupportWorker, Tenant)
+@query_monitor.budget(2)
 def get_support_workers_tenants():
-    """Return all support workers including their assigned tenants."""
+    """Return a page of support workers including their assigned tenants."""
     try:
-        stmt = db.select(SupportWorker).options(selectinload(SupportWorker.tenants))
-        workers = db.session.scalars(stmt).all()
-        return jsonify(support_workers_with_tenants_schema.dump(workers)), 200
+        schema = sparse(support_workers_with_tenants_schema)
+        workers, next_cursor = paginate_projected(SupportWorker, schema)
+        return jsonify(page_response(serialize(schema, workers), next_cursor)), 200
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
 
@@ -97,13 +133,20 @@ def create_support_worker():
 # ============================================================
 @support_workers_bp.route("/<int:support_worker_id>/", methods=["PUT"])
 def update_support_worker(support_worker_id):
-    """Update an existing support worker with provided fields."""
+    """
+    Update an existing support worker with provided fields.
+
+    Send the version_id last read in an If-Match header or in the body to get
+    409 Conflict instead of overwriting a newer change.
+    """
     try:
-        worker_fields = support_worker_schema.load(request.json, partial=True)
-        worker_obj = db.get(SupportWorker, support_worker_id)
+        payload, header_versions, body_version = expected_versions(request.json)
+        worker_fields = support_worker_schema.load(payload, partial=True)
+        worker_obj = db.session.get(SupportWorker, support_worker_id)
 
         if not worker_obj:
             return abort(404, description="Support Worker does not exist")
+        check_version(worker_obj, header_versions, body_version)
 
         for key in ["name", "phone", "email"]:
             if key in worker_fields:
@@ -113,6 +156,9 @@ def update_support_worker(support_worker_id):
         return jsonify(support_worker_schema.dump(worker_obj)), 200
     except ValidationError as ve:
         return jsonify({"error": ve.messages}), 400
+    except StaleDataError:
+        db.session.rollback()
+        return stale(SupportWorker, support_worker_id)
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
@@ -121,19 +167,48 @@ def update_support_worker(support_worker_id):
 # DELETE: Delete Support Worker by ID
 # ============================================================
 @support_workers_bp.route("/<int:support_worker_id>/", methods=["DELETE"])
+@query_monitor.budget(3)
 def delete_support_worker(support_worker_id):
-    """Delete a support worker by ID and return the deleted record."""
+    """
+    Delete a support worker by ID and return the deleted record.
+
+    Dependent rows are removed by the database's ON DELETE CASCADE foreign
+    keys without being loaded. An If-Match header with the version_id last
+    read makes a newer change answer 409 Conflict instead.
+    """
     try:
-        worker = db.get(SupportWorker, support_worker_id)
+        _, header_versions, _ = expected_versions()
+        worker = db.session.get(SupportWorker, support_worker_id)
         if not worker:
             return abort(404, description="Support Worker not found")
+        check_version(worker, header_versions, None)
         db.session.delete(worker)
         db.session.commit()
         return jsonify(support_worker_schema.dump(worker)), 200
+    except ValidationError as ve:
+        return jsonify({"error": ve.messages}), 400
+    except StaleDataError:
+        db.session.rollback()
+        return stale(SupportWorker, support_worker_id)
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
+# ============================================================
+# POST: Bulk Purge Support Workers (background job)
+# ============================================================
+@support_workers_bp.route("/purge", methods=["POST"])
+def purge_support_workers():
+    """
+    Delete many support workers and their tenant links as a background job.
+
+    Takes {"ids": [...]} and answers 202 with the job; GET /jobs/<job_id>
+    returns the number of rows deleted per table once it has finished.
+    """
+    ids = purge_ids(request.json)
+    job = jobs.submit("purge support_worker", bulk_purge, SupportWorker, ids)
+    return jsonify(job.to_dict()), 202, {"Location": url_for("jobs.get_job", job_id=job.id)}
+
 # ============================================================
 # POST: Link Support Worker to Tenant
 # ============================================================
@@ -141,8 +216,8 @@ def delete_support_worker(support_worker_id):
 def link_tenant(worker_id, tenant_id):
     """Link a support worker to a tenant, preventing duplicates."""
     try:
-        worker = db.get(SupportWorker, worker_id)
-        tenant = db.get(Tenant, tenant_id)
+        worker = db.session.get(SupportWorker, worker_id)
+        tenant = db.session.get(Tenant, tenant_id)
 
         if not worker or not tenant:
             return abort(404, description="Support Worker or Tenant not found")
@@ -4,28 +4,52 @@ Tenancy Controller
 Handles all routes related to Tenancy resources, including:
 - Retrieving all tenancies
 - Retrieving a single tenancy
-- Searching tenancies by query parameters
+- Searching tenancies with filters, sorting and cursor pagination
 - Retrieving tenancies with nested properties or tenants
 - Creating, updating, and deleting tenancies
+- Bulk purging tenancies (with their tenant links) as a background job
+- Bulk creating tenancies from a JSON array
+- Batch updating tenancies (e.g. status transitions) by id or by filter
 - Linking tenants to tenancies
 
+Every change that can alter which tenancy or tenants occupy a property also
+refreshes the affected rows of the property occupancy read model before
+committing (see utils.occupancy).
+
 """
 
-from flask import Blueprint, jsonify, request, abort
+from flask import Blueprint, jsonify, request, abort, url_for
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
 from marshmallow import ValidationError
 
 # Application modules
-from extensions import db
+from extensions import db, cache, query_monitor, jobs
+from utils.pagination import paginate, page_response
+from utils.serializers import serialize
+from utils.bulk import (
+    bulk_create, bulk_response, bulk_update, bulk_update_response, update_where, purge_ids
+)
+from utils.projection import paginate_projected
+from utils.streaming import wants_stream, stream_response
+from utils.etag import conditional
+from utils.fieldsets import sparse, sparse_options
+from utils.versioning import expected_versions, check_version, stale
+from utils.tenancy_search import get_search_args, build_filters, search
+from utils.occupancy import affected_properties, refresh_occupancy, purge_with_occupancy
 from models.tenancy import Tenancy
+from models.property import Property
 from models.tenant import Tenant
 from models.tenant_tenancy import TenantTenancy
+from schemas.tenancy_search_schema import tenancy_filter_schema
 from schemas.tenancy_schema import (
     tenancy_schema,
     tenancies_schema,
     tenancies_with_property_schema,
-    tenancies_with_tenants_schema
+    tenancy_with_property_schema,
+    tenancies_with_tenants_schema,
+    tenancy_with_tenants_schema
 )
 
 # Blueprint setup
@@ -37,12 +61,18 @@ tenancies_bp = Blueprint(
 # GET: All Tenancies
 # ============================================================
 @tenancies_bp.route("/", methods=["GET"])
+@conditional(Tenancy)
+@cache.cached(Tenancy)
+@query_monitor.budget(1)
 def get_tenancies():
-    """Return a list of all tenancies."""
+    """Return a page of tenancies, paginated by ID (?limit=&after=)."""
     try:
-        stmt = db.select(Tenancy)
-        tenancies_list = db.session.scalars(stmt).all()
-        return jsonify(tenancies_schema.dump(tenancies_list)), 200
+        schema = sparse(tenancies_schema)
+        stmt = db.select(Tenancy).options(*sparse_options(Tenancy, schema))
+        if wants_stream():
+            return stream_response(stmt, Tenancy, sparse(tenancy_schema))
+        tenancies_list, next_cursor = paginate(stmt, Tenancy)
+        return jsonify(page_response(serialize(schema, tenancies_list), next_cursor)), 200
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
 
@@ -50,13 +80,16 @@ def get_tenancies():
 # GET: Single Tenancy by ID
 # ============================================================
 @tenancies_bp.route("/<int:tenancy_id>/", methods=["GET"])
+@conditional(Tenancy)
+@query_monitor.budget(1)
 def get_tenancy(tenancy_id):
     """Return a single tenancy by ID, or 404 if not found."""
     try:
-        tenancy_obj = db.get(Tenancy, tenancy_id)
+        schema = sparse(tenancy_schema)
+        tenancy_obj = db.session.get(Tenancy, tenancy_id, options=sparse_options(Tenancy, schema))
         if not tenancy_obj:
             return abort(404, description="Tenancy does not exist")
-        return jsonify(tenancy_schema.dump(tenancy_obj)), 200
+        return jsonify(serialize(schema, tenancy_obj)), 200
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
 
@@ -65,39 +98,45 @@ def get_tenancy(tenancy_id):
 # ============================================================
 
 @tenancies_bp.route("/search", methods=["GET"])
+@conditional(Tenancy)
+@cache.cached(Tenancy)
+@query_monitor.budget(1)
 def search_tenancies():
-    """Return tenancies matching optional query parameters: status, start_date, end_date."""
-    stmt = db.select(Tenancy)
-
-    status = request.args.get("status")
-    start_date = request.args.get("start_date")
-    end_date = request.args.get("end_date")
-
-    if status:
-        stmt = stmt.filter(Tenancy.tenancy_status == status)
-
-    if start_date:
-        stmt = stmt.filter(Tenancy.start_date >= start_date)
-
-    if end_date:
-        stmt = stmt.filter(Tenancy.end_date <= end_date)
-
-    tenancies = db.session.scalars(stmt).all()
-
+    """
+    Return a page of tenancies matching the search filters.
 
-    result = tenancies_schema.dump(tenancies)
-    return jsonify(result), 200
+    Query parameters: status (one or more), start_date, end_date,
+    active_from/active_to (overlapping range), property_id, sort
+    (id, -id, start_date, -start_date), limit and after (opaque cursor).
+    """
+    try:
+        schema = sparse(tenancies_schema)
+        params = get_search_args()
+        # start_date is read to build the cursor of date-sorted pages
+        options = sparse_options(Tenancy, schema, Tenancy.start_date)
+        tenancies, next_cursor = search(params, options)
+        return jsonify(page_response(serialize(schema, tenancies), next_cursor)), 200
+    except ValidationError as ve:
+        return jsonify({"error": ve.messages}), 400
+    except SQLAlchemyError as e:
+        return jsonify({"error": str(e)}), 500
 
 # ============================================================
 # GET: Tenancies with Properties
 # ============================================================
 @tenancies_bp.route("/properties", methods=["GET"])
+@conditional(Tenancy, Property)
+@cache.cached(Tenancy, Property)
+@query_monitor.budget(2)
 def get_tenancies_with_properties():
-    """Return all tenancies including their associated properties."""
+    """Return a page of tenancies including their associated properties."""
     try:
-        stmt = db.select(Tenancy).options(selectinload(Tenancy.property))
-        tenancies = db.session.scalars(stmt).all()
-        return jsonify(tenancies_with_property_schema.dump(tenancies)), 200
+        schema = sparse(tenancies_with_property_schema)
+        stmt = db.select(Tenancy).options(selectinload(Tenancy.property), *sparse_options(Tenancy, schema))
+        if wants_stream():
+            return stream_response(stmt, Tenancy, sparse(tenancy_with_property_schema))
+        tenancies, next_cursor = paginate_projected(Tenancy, schema)
+        return jsonify(page_response(serialize(schema, tenancies), next_cursor)), 200
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
 
@@ -105,12 +144,18 @@ def get_tenancies_with_properties():
 # GET: Tenancies with Tenants
 # ============================================================
 @tenancies_bp.route("/tenants", methods=["GET"])
+@conditional(Tenancy, TenantTenancy, Tenant)
+@cache.cached(Tenancy, TenantTenancy, Tenant)
+@query_monitor.budget(2)
 def get_tenancies_with_tenants():
-    """Return all tenancies including their associated tenants."""
+    """Return a page of tenancies including their associated tenants."""
     try:
-        stmt = db.select(Tenancy).options(selectinload(Tenancy.tenants))
-        tenancies = db.session.scalars(stmt).all()
-        return jsonify(tenancies_with_tenants_schema.dump(tenancies)), 200
+        schema = sparse(tenancies_with_tenants_schema)
+        stmt = db.select(Tenancy).options(selectinload(Tenancy.tenants), *sparse_options(Tenancy, schema))
+        if wants_stream():
+            return stream_response(stmt, Tenancy, sparse(tenancy_with_tenants_schema))
+        tenancies, next_cursor = paginate_projected(Tenancy, schema)
+        return jsonify(page_response(serialize(schema, tenancies), next_cursor)), 200
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
 
@@ -129,6 +174,7 @@ def create_tenancy():
             property_id=tenancy_fields.get("property_id")
         )
         db.session.add(new_tenancy)
+        refresh_occupancy([new_tenancy.property_id])
         db.session.commit()
         return jsonify(tenancy_schema.dump(new_tenancy)), 201
     except ValidationError as ve:
@@ -137,27 +183,111 @@ def create_tenancy():
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
+# ============================================================
+# POST: Bulk Create Tenancies
+# ============================================================
+@tenancies_bp.route("/bulk", methods=["POST"])
+def create_tenancies_bulk():
+    """
+    Create many tenancies from a JSON array in a single transaction.
+
+    Valid items are inserted with one multi-row INSERT; invalid items are
+    reported by index in "errors" without aborting the valid ones.
+    """
+    try:
+        created, errors = bulk_create(
+            Tenancy,
+            tenancy_schema,
+            tenancies_schema,
+            request.json,
+            ["start_date", "end_date", "tenancy_status", "property_id"],
+            references={"property_id": Property},
+            before_commit=lambda tenancies: refresh_occupancy(t.property_id for t in tenancies)
+        )
+        return bulk_response(created, errors)
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
 # ============================================================
 # PUT: Update Tenancy by ID
 # ============================================================
 @tenancies_bp.route("/<int:tenancy_id>/", methods=["PUT"])
 def update_tenancy(tenancy_id):
-    """Update an existing tenancy with provided fields."""
+    """
+    Update an existing tenancy with provided fields.
+
+    Send the version_id last read in an If-Match header or in the body to get
+    409 Conflict instead of overwriting a newer change.
+    """
     try:
-        tenancy_fields = tenancy_schema.load(request.json, partial=True)
-        tenancy_obj = db.get(Tenancy, tenancy_id)
+        payload, header_versions, body_version = expected_versions(request.json)
+        tenancy_fields = tenancy_schema.load(payload, partial=True)
+        tenancy_obj = db.session.get(Tenancy, tenancy_id)
 
         if not tenancy_obj:
             return abort(404, description="Tenancy does not exist")
+        check_version(tenancy_obj, header_versions, body_version)
 
         for key in ["start_date", "end_date", "tenancy_status", "property_id"]:
             if key in tenancy_fields:
                 setattr(tenancy_obj, key, tenancy_fields[key])
 
+        refresh_occupancy(affected_properties(Tenancy, [tenancy_id]))
         db.session.commit()
         return jsonify(tenancy_schema.dump(tenancy_obj)), 200
     except ValidationError as ve:
         return jsonify({"error": ve.messages}), 400
+    except StaleDataError:
+        db.session.rollback()
+        return stale(Tenancy, tenancy_id)
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+# ============================================================
+# PATCH: Batch Update Tenancies
+# ============================================================
+@tenancies_bp.route("/", methods=["PATCH"])
+def update_tenancies():
+    """
+    Update many tenancies in a single transaction.
+
+    Takes either a JSON array of {"id", "fields", "expected"} items, where
+    "expected" holds values the row must still have (rows that changed are
+    reported as conflicts), or {"filter": {...}, "fields": {...}} with the
+    filters of GET /tenancies/search, applied as one UPDATE. Unknown filter
+    keys are rejected, and an empty filter (every tenancy) also needs
+    "all": true. Returns the number and ids of the updated tenancies.
+    """
+    columns = ["start_date", "end_date", "tenancy_status", "property_id"]
+    references = {"property_id": Property}
+
+    def refresh(ids):
+        refresh_occupancy(affected_properties(Tenancy, ids))
+
+    try:
+        payload = request.json
+        if isinstance(payload, list):
+            return bulk_update_response(
+                bulk_update(Tenancy, tenancy_schema, payload, columns, references, before_commit=refresh)
+            )
+        if not isinstance(payload, dict) or not isinstance(payload.get("filter"), dict):
+            return abort(400, description='Request body must be a JSON array or {"filter": {...}, "fields": {...}}')
+
+        try:
+            params = tenancy_filter_schema.load(payload["filter"])
+        except ValidationError as ve:
+            raise ValidationError({"filter": ve.messages})
+        clauses = build_filters(params)
+        if not clauses and payload.get("all") is not True:
+            return abort(400, description='filter must select tenancies by at least one field, or send "all": true')
+        result = update_where(
+            Tenancy, tenancy_schema, clauses, payload.get("fields"), columns, references, before_commit=refresh
+        )
+        return jsonify(result), 200
+    except ValidationError as ve:
+        return jsonify({"error": ve.messages}), 400
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
@@ -166,19 +296,50 @@ def update_tenancy(tenancy_id):
 # DELETE: Delete Tenancy by ID
 # ============================================================
 @tenancies_bp.route("/<int:tenancy_id>/", methods=["DELETE"])
+@query_monitor.budget(8)
 def delete_tenancy(tenancy_id):
-    """Delete a tenancy by ID and return the deleted record."""
+    """
+    Delete a tenancy by ID and return the deleted record.
+
+    Dependent rows are removed by the database's ON DELETE CASCADE foreign
+    keys without being loaded. An If-Match header with the version_id last
+    read makes a newer change answer 409 Conflict instead.
+    """
     try:
-        tenancy = db.get(Tenancy, tenancy_id)
+        _, header_versions, _ = expected_versions()
+        tenancy = db.session.get(Tenancy, tenancy_id)
         if not tenancy:
             return abort(404, description="Tenancy not found")
+        check_version(tenancy, header_versions, None)
+        property_ids = affected_properties(Tenancy, [tenancy_id])
         db.session.delete(tenancy)
+        refresh_occupancy(property_ids)
         db.session.commit()
         return jsonify(tenancy_schema.dump(tenancy)), 200
+    except ValidationError as ve:
+        return jsonify({"error": ve.messages}), 400
+    except StaleDataError:
+        db.session.rollback()
+        return stale(Tenancy, tenancy_id)
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
+# ============================================================
+# POST: Bulk Purge Tenancies (background job)
+# ============================================================
+@tenancies_bp.route("/purge", methods=["POST"])
+def purge_tenancies():
+    """
+    Delete many tenancies and their tenant links as a background job.
+
+    Takes {"ids": [...]} and answers 202 with the job; GET /jobs/<job_id>
+    returns the number of rows deleted per table once it has finished.
+    """
+    ids = purge_ids(request.json)
+    job = jobs.submit("purge tenancy", purge_with_occupancy, Tenancy, ids)
+    return jsonify(job.to_dict()), 202, {"Location": url_for("jobs.get_job", job_id=job.id)}
+
 # ============================================================
 # POST: Link a Tenant to a Tenancy
 # ============================================================
@@ -190,8 +351,8 @@ def link_tenant(tenancy_id, tenant_id):
     Returns a success message if link is created, otherwise an error.
     """
     try:
-        tenancy = db.get(Tenancy, tenancy_id)
-        tenant = db.get(Tenant, tenant_id)
+        tenancy = db.session.get(Tenancy, tenancy_id)
+        tenant = db.session.get(Tenant, tenant_id)
 
         if not tenancy or not tenant:
             return abort(404, description="Tenancy or Tenant not found")
@@ -206,6 +367,7 @@ def link_tenant(tenancy_id, tenant_id):
 
         new_link = TenantTenancy(tenant_id=tenant_id, tenancy_id=tenancy_id)
         db.session.add(new_link)
+        refresh_occupancy([tenancy.property_id])
         db.session.commit()
         return jsonify({"message": f"Tenancy {tenancy_id} linked to Tenant {tenant_id}"}), 201
     except SQLAlchemyError as e:
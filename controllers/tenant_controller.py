@@ -4,18 +4,37 @@ Tenant Controller
 Handles all routes related to Tenant resources, including:
 - Retrieving all tenants
 - Retrieving a single tenant
+- Searching tenants by partial name or email
 - Retrieving tenants with nested tenancies or support workers
 - Creating, updating, and deleting tenants
+- Bulk purging tenants (with their tenancy and support worker links) as a background job
+- Bulk creating tenants from a JSON array
 - Linking tenants to tenancies and support workers
+- Bulk linking tenants to tenancies and support workers
+
+Changes to tenant names and tenancy links refresh the affected rows of the
+property occupancy read model before committing (see utils.occupancy).
 
 """
 
-from flask import Blueprint, jsonify, request, abort
+from flask import Blueprint, jsonify, request, abort, url_for
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm.exc import StaleDataError
+from marshmallow import ValidationError
 
 # Application modules
-from extensions import db
+from extensions import db, cache, query_monitor, jobs
+from utils.pagination import paginate, page_response
+from utils.serializers import serialize
+from utils.bulk import bulk_create, bulk_response, bulk_link, purge_ids
+from utils.projection import paginate_projected
+from utils.streaming import wants_stream, stream_response
+from utils.etag import conditional
+from utils.fieldsets import sparse, sparse_options
+from utils.versioning import expected_versions, check_version, stale
+from utils.text_search import text_search
+from utils.occupancy import affected_properties, refresh_occupancy, purge_with_occupancy
 from models.tenant import Tenant
 from models.tenancy import Tenancy
 from models.support_worker import SupportWorker
@@ -25,7 +44,9 @@ from schemas.tenant_schema import (
     tenant_schema,
     tenants_schema,
     tenants_with_tenancies_schema,
-    tenants_with_support_worker_schema
+    tenant_with_tenancies_schema,
+    tenants_with_support_worker_schema,
+    tenant_with_support_worker_schema
 )
 
 # Blueprint setup
@@ -37,12 +58,18 @@ tenants_bp = Blueprint(
 # GET: All Tenants
 # ============================================================
 @tenants_bp.route("/", methods=["GET"])
+@conditional(Tenant)
+@cache.cached(Tenant)
+@query_monitor.budget(1)
 def get_tenants():
-    """Return a list of all tenants."""
+    """Return a page of tenants, paginated by ID (?limit=&after=)."""
     try:
-        stmt = db.select(Tenant)
-        tenants_list = db.session.scalars(stmt).all()
-        return jsonify(tenants_schema.dump(tenants_list)), 200
+        schema = sparse(tenants_schema)
+        stmt = db.select(Tenant).options(*sparse_options(Tenant, schema))
+        if wants_stream():
+            return stream_response(stmt, Tenant, sparse(tenant_schema))
+        tenants_list, next_cursor = paginate(stmt, Tenant)
+        return jsonify(page_response(serialize(schema, tenants_list), next_cursor)), 200
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
 
@@ -50,13 +77,32 @@ def get_tenants():
 # GET: Single Tenant by ID
 # ============================================================
 @tenants_bp.route("/<int:tenant_id>/", methods=["GET"])
+@conditional(Tenant)
+@query_monitor.budget(1)
 def get_tenant(tenant_id):
     """Return a single tenant by ID, or 404 if not found."""
     try:
-        tenant_obj = db.get(Tenant, tenant_id)
+        schema = sparse(tenant_schema)
+        tenant_obj = db.session.get(Tenant, tenant_id, options=sparse_options(Tenant, schema))
         if not tenant_obj:
             return abort(404, description="Tenant does not exist")
-        return jsonify(tenant_schema.dump(tenant_obj)), 200
+        return jsonify(serialize(schema, tenant_obj)), 200
+    except SQLAlchemyError as e:
+        return jsonify({"error": str(e)}), 500
+
+# ============================================================
+# GET: Search Tenants
+# ============================================================
+@tenants_bp.route("/search", methods=["GET"])
+@conditional(Tenant)
+@cache.cached(Tenant)
+@query_monitor.budget(2)
+def search_tenants():
+    """Return a page of tenants whose name or email matches ?q=, best match first."""
+    try:
+        schema = sparse(tenants_schema)
+        results, next_cursor = text_search(Tenant, [Tenant.name, Tenant.email], sparse_options(Tenant, schema))
+        return jsonify(page_response(serialize(schema, results), next_cursor)), 200
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
 
@@ -64,12 +110,18 @@ def get_tenant(tenant_id):
 # GET: Tenants with Tenancies
 # ============================================================
 @tenants_bp.route("/tenancies", methods=["GET"])
+@conditional(Tenant, TenantTenancy, Tenancy)
+@cache.cached(Tenant, TenantTenancy, Tenancy)
+@query_monitor.budget(2)
 def get_tenants_with_tenancies():
-    """Return all tenants including their assigned tenancies."""
+    """Return a page of tenants including their assigned tenancies."""
     try:
-        stmt = db.select(Tenant).options(selectinload(Tenant.tenancies))
-        tenants = db.session.scalars(stmt).all()
-        return jsonify(tenants_with_tenancies_schema.dump(tenants)), 200
+        schema = sparse(tenants_with_tenancies_schema)
+        stmt = db.select(Tenant).options(selectinload(Tenant.tenancies), *sparse_options(Tenant, schema))
+        if wants_stream():
+            return stream_response(stmt, Tenant, sparse(tenant_with_tenancies_schema))
+        tenants, next_cursor = paginate_projected(Tenant, schema)
+        return jsonify(page_response(serialize(schema, tenants), next_cursor)), 200
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
 
@@ -77,12 +129,18 @@ def get_tenants_with_tenancies():
 # GET: Tenants with Support Workers
 # ============================================================
 @tenants_bp.route("/support_workers", methods=["GET"])
+@conditional(Tenant, TenantSupportWorker, SupportWorker)
+@cache.cached(Tenant, TenantSupportWorker, SupportWorker)
+@query_monitor.budget(2)
 def get_tenants_support_workers():
-    """Return all tenants including their assigned support workers."""
+    """Return a page of tenants including their assigned support workers."""
     try:
-        stmt = db.select(Tenant).options(selectinload(Tenant.support_workers))
-        tenants = db.session.scalars(stmt).all()
-        return jsonify(tenants_with_support_worker_schema.dump(tenants)), 200
+        schema = sparse(tenants_with_support_worker_schema)
+        stmt = db.select(Tenant).options(selectinload(Tenant.support_workers), *sparse_options(Tenant, schema))
+        if wants_stream():
+            return stream_response(stmt, Tenant, sparse(tenant_with_support_worker_schema))
+        tenants, next_cursor = paginate_projected(Tenant, schema)
+        return jsonify(page_response(serialize(schema, tenants), next_cursor)), 200
     except SQLAlchemyError as e:
         return jsonify({"error": str(e)}), 500
 
@@ -109,25 +167,63 @@ def create_tenant():
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
+# ============================================================
+# POST: Bulk Create Tenants
+# ============================================================
+@tenants_bp.route("/bulk", methods=["POST"])
+def create_tenants_bulk():
+    """
+    Create many tenants from a JSON array in a single transaction.
+
+    Valid items are inserted with one multi-row INSERT; invalid items are
+    reported by index in "errors" without aborting the valid ones.
+    """
+    try:
+        created, errors = bulk_create(
+            Tenant,
+            tenant_schema,
+            tenants_schema,
+            request.json,
+            ["name", "date_of_birth", "phone", "email"]
+        )
+        return bulk_response(created, errors)
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
 # ============================================================
 # PUT: Update Tenant by ID
 # ============================================================
 @tenants_bp.route("/<int:tenant_id>/", methods=["PUT"])
 def update_tenant(tenant_id):
-    """Update an existing tenant with provided fields."""
+    """
+    Update an existing tenant with provided fields.
+
+    Send the version_id last read in an If-Match header or in the body to get
+    409 Conflict instead of overwriting a newer change.
+    """
     try:
-        tenant_fields = tenant_schema.load(request.json, partial=True)
-        tenant_obj = db.get(Tenant, tenant_id)
+        payload, header_versions, body_version = expected_versions(request.json)
+        tenant_fields = tenant_schema.load(payload, partial=True)
+        tenant_obj = db.session.get(Tenant, tenant_id)
 
         if not tenant_obj:
             return abort(404, description="Tenant does not exist")
+        check_version(tenant_obj, header_versions, body_version)
 
         for key in ["name", "email", "phone"]:
             if key in tenant_fields:
                 setattr(tenant_obj, key, tenant_fields[key])
 
+        if "name" in tenant_fields:
+            refresh_occupancy(affected_properties(Tenant, [tenant_id]))
         db.session.commit()
         return jsonify(tenant_schema.dump(tenant_obj)), 200
+    except ValidationError as ve:
+        return jsonify({"error": ve.messages}), 400
+    except StaleDataError:
+        db.session.rollback()
+        return stale(Tenant, tenant_id)
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
@@ -136,19 +232,51 @@ def update_tenant(tenant_id):
 # DELETE: Delete Tenant by ID
 # ============================================================
 @tenants_bp.route("/<int:tenant_id>/", methods=["DELETE"])
+@query_monitor.budget(8)
 def delete_tenant(tenant_id):
-    """Delete a tenant by ID and return the deleted record."""
+    """
+    Delete a tenant by ID and return the deleted record.
+
+    Dependent rows are removed by the database's ON DELETE CASCADE foreign
+    keys without being loaded. An If-Match header with the version_id last
+    read makes a newer change answer 409 Conflict instead.
+    """
     try:
-        tenant = db.get(Tenant, tenant_id)
+        _, header_versions, _ = expected_versions()
+        tenant = db.session.get(Tenant, tenant_id)
         if not tenant:
             return abort(404, description="Tenant not found")
+        check_version(tenant, header_versions, None)
+        # Taken before the delete cascades to the tenant's tenancy links
+        property_ids = affected_properties(Tenant, [tenant_id])
         db.session.delete(tenant)
+        refresh_occupancy(property_ids)
         db.session.commit()
         return jsonify(tenant_schema.dump(tenant)), 200
+    except ValidationError as ve:
+        return jsonify({"error": ve.messages}), 400
+    except StaleDataError:
+        db.session.rollback()
+        return stale(Tenant, tenant_id)
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
+# ============================================================
+# POST: Bulk Purge Tenants (background job)
+# ============================================================
+@tenants_bp.route("/purge", methods=["POST"])
+def purge_tenants():
+    """
+    Delete many tenants and their tenancy and support worker links as a background job.
+
+    Takes {"ids": [...]} and answers 202 with the job; GET /jobs/<job_id>
+    returns the number of rows deleted per table once it has finished.
+    """
+    ids = purge_ids(request.json)
+    job = jobs.submit("purge tenant", purge_with_occupancy, Tenant, ids)
+    return jsonify(job.to_dict()), 202, {"Location": url_for("jobs.get_job", job_id=job.id)}
+
 # ============================================================
 # POST: Link Tenant to Tenancy
 # ============================================================
@@ -160,8 +288,8 @@ def link_tenancy(tenant_id, tenancy_id):
     Returns a success message if link is created, otherwise an error.
     """
     try:
-        tenant = db.get(Tenant, tenant_id)
-        tenancy = db.get(Tenancy, tenancy_id)
+        tenant = db.session.get(Tenant, tenant_id)
+        tenancy = db.session.get(Tenancy, tenancy_id)
 
         if not tenant or not tenancy:
             return abort(404, description="Tenant or Tenancy not found")
@@ -176,6 +304,7 @@ def link_tenancy(tenant_id, tenancy_id):
 
         new_link = TenantTenancy(tenant_id=tenant_id, tenancy_id=tenancy_id)
         db.session.add(new_link)
+        refresh_occupancy([tenancy.property_id])
         db.session.commit()
         return jsonify({"message": f"Tenant {tenant_id} linked to Tenancy {tenancy_id}"}), 201
     except SQLAlchemyError as e:
@@ -193,8 +322,8 @@ def link_support_worker(tenant_id, worker_id):
     Returns a success message if link is created, otherwise an error.
     """
     try:
-        tenant = db.get(Tenant, tenant_id)
-        worker = db.get(SupportWorker, worker_id)
+        tenant = db.session.get(Tenant, tenant_id)
+        worker = db.session.get(SupportWorker, worker_id)
 
         if not tenant or not worker:
             return abort(404, description="Tenant or Support Worker not found")
@@ -214,3 +343,54 @@ def link_support_worker(tenant_id, worker_id):
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
+
+# ============================================================
+# POST: Bulk Link Tenants to Tenancies
+# ============================================================
+@tenants_bp.route("/link_tenancies", methods=["POST"])
+def link_tenancies_bulk():
+    """
+    Link many tenants to tenancies from a JSON array of
+    {"tenant_id": ..., "tenancy_id": ...} pairs.
+
+    Existence and duplicate checks are set-based; pairs that are already
+    linked are reported in "already_linked" rather than failing the request.
+    """
+    try:
+        result = bulk_link(
+            TenantTenancy,
+            ("tenant_id", Tenant),
+            ("tenancy_id", Tenancy),
+            request.json,
+            before_commit=lambda pairs: refresh_occupancy(
+                affected_properties(Tenancy, {tenancy_id for _, tenancy_id in pairs})
+            )
+        )
+        return jsonify(result), 201 if result["linked"] else 200
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+# ============================================================
+# POST: Bulk Link Tenants to Support Workers
+# ============================================================
+@tenants_bp.route("/link_support_workers", methods=["POST"])
+def link_support_workers_bulk():
+    """
+    Link many tenants to support workers from a JSON array of
+    {"tenant_id": ..., "support_worker_id": ...} pairs.
+
+    Existence and duplicate checks are set-based; pairs that are already
+    linked are reported in "already_linked" rather than failing the request.
+    """
+    try:
+        result = bulk_link(
+            TenantSupportWorker,
+            ("tenant_id", Tenant),
+            ("support_worker_id", SupportWorker),
+            request.json
+        )
+        return jsonify(result), 201 if result["linked"] else 200
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
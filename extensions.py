@@ -7,6 +7,20 @@ Extensions are instantiated here and later initialized with the Flask app.
 from flask_sqlalchemy import SQLAlchemy
 from flask_marshmallow import Marshmallow
 
+# Application module
+from utils.cache import ResponseCache
+from utils.compression import Compression
+from utils.idempotency import Idempotency
+from utils.jobs import JobRunner
+from utils.query_monitor import QueryMonitor
+from utils.replicas import ReplicaRouter, RoutingSession
+
 # Flask extensions
-db = SQLAlchemy()         # SQLAlchemy instance for database ORM
+db = SQLAlchemy(session_options={"class_": RoutingSession})  # ORM; GET reads may use replicas
 ma = Marshmallow()        # Marshmallow instance for object serialization/deserialization
+cache = ResponseCache()   # Server-side GET response cache with per-table invalidation
+replicas = ReplicaRouter()  # Read replica engines for RoutingSession
+query_monitor = QueryMonitor()  # Per-request query counts, Server-Timing and query budgets
+compression = Compression()  # Negotiated gzip/br/zstd response compression
+jobs = JobRunner()  # Background jobs (bulk purges) polled through /jobs/<id>
+idempotency = Idempotency()  # Replays POST responses retried with an Idempotency-Key
@@ -4,7 +4,8 @@ Main application entry point for the Property Management API.
 This module:
 - Loads environment variables
 - Creates and configures the Flask application instance
-- Initializes extensions (SQLAlchemy, Marshmallow)
+- Initializes extensions (SQLAlchemy, Marshmallow, response cache, read replicas,
+  query instrumentation, compression, background jobs, idempotency keys)
 - Registers CLI commands
 - Registers all controller blueprints
 
@@ -16,11 +17,13 @@ from dotenv import load_dotenv
 from werkzeug.exceptions import HTTPException
 
 # Third party extensions
-from extensions import db, ma
+from extensions import db, ma, cache, replicas, query_monitor, compression, jobs, idempotency
 
 # Application Modules
 from controllers import registerable_controllers
 from commands import db_commands
+from utils.serializers import precompile_schemas
+from utils.pool import dispose_after_fork
 
 # Load variables from the .env file (e.g., database credentials)
 load_dotenv()
@@ -46,6 +49,17 @@ def create_app():
     # Initialize extensions
     db.init_app(app)
     ma.init_app(app)
+    cache.init_app(app)
+    replicas.init_app(app)
+    query_monitor.init_app(app)
+    compression.init_app(app)
+    jobs.init_app(app)
+    # After compression, so its after_request hook stores uncompressed bodies
+    idempotency.init_app(app)
+
+    # Give each forked gunicorn worker its own connection pools
+    with app.app_context():
+        dispose_after_fork([*db.engines.values(), *replicas.engines])
 
     # Register custom database CLI commands (flask db create, db drop, etc.)
     app.register_blueprint(db_commands)
@@ -77,4 +91,7 @@ def create_app():
     for blueprint in registerable_controllers:
         app.register_blueprint(blueprint)
 
+    # Compile fast-path serializers for every schema once, at startup
+    precompile_schemas()
+
     return app
@@ -0,0 +1,410 @@
+"""
+Online migrations for existing databases.
+
+``flask db create`` only creates missing tables; it does not add new indexes
+or other changes to tables that already exist. The steps in this module
+bring an existing database up to date with the models. Each step is
+idempotent, so ``flask db migrate`` can be re-run safely.
+
+Tables added to the models since the database was created (e.g.
+``property_occupancy``) are created first, and empty read models are filled
+from the existing rows as the last step, so they are correct straight
+after an upgrade.
+
+Columns added to the models since a table was created (e.g. ``version_id``)
+are added with ``ALTER TABLE ... ADD COLUMN``; a column with a constant
+server default is added without rewriting the table on PostgreSQL 11+.
+
+On PostgreSQL, indexes are built with ``CREATE INDEX CONCURRENTLY`` so the
+tables stay readable and writable while the index is built, and foreign
+keys are switched to ``ON DELETE CASCADE`` with ``NOT VALID`` followed by a
+separate ``VALIDATE CONSTRAINT``, so neither step blocks writes for long.
+SQLite cannot alter a foreign key, so the affected tables are rebuilt.
+
+"""
+
+# Standard library imports
+import re
+
+# Third-party imports
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.schema import CreateColumn, CreateIndex, CreateTable
+
+# Application modules
+from extensions import db, cache
+from utils.dashboard import create_views
+from utils.occupancy import rebuild_occupancy
+from utils.table_versions import install_version_rows
+
+# Read model tables -> function filling them from the existing rows
+READ_MODELS = {
+    "property_occupancy": rebuild_occupancy,
+}
+
+
+def _concurrent_index_ddl(index, dialect):
+    """Compile ``CREATE INDEX CONCURRENTLY IF NOT EXISTS`` for a PostgreSQL index."""
+    ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=dialect))
+    return re.sub(r"^CREATE (UNIQUE )?INDEX ", r"CREATE \1INDEX CONCURRENTLY ", ddl)
+
+
+def _drop_invalid_index(conn, name):
+    """
+    Drop an index left INVALID by an interrupted concurrent build.
+
+    ``IF NOT EXISTS`` would otherwise skip it and leave the index unusable.
+    """
+    invalid = conn.scalar(text(
+        "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+        "WHERE c.relname = :name AND NOT i.indisvalid"
+    ), {"name": name})
+    if invalid:
+        conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+    return bool(invalid)
+
+
+def remove_duplicate_links(engine, echo=print):
+    """
+    Delete duplicate rows from tables that declare a unique index, keeping the
+    row with the lowest id, so that the unique index can be built.
+
+    Args:
+        engine (Engine): Engine for the target database.
+        echo (Callable[[str], None]): Progress output.
+    """
+    changed = set()
+    with engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                if not index.unique or "id" not in table.c:
+                    continue
+                columns = ", ".join(column.name for column in index.columns)
+                result = conn.execute(text(
+                    f"DELETE FROM {table.name} WHERE id NOT IN "
+                    f"(SELECT MIN(id) FROM {table.name} GROUP BY {columns})"
+                ))
+                if result.rowcount:
+                    changed.add(table.name)
+                    echo(f"Removed {result.rowcount} duplicate rows from {table.name}")
+    # Deleted outside the ORM session, so bump the cached table versions explicitly
+    cache.invalidate(changed)
+
+
+def create_extensions(engine, echo=print):
+    """
+    Create the PostgreSQL extensions the indexes depend on (pg_trgm).
+
+    Args:
+        engine (Engine): Engine for the target database.
+        echo (Callable[[str], None]): Progress output.
+
+    Returns:
+        list[str]: Names of extensions that could not be created.
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+    try:
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        echo("Extension pg_trgm is present")
+        return []
+    except DBAPIError as e:
+        echo(f"Extension pg_trgm failed: {e.orig}")
+        return ["pg_trgm"]
+
+
+def create_missing_tables(engine, echo=print):
+    """
+    Create the tables declared on the models that are missing from the database.
+
+    Args:
+        engine (Engine): Engine for the target database.
+        echo (Callable[[str], None]): Progress output.
+
+    Returns:
+        list[str]: Tables that could not be created.
+    """
+    failed = []
+    existing_tables = set(inspect(engine).get_table_names())
+    for table in db.metadata.sorted_tables:
+        if table.name in existing_tables:
+            continue
+        try:
+            table.create(bind=engine)
+            echo(f"Created table {table.name}")
+        except DBAPIError as e:
+            failed.append(table.name)
+            echo(f"Creating table {table.name} failed: {e.orig}")
+    return failed
+
+
+def add_missing_columns(engine, echo=print):
+    """
+    Add the columns declared on the models that are missing from existing tables.
+
+    Only nullable columns and columns with a server default can be added to a
+    table that already holds rows; others are reported as failed.
+
+    Args:
+        engine (Engine): Engine for the target database.
+        echo (Callable[[str], None]): Progress output.
+
+    Returns:
+        list[str]: Columns ("table.column") that could not be added.
+    """
+    failed = []
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            label = f"{table.name}.{column.name}"
+            ddl = str(CreateColumn(column).compile(dialect=engine.dialect))
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+                echo(f"Added column {label}")
+            except DBAPIError as e:
+                failed.append(label)
+                echo(f"Adding column {label} failed: {e.orig}")
+    return failed
+
+
+def _cascading_foreign_keys(engine):
+    """
+    Yield ``(table, foreign_key)`` for every foreign key declared ON DELETE
+    CASCADE on a table that exists in the database.
+    """
+    existing_tables = set(inspect(engine).get_table_names())
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        for foreign_key in sorted(table.foreign_keys, key=lambda fk: fk.parent.name):
+            if (foreign_key.ondelete or "").upper() == "CASCADE":
+                yield table, foreign_key
+
+
+def _cascade_postgresql(engine, echo):
+    failed = []
+    for table, foreign_key in _cascading_foreign_keys(engine):
+        column, target = foreign_key.parent.name, foreign_key.column
+        label = f"{table.name}.{column}"
+        with engine.begin() as conn:
+            existing = conn.execute(text(
+                "SELECT c.conname, c.confdeltype FROM pg_constraint c "
+                "JOIN pg_class t ON t.oid = c.conrelid "
+                "JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = ANY (c.conkey) "
+                "WHERE c.contype = 'f' AND t.relname = :table AND a.attname = :column "
+                "AND pg_table_is_visible(t.oid)"
+            ), {"table": table.name, "column": column}).first()
+        if existing is not None and existing.confdeltype == "c":
+            echo(f"Foreign key {label} cascades deletes")
+            continue
+        name = existing.conname if existing is not None else f"{table.name}_{column}_fkey"
+        try:
+            # NOT VALID skips the scan of existing rows, so the table is locked only briefly
+            with engine.begin() as conn:
+                conn.execute(text(
+                    f'ALTER TABLE {table.name} DROP CONSTRAINT IF EXISTS "{name}", '
+                    f'ADD CONSTRAINT "{name}" FOREIGN KEY ({column}) '
+                    f"REFERENCES {target.table.name} ({target.name}) ON DELETE CASCADE NOT VALID"
+                ))
+            # Validation scans the rows without blocking reads or writes
+            with engine.begin() as conn:
+                conn.execute(text(f'ALTER TABLE {table.name} VALIDATE CONSTRAINT "{name}"'))
+            echo(f"Foreign key {label} now cascades deletes")
+        except DBAPIError as e:
+            failed.append(label)
+            echo(f"Foreign key {label} failed: {e.orig}")
+    return failed
+
+
+def _rebuild_sqlite_table(conn, table, engine):
+    """Recreate a SQLite table from its model definition, keeping its rows and indexes."""
+    rebuilt = f"{table.name}__rebuild"
+    existing = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table.name})")}
+    columns = ", ".join(column.name for column in table.columns if column.name in existing)
+    ddl = str(CreateTable(table).compile(dialect=engine.dialect))
+    conn.exec_driver_sql(f"DROP TABLE IF EXISTS {rebuilt}")
+    conn.exec_driver_sql(ddl.replace(f"CREATE TABLE {table.name} ", f"CREATE TABLE {rebuilt} ", 1))
+    conn.exec_driver_sql(f"INSERT INTO {rebuilt} ({columns}) SELECT {columns} FROM {table.name}")
+    conn.exec_driver_sql(f"DROP TABLE {table.name}")
+    conn.exec_driver_sql(f"ALTER TABLE {rebuilt} RENAME TO {table.name}")
+    for index in table.indexes:
+        if _applies_to(index, engine.dialect):
+            index.create(bind=conn, checkfirst=True)
+
+
+def _cascade_sqlite(engine, echo):
+    failed = []
+    pending = {}
+    with engine.connect() as conn:
+        for table, foreign_key in _cascading_foreign_keys(engine):
+            rows = conn.exec_driver_sql(f"PRAGMA foreign_key_list({table.name})").all()
+            # Columns: id, seq, table, from, to, on_update, on_delete, match
+            if any(row[3] == foreign_key.parent.name and row[6].upper() == "CASCADE" for row in rows):
+                echo(f"Foreign key {table.name}.{foreign_key.parent.name} cascades deletes")
+            else:
+                pending.setdefault(table, []).append(foreign_key.parent.name)
+
+    for table, columns in pending.items():
+        labels = [f"{table.name}.{column}" for column in columns]
+        with engine.connect() as conn:
+            # Foreign keys must be off while the table is dropped and renamed;
+            # the pragma has no effect inside a transaction
+            conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+            conn.commit()
+            try:
+                # Explicit BEGIN so the DDL is rolled back too (pysqlite only begins before DML)
+                conn.exec_driver_sql("BEGIN")
+                _rebuild_sqlite_table(conn, table, engine)
+                if conn.exec_driver_sql(f"PRAGMA foreign_key_check({table.name})").first():
+                    raise RuntimeError(f"{table.name} has rows referencing missing parents")
+                conn.commit()
+                echo(f"Rebuilt {table.name}: {', '.join(labels)} now cascade deletes")
+            except (DBAPIError, RuntimeError) as e:
+                conn.rollback()
+                failed.extend(labels)
+                echo(f"Rebuilding {table.name} failed: {getattr(e, 'orig', e)}")
+            finally:
+                conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+                conn.commit()
+    return failed
+
+
+def cascade_foreign_keys(engine, echo=print):
+    """
+    Make every foreign key declared ``ondelete="CASCADE"`` on the models cascade in the database.
+
+    Args:
+        engine (Engine): Engine for the target database.
+        echo (Callable[[str], None]): Progress output.
+
+    Returns:
+        list[str]: Foreign keys ("table.column") that could not be changed.
+    """
+    if engine.dialect.name == "postgresql":
+        return _cascade_postgresql(engine, echo)
+    if engine.dialect.name == "sqlite":
+        return _cascade_sqlite(engine, echo)
+    return []
+
+
+def create_version_rows(engine, echo=print):
+    """
+    Create the ``table_version`` rows of the response cache, and drop the
+    version triggers of earlier releases.
+
+    Args:
+        engine (Engine): Engine for the target database.
+        echo (Callable[[str], None]): Progress output.
+
+    Returns:
+        list[str]: ["table_version"] if the rows could not be created.
+    """
+    try:
+        with engine.begin() as conn:
+            install_version_rows(conn, db.metadata)
+    except DBAPIError as e:
+        echo(f"Table versions failed: {e.orig}")
+        return ["table_version"]
+    echo("Table versions are present")
+    return []
+
+
+def _applies_to(index, dialect):
+    """Return False for indexes restricted to another dialect with ``ddl_if``."""
+    ddl_if = getattr(index, "_ddl_if", None)
+    return ddl_if is None or ddl_if.dialect in (None, dialect.name)
+
+
+def create_indexes(engine, echo=print):
+    """
+    Create every index declared on the models that is missing from the database.
+
+    Args:
+        engine (Engine): Engine for the target database.
+        echo (Callable[[str], None]): Progress output.
+
+    Returns:
+        list[str]: Names of indexes that failed to build (e.g. a unique index
+        over duplicate rows), so the caller can report them.
+    """
+    failed = []
+    if engine.dialect.name == "postgresql":
+        # CONCURRENTLY cannot run inside a transaction block
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for table in db.metadata.sorted_tables:
+                for index in sorted(table.indexes, key=lambda idx: idx.name):
+                    if not _applies_to(index, engine.dialect):
+                        continue
+                    if _drop_invalid_index(conn, index.name):
+                        echo(f"Dropped invalid index {index.name}")
+                    try:
+                        conn.execute(text(_concurrent_index_ddl(index, engine.dialect)))
+                        echo(f"Index {index.name} is present")
+                    except DBAPIError as e:
+                        failed.append(index.name)
+                        echo(f"Index {index.name} failed: {e.orig}")
+    else:
+        for table in db.metadata.sorted_tables:
+            for index in sorted(table.indexes, key=lambda idx: idx.name):
+                if not _applies_to(index, engine.dialect):
+                    continue
+                try:
+                    with engine.begin() as conn:
+                        index.create(bind=conn, checkfirst=True)
+                    echo(f"Index {index.name} is present")
+                except DBAPIError as e:
+                    failed.append(index.name)
+                    echo(f"Index {index.name} failed: {e.orig}")
+    return failed
+
+
+def fill_read_models(engine, echo=print):
+    """
+    Fill the read models whose table is empty (e.g. just created) from the
+    existing rows. An empty read model is either new or has nothing to hold,
+    so rebuilding it is cheap either way.
+
+    Args:
+        engine (Engine): Engine for the target database (the app's primary).
+        echo (Callable[[str], None]): Progress output.
+
+    Returns:
+        list[str]: Read models that could not be filled.
+    """
+    failed = []
+    existing_tables = set(inspect(engine).get_table_names())
+    for name, fill in READ_MODELS.items():
+        if name not in existing_tables:
+            continue
+        with engine.connect() as conn:
+            if conn.scalar(text(f"SELECT 1 FROM {name} LIMIT 1")):
+                echo(f"Read model {name} is filled")
+                continue
+        try:
+            echo(f"Filled {name} with {fill()} rows")
+        except DBAPIError as e:
+            db.session.rollback()
+            failed.append(name)
+            echo(f"Filling {name} failed: {e.orig}")
+    return failed
+
+
+# Ordered migration steps run by "flask db migrate"
+MIGRATIONS = [
+    create_extensions,
+    create_missing_tables,
+    add_missing_columns,
+    cascade_foreign_keys,
+    create_version_rows,
+    create_indexes,
+    create_views,
+    fill_read_models,
+]
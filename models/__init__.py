@@ -13,11 +13,19 @@ Models Included:
     - Tenant
     - TenantTenancy (junction table for Tenant ↔ Tenancy many-to-many)
     - TenantSupportWorker (junction table for Tenant ↔ SupportWorker many-to-many)
+    - PropertyOccupancy (read model of each occupied property's current tenancy and tenants)
+    - IdempotencyKey (stored responses of POST requests sent with an Idempotency-Key)
+    - TableVersion (per-table version counters of the response cache and ETags)
 
 Usage:
     from Models import Property, Tenant, Tenancy, ...
 """
 
+from sqlalchemy import DDL, event
+
+from extensions import db
+from utils.table_versions import install_version_rows
+
 # Core domain models
 from .property import Property
 from .property_manager import PropertyManager
@@ -28,3 +36,26 @@ from .tenant import Tenant
 # Association / junction tables for many-to-many relationships
 from .tenant_tenancy import TenantTenancy
 from .tenant_support_worker import TenantSupportWorker
+
+# Read models
+from .property_occupancy import PropertyOccupancy
+
+# Infrastructure
+from .idempotency_key import IdempotencyKey
+from .table_version import TableVersion
+
+# The trigram search indexes need the pg_trgm extension; create it before the
+# tables on PostgreSQL ("flask db migrate" does the same for existing databases)
+event.listen(
+    db.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
+# Every cached table has a version row in table_version, created with the tables
+# ("flask db migrate" adds them to existing databases)
+event.listen(
+    db.metadata,
+    "after_create",
+    lambda target, connection, **kw: install_version_rows(connection, target)
+)
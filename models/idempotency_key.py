@@ -0,0 +1,40 @@
+# Application module
+from extensions import db
+
+class IdempotencyKey(db.Model):
+    """
+    IdempotencyKey Model
+
+    Records a POST request sent with an ``Idempotency-Key`` header and the
+    response it produced, so a retry with the same key is answered from this
+    table without running the handler again (see utils.idempotency).
+
+    Attributes:
+        key (str): Primary key, the client's Idempotency-Key header value.
+        fingerprint (str): SHA-256 of the method, path, query string and body.
+        status_code (int, optional): Stored response status; NULL while the
+            first request is still running.
+        body (bytes, optional): Stored (uncompressed) response body.
+        mimetype (str, optional): Stored response mimetype.
+        location (str, optional): Stored Location header, if any.
+        created_at (datetime): When the key was first used (UTC); rows older
+            than IDEMPOTENCY_TTL seconds are evicted.
+        claimed_at (datetime, optional): When the request running under the
+            key started (UTC); a claim without a stored response older than
+            IDEMPOTENCY_CLAIM_TIMEOUT seconds can be taken over by a retry.
+    """
+    __tablename__ = "idempotency_key"
+    __table_args__ = (
+        # Eviction of expired keys
+        db.Index("ix_idempotency_key_created_at", "created_at"),
+    )
+
+    key = db.Column(db.String(255), primary_key=True)
+    fingerprint = db.Column(db.String(64), nullable=False)
+    status_code = db.Column(db.SmallInteger)
+    body = db.Column(db.LargeBinary)
+    mimetype = db.Column(db.String(100))
+    location = db.Column(db.String(255))
+    created_at = db.Column(db.DateTime, nullable=False)
+    # Nullable so "flask db migrate" can add it to an existing table
+    claimed_at = db.Column(db.DateTime)
@@ -13,17 +13,28 @@ class Property(db.Model):
         property_manager_id (int): Foreign key linking to PropertyManager.
         property_manager (PropertyManager): One-to-many relationship to the manager.
         tenancies (list[Tenancy]): One-to-many relationship with Tenancy.
+        version_id (int): Row version checked and incremented by every update.
 
     Relationships:
         - Each Property is managed by one PropertyManager.
         - Each Property can have multiple Tenancies.
     """
     __tablename__= "property"
+    __table_args__ = (
+        # Trigram index for /properties/search (PostgreSQL pg_trgm only)
+        db.Index(
+            "ix_property_address_trgm", "address",
+            postgresql_using="gin", postgresql_ops={"address": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     address = db.Column(db.String(50), nullable=False)
 
-    property_manager_id = db.Column(db.Integer, db.ForeignKey("property_manager.id"), nullable=False)
+    property_manager_id = db.Column(db.Integer, db.ForeignKey("property_manager.id", ondelete="CASCADE"), nullable=False, index=True)
+    version_id = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version_id}
 
     # One-to-many back reference to PropertyManager
     property_manager = db.relationship("PropertyManager", back_populates="properties")
@@ -15,6 +15,7 @@ class PropertyManager(db.Model):
         phone (str): Contact phone number.
         email (str): Contact email address.
         properties (list[Property]): One-to-many relationship with Property.
+        version_id (int): Row version checked and incremented by every update.
 
     Relationships:
         - One PropertyManager can manage multiple Properties.
@@ -26,6 +27,9 @@ class PropertyManager(db.Model):
     name = db.Column(db.String(50), nullable=False)
     phone = db.Column(db.String(15), nullable=False)
     email = db.Column(db.String(50), nullable=False)
+    version_id = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version_id}
 
     @validates("email")
     def validate_email(self, key, value):
@@ -0,0 +1,30 @@
+# Application module
+from extensions import db
+
+class PropertyOccupancy(db.Model):
+    """
+    PropertyOccupancy Model
+
+    Read model holding, for each occupied property, its current "Tenanted"
+    tenancy and that tenancy's tenants. Rows are recomputed by the handlers
+    that change tenancies, tenant links or tenant names (see utils.occupancy),
+    so reading a property's occupancy is one primary key lookup however long
+    its tenancy history is. Vacant properties have no row.
+
+    Attributes:
+        property_id (int): Primary key, foreign key linking to Property.
+        tenancy_id (int): The current tenancy (deliberately not a foreign key,
+            so the row outlives a deleted tenancy until it is recomputed).
+        start_date (date): Start date of the current tenancy.
+        end_date (date, optional): End date of the current tenancy.
+        tenants (list[dict]): Tenants of the tenancy as {"id", "name"}.
+    """
+    __tablename__ = "property_occupancy"
+
+    property_id = db.Column(
+        db.Integer, db.ForeignKey("property.id", ondelete="CASCADE"), primary_key=True
+    )
+    tenancy_id = db.Column(db.Integer, nullable=False, index=True)
+    start_date = db.Column(db.Date, nullable=False)
+    end_date = db.Column(db.Date)
+    tenants = db.Column(db.JSON, nullable=False)
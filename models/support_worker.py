@@ -16,17 +16,28 @@ class SupportWorker(db.Model):
         email (str): Contact email address.
         tenant_support_worker (list[TenantSupportWorker]): Association table for many-to-many with tenants.
         tenants (list[Tenant]): Many-to-many relationship to Tenant.
+        version_id (int): Row version checked and incremented by every update.
 
     Relationships:
         - Each SupportWorker can be linked to multiple Tenants via TenantSupportWorker.
     """
 
     __tablename__= "support_worker"
+    __table_args__ = (
+        # Trigram index for /support_workers/search (PostgreSQL pg_trgm only)
+        db.Index(
+            "ix_support_worker_name_trgm", "name",
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = db.Column(db.Integer,primary_key=True)
     name = db.Column(db.String(50), nullable=False)
     phone = db.Column(db.String(15))
     email = db.Column(db.String(50), nullable=False)
+    version_id = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version_id}
 
     @validates("email")
     def validate_email(self, key, value):
@@ -45,12 +56,14 @@ class SupportWorker(db.Model):
     tenant_support_worker = db.relationship(
         "TenantSupportWorker",
         back_populates="support_worker",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
 
     tenants = db.relationship(
         "Tenant",
         secondary="tenant_support_worker",
         back_populates="support_workers",
-        overlaps="tenant_support_worker"
+        overlaps="tenant_support_worker",
+        passive_deletes=True
     )
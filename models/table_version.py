@@ -0,0 +1,21 @@
+# Application module
+from extensions import db
+
+class TableVersion(db.Model):
+    """
+    TableVersion Model
+
+    A version counter per table, incremented after each commit that wrote
+    to the table (see utils.table_versions). The response cache and the
+    ETags are built from these counters, so every worker sees the same
+    versions.
+
+    Attributes:
+        name (str): Primary key, the name of the versioned table.
+        version (int): Incremented on every write to the table; starts at a
+            timestamp so a recreated database never repeats old versions.
+    """
+    __tablename__ = "table_version"
+
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False)
@@ -16,18 +16,30 @@ class Tenancy(db.Model):
         property (Property): One-to-many relationship to Property.
         tenant_tenancy (list[TenantTenancy]): Association table for many-to-many with Tenant.
         tenants (list[Tenant]): Many-to-many relationship to Tenant.
+        version_id (int): Row version checked and incremented by every update.
 
     Relationships:
         - Each Tenancy belongs to one Property.
         - Each Tenancy can have multiple Tenants through TenantTenancy.
     """
     __tablename__= "tenancy"
+    __table_args__ = (
+        # Search: status filter with start_date order/range, id as keyset tie-breaker
+        db.Index("ix_tenancy_status_start_date", "tenancy_status", "start_date", "id"),
+        # Search: start_date order/range and overlap queries without a status filter
+        db.Index("ix_tenancy_start_date", "start_date", "id"),
+        # Search: end_date range and overlap queries
+        db.Index("ix_tenancy_end_date", "end_date"),
+    )
 
     id = db.Column(db.Integer,primary_key=True)
-    property_id = db.Column(db.Integer, db.ForeignKey("property.id"), nullable=False)
+    property_id = db.Column(db.Integer, db.ForeignKey("property.id", ondelete="CASCADE"), nullable=False, index=True)
     start_date = db.Column(db.Date, nullable=False)
     end_date = db.Column(db.Date)
     tenancy_status = db.Column(db.String(50), nullable=False)
+    version_id = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version_id}
 
     # One-to-many back reference to Property
     property = db.relationship("Property", back_populates="tenancies")
@@ -36,12 +48,14 @@ class Tenancy(db.Model):
     tenant_tenancy = db.relationship(
         "TenantTenancy",
         back_populates="tenancy",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
 
     tenants = db.relationship(
         "Tenant",
         secondary="tenant_tenancy",
         back_populates="tenancies",
-        overlaps="tenant_tenancy"
+        overlaps="tenant_tenancy",
+        passive_deletes=True
     )
@@ -19,18 +19,33 @@ class Tenant(db.Model):
         tenant_support_worker (list[TenantSupportWorker]): Association table for many-to-many with SupportWorker.
         tenancies (list[Tenancy]): Many-to-many relationship to Tenancy through TenantTenancy.
         support_workers (list[SupportWorker]): Many-to-many relationship to SupportWorker through TenantSupportWorker.
+        version_id (int): Row version checked and incremented by every update.
 
     Relationships:
         - A Tenant can be linked to multiple Tenancies via TenantTenancy.
         - A Tenant can be linked to multiple SupportWorkers via TenantSupportWorker.
     """
     __tablename__= "tenant"
+    __table_args__ = (
+        # Trigram indexes for /tenants/search (PostgreSQL pg_trgm only)
+        db.Index(
+            "ix_tenant_name_trgm", "name",
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+        db.Index(
+            "ix_tenant_email_trgm", "email",
+            postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = db.Column(db.Integer,primary_key=True)
     name = db.Column(db.String(50), nullable=False)
     date_of_birth = db.Column(db.Date, nullable=False)
     phone = db.Column(db.String(15))
     email = db.Column(db.String(50))
+    version_id = db.Column(db.Integer, nullable=False, default=1, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version_id}
 
     @validates("email")
     def validate_email(self, key, value):
@@ -49,14 +64,16 @@ class Tenant(db.Model):
     tenant_tenancy = db.relationship(
         "TenantTenancy",
         back_populates="tenant",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
 
     # One-to-many: Tenant -> TenantSupportWorker
     tenant_support_worker = db.relationship(
         "TenantSupportWorker",
         back_populates="tenant",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
 
     # Many-to-many: Tenant <-> Tenancy through TenantTenancy
@@ -64,7 +81,8 @@ class Tenant(db.Model):
         "Tenancy",
         secondary="tenant_tenancy",
         back_populates="tenants",
-        overlaps="tenant_tenancy"
+        overlaps="tenant_tenancy",
+        passive_deletes=True
     )
 
     # Many-to-many: Tenant <-> SupportWorker through TenantSupportWorker
@@ -72,5 +90,6 @@ class Tenant(db.Model):
     "SupportWorker",
     secondary="tenant_support_worker",
     back_populates="tenants",
-    overlaps="tenant_support_worker"
+    overlaps="tenant_support_worker",
+    passive_deletes=True
     )
@@ -22,10 +22,15 @@ class TenantSupportWorker(db.Model):
     """
 
     __tablename__= "tenant_support_worker"
+    __table_args__ = (
+        # One link per pair; also backs INSERT ... ON CONFLICT DO NOTHING for bulk links
+        # and serves tenant_id lookups through its leading column
+        db.Index("ix_tenant_support_worker_tenant_id_support_worker_id", "tenant_id", "support_worker_id", unique=True),
+    )
 
     id = db.Column(db.Integer,primary_key=True)
     rank = db.Column(db.Integer)
-    support_worker_id = db.Column(db.Integer, db.ForeignKey("support_worker.id", ondelete="CASCADE"), nullable=False)
+    support_worker_id = db.Column(db.Integer, db.ForeignKey("support_worker.id", ondelete="CASCADE"), nullable=False, index=True)
     tenant_id = db.Column(db.Integer, db.ForeignKey("tenant.id", ondelete="CASCADE"), nullable=False)
 
     tenant = db.relationship(
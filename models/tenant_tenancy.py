@@ -21,10 +21,15 @@ class TenantTenancy(db.Model):
         - Uses back_populates and overlaps to maintain ORM consistency.
     """
     __tablename__= "tenant_tenancy"
+    __table_args__ = (
+        # One link per pair; also backs INSERT ... ON CONFLICT DO NOTHING for bulk links
+        # and serves tenant_id lookups through its leading column
+        db.Index("ix_tenant_tenancy_tenant_id_tenancy_id", "tenant_id", "tenancy_id", unique=True),
+    )
 
     id = db.Column(db.Integer,primary_key=True)
     rank = db.Column(db.Integer)
-    tenancy_id = db.Column(db.Integer, db.ForeignKey("tenancy.id", ondelete="CASCADE"), nullable=False)
+    tenancy_id = db.Column(db.Integer, db.ForeignKey("tenancy.id", ondelete="CASCADE"), nullable=False, index=True)
     tenant_id = db.Column(db.Integer, db.ForeignKey("tenant.id", ondelete="CASCADE"), nullable=False)
 
     tenancy = db.relationship(
@@ -29,6 +29,7 @@ class PropertyManagerSchema(ma.SQLAlchemySchema):
             name (str): Name of the property manager.
             phone (str): Phone number.
             email (str): Email address.
+            version_id (int): Row version, sent back in If-Match to update (dump only).
         """
         model = PropertyManager
         load_instance = False
@@ -38,6 +39,7 @@ class PropertyManagerSchema(ma.SQLAlchemySchema):
     name = ma.auto_field()
     phone = ma.auto_field()
     email = ma.auto_field()
+    version_id = ma.auto_field(dump_only=True)
 
 class PropertyManagerWithPropertiesSchema(ma.SQLAlchemySchema):
     class Meta:
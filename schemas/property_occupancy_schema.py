@@ -0,0 +1,49 @@
+"""
+Property Occupancy Schema
+
+This module defines the Marshmallow schema used to serialize the property
+occupancy read model (GET /properties/occupancy and
+GET /properties/<id>/occupancy).
+
+Schemas:
+    - PropertyOccupancySchema: A property's occupancy, current tenancy and tenants.
+
+Schema Instances:
+    - property_occupancy_schema: Single instance.
+    - property_occupancies_schema: Multiple instances.
+
+"""
+
+# Imports
+from marshmallow import fields
+from extensions import ma
+
+class PropertyOccupancySchema(ma.Schema):
+    """
+    Occupancy of a property, dumped from the rows of utils.occupancy.
+
+    Fields:
+        property_id (int): The property.
+        occupied (bool): Whether the property has a current "Tenanted" tenancy.
+        tenancy_id (int, optional): The current tenancy.
+        start_date (date, optional): Start date of the current tenancy.
+        end_date (date, optional): End date of the current tenancy.
+        tenants (list[dict]): Tenants of the current tenancy ({"id", "name"}).
+    """
+    class Meta:
+        ordered = True
+
+    property_id = fields.Integer()
+    occupied = fields.Boolean()
+    tenancy_id = fields.Integer(allow_none=True)
+    start_date = fields.Date(allow_none=True)
+    end_date = fields.Date(allow_none=True)
+    tenants = fields.Method("get_tenants")
+
+    def get_tenants(self, obj):
+        """Vacant properties have no tenants."""
+        return obj.tenants or []
+
+# Schema Instances
+property_occupancy_schema = PropertyOccupancySchema()
+property_occupancies_schema = PropertyOccupancySchema(many=True)
@@ -26,6 +26,7 @@ class PropertySchema(ma.SQLAlchemySchema):
         id (int): Primary key.
         address (str): Address of the property.
         property_manager_id (int): Foreign key to the PropertyManager (load_only).
+        version_id (int): Row version, sent back in If-Match to update (dump only).
     """
     class Meta:
         model = Property
@@ -35,6 +36,7 @@ class PropertySchema(ma.SQLAlchemySchema):
     id = ma.auto_field()
     address = ma.auto_field()
     property_manager_id = ma.auto_field(load_only=True)
+    version_id = ma.auto_field(dump_only=True)
 
 class PropertyWithManagerSchema(ma.SQLAlchemySchema):
     class Meta:
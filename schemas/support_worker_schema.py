@@ -27,6 +27,7 @@ class SupportWorkerSchema(ma.SQLAlchemySchema):
         name (str): Name of the support worker.
         phone (str): Phone number.
         email (str): Email address.
+        version_id (int): Row version, sent back in If-Match to update (dump only).
     """
     class Meta:
         model = SupportWorker
@@ -37,6 +38,7 @@ class SupportWorkerSchema(ma.SQLAlchemySchema):
     name = ma.auto_field()
     phone = ma.auto_field()
     email = ma.auto_field()
+    version_id = ma.auto_field(dump_only=True)
 
 class SupportWorkerWithTenantSchema(ma.SQLAlchemySchema):
     """
@@ -31,6 +31,7 @@ class TenancySchema(ma.SQLAlchemySchema):
         end_date (date): End date of the tenancy (optional).
         tenancy_status (str): Status of the tenancy.
         property_id (int, load_only): Foreign key to Property (load only).
+        version_id (int): Row version, sent back in If-Match to update (dump only).
     """
     class Meta:
         model = Tenancy
@@ -42,6 +43,7 @@ class TenancySchema(ma.SQLAlchemySchema):
     end_date = ma.auto_field()
     tenancy_status = ma.auto_field()
     property_id = ma.auto_field(load_only=True)
+    version_id = ma.auto_field(dump_only=True)
 
 class TenancyWithPropertySchema(TenancySchema):
     """
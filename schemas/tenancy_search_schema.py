@@ -0,0 +1,78 @@
+"""
+Tenancy Search Schema
+
+This module defines the Marshmallow schemas used to validate the tenancy
+filters of the search endpoint (GET /tenancies/search) and of filtered
+batch updates (PATCH /tenancies/).
+
+Schemas:
+    - TenancyFilterSchema: Typed, validated filters only; unknown keys are rejected.
+    - TenancySearchSchema: The filters plus sort key and page.
+
+Schema Instances:
+    - tenancy_filter_schema: Single instance.
+    - tenancy_search_schema: Single instance.
+
+"""
+
+# Imports
+from marshmallow import fields, validate, validates_schema, ValidationError, EXCLUDE, RAISE
+from extensions import ma
+
+# Sort keys accepted by the search endpoint ("-" prefix for descending)
+SORT_KEYS = ["id", "-id", "start_date", "-start_date"]
+
+class TenancyFilterSchema(ma.Schema):
+    """
+    Tenancy filters.
+
+    Unknown keys raise a ValidationError: a misspelled filter that was
+    silently dropped would widen a filtered update.
+
+    Fields:
+        status (list[str]): One or more tenancy statuses (IN filter).
+        start_date (date): Tenancies starting on or after this date.
+        end_date (date): Tenancies ending on or before this date.
+        active_from (date): Start of a date range the tenancy must overlap.
+        active_to (date): End of a date range the tenancy must overlap.
+        property_id (int): Tenancies of a single property.
+    """
+    class Meta:
+        unknown = RAISE
+        ordered = True
+
+    status = fields.List(fields.String(validate=validate.Length(min=1, max=50)), validate=validate.Length(max=10))
+    start_date = fields.Date()
+    end_date = fields.Date()
+    active_from = fields.Date()
+    active_to = fields.Date()
+    property_id = fields.Integer(validate=validate.Range(min=1))
+
+    @validates_schema
+    def validate_ranges(self, data, **kwargs):
+        """Reject date ranges whose start is after their end."""
+        if "start_date" in data and "end_date" in data and data["start_date"] > data["end_date"]:
+            raise ValidationError("start_date must not be after end_date", "start_date")
+        if "active_from" in data and "active_to" in data and data["active_from"] > data["active_to"]:
+            raise ValidationError("active_from must not be after active_to", "active_from")
+
+class TenancySearchSchema(TenancyFilterSchema):
+    """
+    Query parameters for tenancy search: the filters, plus:
+
+    Fields:
+        sort (str): Sort key, one of SORT_KEYS (default "id").
+        limit (int): Page size.
+        after (str): Opaque cursor returned as next_cursor by the previous page.
+    """
+    class Meta:
+        unknown = EXCLUDE
+        ordered = True
+
+    sort = fields.String(load_default="id", validate=validate.OneOf(SORT_KEYS))
+    limit = fields.Integer(validate=validate.Range(min=1))
+    after = fields.String()
+
+# Schema Instances
+tenancy_filter_schema = TenancyFilterSchema()
+tenancy_search_schema = TenancySearchSchema()
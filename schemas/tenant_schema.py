@@ -32,6 +32,7 @@ class TenantSchema(ma.SQLAlchemySchema):
         date_of_birth (date): Tenant's date of birth.
         phone (str, optional): Contact phone number.
         email (str, optional): Email address.
+        version_id (int): Row version, sent back in If-Match to update (dump only).
     """
     class Meta:
         model = Tenant
@@ -43,6 +44,7 @@ class TenantSchema(ma.SQLAlchemySchema):
     date_of_birth = ma.auto_field()
     phone = ma.auto_field()
     email = ma.auto_field()
+    version_id = ma.auto_field(dump_only=True)
 
 class TenantWithTenanciesSchema(ma.SQLAlchemySchema):
     """
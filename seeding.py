@@ -0,0 +1,253 @@
+"""
+Synthetic data at scale for ``flask db seed-scale`` and the benchmarks.
+
+Generates referentially consistent rows for every table, in foreign key
+order, from a seeded random generator (the same arguments always produce
+the same data):
+
+    property_manager -> property -> support_worker -> tenant -> tenancy
+    -> tenant_tenancy -> tenant_support_worker
+
+Rows get explicit ids following the current maximum id of each table, so
+new data can be added to a database that already holds rows, and every
+foreign key points at a row generated in the same run.
+
+Loading:
+    - PostgreSQL (psycopg2): ``COPY ... FROM STDIN`` in CSV batches, then
+      the id sequences are moved past the new rows.
+    - Other databases: ``executemany`` INSERTs in batches.
+
+Rows are generated lazily and loaded batch by batch, so memory use stays
+flat for millions of rows.
+
+"""
+
+# Standard library imports
+import csv
+import io
+import random
+from datetime import date, timedelta
+from itertools import islice
+
+# Third-party imports
+from sqlalchemy import func, select, text
+
+# Application modules
+from extensions import cache
+from models.property_manager import PropertyManager
+from models.property import Property
+from models.support_worker import SupportWorker
+from models.tenancy import Tenancy
+from models.tenant import Tenant
+from models.tenant_tenancy import TenantTenancy
+from models.tenant_support_worker import TenantSupportWorker
+
+FIRST_NAMES = (
+    "Olivia", "Jack", "Charlotte", "Noah", "Amelia", "William", "Isla", "Oliver", "Mia", "Leo",
+    "Ava", "Henry", "Grace", "Thomas", "Chloe", "Lucas", "Ella", "James", "Zoe", "Harrison",
+)
+LAST_NAMES = (
+    "Smith", "Jones", "Williams", "Brown", "Wilson", "Taylor", "Johnson", "White", "Martin",
+    "Anderson", "Thompson", "Nguyen", "Thomas", "Walker", "Harris", "Lee", "Ryan", "Robinson",
+)
+STREETS = (
+    "Dandelion Road", "Rubarb Court", "Pterodactyl Close", "Deakin Avenue", "Eleventh Street",
+    "Langtree Avenue", "Riverside Drive", "Ontario Avenue", "Walnut Avenue", "Pine Avenue",
+)
+TOWNS = (
+    ("Mildura", "3500"), ("Merbein", "3505"), ("Red Cliffs", "3496"), ("Irymple", "3498"),
+    ("Swan Hill", "3585"), ("Robinvale", "3549"),
+)
+EMAIL_DOMAINS = ("example.com", "example.org", "example.net")
+
+
+class ScaleSeeder:
+    """
+    Generates and loads one synthetic dataset.
+
+    Attributes:
+        counts (dict[str, int]): Rows to generate per table name.
+        tenants_per_tenancy (int): Maximum tenants linked to each tenancy.
+        workers_per_tenant (int): Support workers linked to each tenant.
+        batch_size (int): Rows per COPY/INSERT batch.
+        rng (random.Random): Seeded generator.
+        today (date): Reference date for tenancy statuses.
+    """
+
+    def __init__(
+        self, managers, properties, support_workers, tenants, tenancies,
+        tenants_per_tenancy=2, workers_per_tenant=1, batch_size=10_000, seed=42
+    ):
+        self.counts = {
+            "property_manager": managers,
+            "property": properties,
+            "support_worker": support_workers,
+            "tenant": tenants,
+            "tenancy": tenancies,
+        }
+        self.tenants_per_tenancy = max(1, min(tenants_per_tenancy, tenants or 1))
+        self.workers_per_tenant = max(0, min(workers_per_tenant, support_workers))
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        self.today = date.today()
+        self.first_ids = {}
+
+    # --------------------------------------------------------
+    # Row generators (tuples in the column order of COLUMNS)
+    # --------------------------------------------------------
+    def _name(self):
+        return f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+
+    def _phone(self):
+        return f"04{self.rng.randrange(10**8):08d}"
+
+    def _email(self, name, number):
+        local = name.lower().replace(" ", ".")
+        return f"{local}{number}@{self.rng.choice(EMAIL_DOMAINS)}"
+
+    def _ids(self, table):
+        first = self.first_ids[table]
+        return range(first, first + self.counts[table])
+
+    def _people(self, table):
+        for person_id in self._ids(table):
+            name = self._name()
+            yield person_id, name, self._phone(), self._email(name, person_id)
+
+    def _properties(self):
+        managers = self._ids("property_manager")
+        for property_id in self._ids("property"):
+            town, postcode = self.rng.choice(TOWNS)
+            street = self.rng.choice(STREETS)
+            address = f"{self.rng.randint(1, 999)} {street}, {town}, Vic, {postcode}"
+            yield property_id, address, self.rng.choice(managers)
+
+    def _tenants(self):
+        for tenant_id in self._ids("tenant"):
+            name = self._name()
+            born = date(1940, 1, 1) + timedelta(days=self.rng.randrange(365 * 65))
+            yield tenant_id, name, born, self._phone(), self._email(name, tenant_id)
+
+    def _tenancies(self):
+        """Tenancies whose status matches their dates relative to today."""
+        properties = self._ids("property")
+        for tenancy_id in self._ids("tenancy"):
+            roll = self.rng.random()
+            if roll < 0.6:
+                start = self.today - timedelta(days=self.rng.randint(1, 3650))
+                end = None if self.rng.random() < 0.5 else self.today + timedelta(days=self.rng.randint(1, 730))
+                status = "Tenanted"
+            elif roll < 0.85:
+                start = self.today - timedelta(days=self.rng.randint(400, 7300))
+                end = start + timedelta(days=self.rng.randint(90, 365))
+                status = "Vacant"
+            else:
+                start = self.today + timedelta(days=self.rng.randint(1, 90))
+                end = None
+                status = "Sign-Up"
+            yield tenancy_id, self.rng.choice(properties), start, end, status
+
+    def _links(self, table, parents, children, per_parent):
+        """Links between distinct (parent, child) pairs, ``1..per_parent`` per parent."""
+        link_id = self.first_ids[table]
+        for parent_id in parents:
+            for rank, child_id in enumerate(self.rng.sample(children, self.rng.randint(1, per_parent)), 1):
+                yield link_id, rank, parent_id, child_id
+                link_id += 1
+
+    # --------------------------------------------------------
+    # Loading
+    # --------------------------------------------------------
+    def run(self, engine, echo=print):
+        """
+        Generate and load the dataset in one transaction.
+
+        Returns:
+            dict[str, int]: Rows inserted per table.
+        """
+        inserted = {}
+        with engine.begin() as conn:
+            for table in TABLES:
+                self.first_ids[table.name] = (conn.scalar(select(func.max(table.c.id))) or 0) + 1
+
+            plan = [
+                (PropertyManager.__table__, self._people("property_manager")),
+                (Property.__table__, self._properties()),
+                (SupportWorker.__table__, self._people("support_worker")),
+                (Tenant.__table__, self._tenants()),
+                (Tenancy.__table__, self._tenancies()),
+            ]
+            if self.counts["tenant"] and self.counts["tenancy"]:
+                plan.append((TenantTenancy.__table__, self._links(
+                    "tenant_tenancy", self._ids("tenancy"), self._ids("tenant"), self.tenants_per_tenancy
+                )))
+            if self.counts["tenant"] and self.workers_per_tenant:
+                plan.append((TenantSupportWorker.__table__, self._links(
+                    "tenant_support_worker", self._ids("tenant"), self._ids("support_worker"),
+                    self.workers_per_tenant
+                )))
+
+            for table, rows in plan:
+                inserted[table.name] = _load(conn, table, COLUMNS[table.name], rows, self.batch_size)
+                echo(f"{table.name}: {inserted[table.name]} rows")
+
+            if engine.dialect.name == "postgresql":
+                for table in TABLES:
+                    conn.execute(text(
+                        f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                        f"(SELECT COALESCE(MAX(id), 1) FROM {table.name}))"
+                    ))
+
+        # Loaded outside the ORM session, so bump the cached table versions explicitly
+        cache.invalidate(inserted)
+        return inserted
+
+
+# Tables in foreign key order
+TABLES = [
+    PropertyManager.__table__, Property.__table__, SupportWorker.__table__, Tenant.__table__,
+    Tenancy.__table__, TenantTenancy.__table__, TenantSupportWorker.__table__,
+]
+
+# Column order of the generated tuples
+COLUMNS = {
+    "property_manager": ("id", "name", "phone", "email"),
+    "property": ("id", "address", "property_manager_id"),
+    "support_worker": ("id", "name", "phone", "email"),
+    "tenant": ("id", "name", "date_of_birth", "phone", "email"),
+    "tenancy": ("id", "property_id", "start_date", "end_date", "tenancy_status"),
+    "tenant_tenancy": ("id", "rank", "tenancy_id", "tenant_id"),
+    "tenant_support_worker": ("id", "rank", "tenant_id", "support_worker_id"),
+}
+
+
+def _batches(rows, size):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _load(conn, table, columns, rows, batch_size):
+    """Load generated rows into ``table`` with COPY (psycopg2) or executemany."""
+    cursor = None
+    if conn.dialect.name == "postgresql":
+        cursor = conn.connection.driver_connection.cursor()
+        if not hasattr(cursor, "copy_expert"):
+            cursor.close()
+            cursor = None
+
+    total = 0
+    for batch in _batches(rows, batch_size):
+        if cursor is not None:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(batch)  # None is written as an unquoted empty value (NULL)
+            buffer.seek(0)
+            cursor.copy_expert(
+                f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+        else:
+            conn.execute(table.insert(), [dict(zip(columns, row)) for row in batch])
+        total += len(batch)
+    if cursor is not None:
+        cursor.close()
+    return total
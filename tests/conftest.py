@@ -0,0 +1,142 @@
+"""
+Shared pytest fixtures.
+
+The suite runs against a throwaway SQLite database under TestingConfig
+(FLASK_ENV=testing), so query budgets are enforced and a route exceeding
+its budget fails its test. The environment is set before the application
+modules are imported, because the configuration is read at import time.
+
+Fixtures:
+    - app: The application, created once per session.
+    - database: Empty tables, recreated for every test.
+    - client: Test client for the app.
+    - seeded: The rows of ``flask db seed``.
+    - scaled: A ScaleSeeder dataset large enough to expose N+1 queries.
+    - replicated: Two SQLite read replicas holding a copy of the seed.
+
+No application context is left pushed while a test runs: the test client
+would reuse it for every request, sharing ``g`` and the database session
+between requests. Tests reading the database directly open their own with
+``app.app_context()``.
+
+"""
+
+# Standard library imports
+import os
+import tempfile
+import time
+
+_directory = tempfile.mkdtemp(prefix="property-api-tests-")
+os.environ["FLASK_ENV"] = "testing"
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_directory, 'test.db')}"
+os.environ["CACHE_BACKEND"] = "lru"
+os.environ["CACHE_VERSION_STORE"] = "database"
+os.environ["DATABASE_REPLICA_URLS"] = ""
+
+# Third-party imports
+import pytest
+from sqlalchemy import func, select
+
+# Application modules
+from main import create_app
+from extensions import db, cache, replicas
+from seeding import ScaleSeeder
+from utils.occupancy import rebuild_occupancy
+
+
+@pytest.fixture(scope="session")
+def app():
+    """Create the application once for the whole session."""
+    return create_app()
+
+
+@pytest.fixture()
+def database(app):
+    """Recreate every table and return the database."""
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    cache.clear()
+    return db
+
+
+@pytest.fixture()
+def client(app, database):
+    """Return a test client for the app, with empty tables."""
+    return app.test_client()
+
+
+@pytest.fixture()
+def seeded(app, database):
+    """Load the rows of ``flask db seed``."""
+    result = app.test_cli_runner().invoke(args=["db", "seed"])
+    assert result.exit_code == 0, result.output
+    return database
+
+
+@pytest.fixture()
+def scaled(app, database):
+    """
+    Load a generated dataset with many rows per parent, so a route that lazy
+    loads a relationship per row runs far more queries than its budget.
+    """
+    with app.app_context():
+        ScaleSeeder(
+            managers=5, properties=20, support_workers=5, tenants=40, tenancies=30, seed=7
+        ).run(database.engine, echo=lambda message: None)
+        rebuild_occupancy()
+    return database
+
+
+@pytest.fixture()
+def replicated(app, seeded, tmp_path, monkeypatch):
+    """
+    Route GET requests to two SQLite replicas holding a copy of the seed.
+
+    Replication is manual: the replicas only see writes made to the primary
+    after ``sync()`` copies it to them again, so they lag until then.
+    """
+    urls = [f"sqlite:///{tmp_path / f'replica{number}.db'}" for number in (1, 2)]
+    monkeypatch.setitem(app.config, "DATABASE_REPLICA_URLS", urls)
+    monkeypatch.setitem(app.config, "DATABASE_REPLICA_ENGINE_OPTIONS", {})
+    replicas.init_app(app)
+
+    def sync():
+        result = app.test_cli_runner().invoke(args=["db", "clone-replicas"])
+        assert result.output.count("Copied primary") == 2, result.output
+
+    sync()
+    yield sync
+    for engine in replicas.engines:
+        engine.dispose()
+    monkeypatch.undo()
+    replicas.init_app(app)
+
+
+def scalars(app, stmt):
+    """Run ``stmt`` in a fresh app context and return its scalar results as a list."""
+    with app.app_context():
+        return db.session.scalars(stmt).all()
+
+
+def count(app, model, *where):
+    """Return the number of rows of ``model`` matching ``where``."""
+    with app.app_context():
+        return db.session.scalar(select(func.count()).select_from(model).where(*where))
+
+
+def wait_for_job(client, response, timeout=10):
+    """
+    Poll the job started by a 202 response until it has finished.
+
+    Returns:
+        dict: The finished job as returned by GET /jobs/<job_id>.
+    """
+    assert response.status_code == 202, response.get_json()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(response.headers["Location"]).get_json()
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"Job {response.headers['Location']} did not finish in {timeout}s")
@@ -0,0 +1,143 @@
+"""The native ASGI read routes, compared with the Flask views they stand in for."""
+
+# Standard library imports
+import asyncio
+
+# Third-party imports
+import pytest
+
+# Application modules
+from asgi import AsyncAPI
+from extensions import replicas
+
+
+class Native:
+    """Drive an AsyncAPI with plain ASGI messages on one event loop (its pool is bound to it)."""
+
+    def __init__(self, app):
+        self.loop = asyncio.new_event_loop()
+        self.api = AsyncAPI(app)
+
+    def get(self, url, headers=None):
+        """Return ``(status, headers, body)`` of a GET request."""
+        return self.loop.run_until_complete(self._get(url, headers or {}))
+
+    async def _get(self, url, headers):
+        path, _, query = url.partition("?")
+        scope = {
+            "type": "http", "http_version": "1.1", "scheme": "http", "server": ("testserver", 80),
+            "method": "GET", "path": path, "root_path": "", "query_string": query.encode(),
+            "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+        }
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        await self.api(scope, receive, send)
+        start, *bodies = messages
+        response_headers = {name.decode().lower(): value.decode() for name, value in start["headers"]}
+        return start["status"], response_headers, b"".join(m.get("body", b"") for m in bodies)
+
+    def close(self):
+        self.loop.run_until_complete(self.api.dispose())
+        self.loop.close()
+
+
+@pytest.fixture()
+def native(app, seeded):
+    native = Native(app)
+    yield native
+    native.close()
+
+
+@pytest.mark.parametrize("url", ["/tenants/", "/tenancies/?limit=2", "/properties/1/", "/support_workers/2/"])
+@pytest.mark.parametrize("encoding", ["identity", "gzip"])
+def test_native_responses_match_flask(client, native, url, encoding):
+    headers = {"Accept-Encoding": encoding}
+    status, native_headers, body = native.get(url, headers)
+    flask = client.get(url, headers=headers)
+
+    # Served natively: the query monitor only sees Flask requests
+    assert "server-timing" not in native_headers
+    assert status == flask.status_code == 200
+    assert body == flask.data
+    for name in ("ETag", "Cache-Control", "Vary", "Content-Encoding"):
+        assert native_headers.get(name.lower()) == flask.headers.get(name)
+
+
+def test_native_list_shares_the_response_cache(client, native):
+    assert native.get("/tenants/")[1]["x-cache"] == "MISS"
+    assert client.get("/tenants/").headers["X-Cache"] == "HIT"
+    assert native.get("/tenants/?limit=1")[1]["x-cache"] == "MISS"
+
+
+@pytest.mark.parametrize("url", ["/tenants/", "/tenants/1/"])
+def test_native_etag_answers_304(client, native, url):
+    etag = client.get(url).headers["ETag"]
+
+    status, headers, body = native.get(url, {"If-None-Match": etag})
+
+    assert status == 304
+    assert headers["etag"] == etag
+    assert body == b""
+
+
+def test_native_etag_changes_with_a_write(client, native):
+    etag = native.get("/tenants/1/")[1]["etag"]
+
+    client.put("/tenants/1/", json={"phone": "0400000000"})
+
+    status, headers, body = native.get("/tenants/1/", {"If-None-Match": etag})
+    assert status == 200
+    assert headers["etag"] != etag
+    assert b"0400000000" in body
+
+
+@pytest.mark.parametrize("query", ["limit=%C2%B2", "limit=%D9%A1", "after=%C2%B2", "limit=+2"])
+def test_native_invalid_page_args_fall_back_to_flask(native, query):
+    status, _, body = native.get(f"/tenants/?{query}")
+
+    assert status == 400
+    assert b"must be" in body
+
+
+def test_native_missing_object_is_404(client, native):
+    status, _, body = native.get("/tenants/999/")
+
+    assert status == 404
+    assert body == client.get("/tenants/999/").data
+
+
+def test_native_reads_are_spread_over_the_replicas(app, client, replicated):
+    native = Native(app)
+    try:
+        for _ in range(4):
+            assert native.get("/tenants/1/")[0] == 200
+        assert [replica.reads for replica in replicas.replicas] == [2, 2]
+
+        client.put("/tenants/1/", json={"phone": "0400000000"})
+        # The replicas lag until synced, and the version is read from them too
+        assert b"0400000000" not in native.get("/tenants/1/")[2]
+        replicated()
+        assert b"0400000000" in native.get("/tenants/1/")[2]
+    finally:
+        native.close()
+
+
+def test_native_reads_skip_an_unreachable_replica(app, replicated, tmp_path):
+    native = Native(app)
+    try:
+        broken = replicas.replicas[0]
+        (tmp_path / "replica1.db").unlink()
+        (tmp_path / "replica1.db").mkdir()
+
+        for _ in range(4):
+            assert native.get("/tenants/1/")[0] == 200
+        assert not broken.healthy
+        assert replicas.replicas[1].reads == 4
+    finally:
+        native.close()
@@ -0,0 +1,112 @@
+"""Batched tenancy updates: PATCH /tenancies/ with a list of items or a filter."""
+
+# Third-party imports
+import pytest
+
+# Application modules
+from extensions import db
+from models.tenancy import Tenancy
+
+
+def tenancy(app, tenancy_id):
+    with app.app_context():
+        return db.session.get(Tenancy, tenancy_id)
+
+
+def test_patch_list_updates_rows_and_bumps_versions(app, client, seeded):
+    versions = {n: tenancy(app, n).version_id for n in (1, 2)}
+
+    response = client.patch("/tenancies/", json=[
+        {"id": 1, "fields": {"tenancy_status": "Tenanted"}},
+        {"id": 2, "fields": {"tenancy_status": "Tenanted"}},
+    ])
+
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "updated": 2, "ids": [1, 2], "conflicts": [], "not_found": [], "errors": []
+    }
+    for n in (1, 2):
+        assert tenancy(app, n).tenancy_status == "Tenanted"
+        assert tenancy(app, n).version_id == versions[n] + 1
+
+
+def test_patch_list_reports_conflicts_when_expected_values_changed(app, client, seeded):
+    # Tenancy 1 is "Sign-Up" and tenancy 2 "Vacant" in the seed
+    response = client.patch("/tenancies/", json=[
+        {"id": 1, "fields": {"tenancy_status": "Tenanted"}, "expected": {"tenancy_status": "Sign-Up"}},
+        {"id": 2, "fields": {"tenancy_status": "Tenanted"}, "expected": {"tenancy_status": "Sign-Up"}},
+    ])
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["ids"] == [1]
+    assert body["conflicts"] == [1]
+    assert tenancy(app, 2).tenancy_status == "Vacant"
+
+
+def test_patch_list_checks_expected_versions(app, client, seeded):
+    version = tenancy(app, 1).version_id
+
+    stale = client.patch("/tenancies/", json=[
+        {"id": 1, "fields": {"tenancy_status": "Vacant"}, "expected": {"version_id": version - 1}},
+    ])
+    current = client.patch("/tenancies/", json=[
+        {"id": 1, "fields": {"tenancy_status": "Vacant"}, "expected": {"version_id": version}},
+    ])
+
+    assert stale.status_code == 409
+    assert stale.get_json()["conflicts"] == [0]
+    assert current.status_code == 200
+    assert tenancy(app, 1).version_id == version + 1
+
+
+def test_patch_list_reports_invalid_and_missing_items(app, client, seeded):
+    response = client.patch("/tenancies/", json=[
+        {"id": 999, "fields": {"tenancy_status": "Vacant"}},
+        {"id": 1, "fields": {"start_date": "not a date"}},
+        {"id": 2, "fields": {"property_id": 999}},
+        {"fields": {"tenancy_status": "Vacant"}},
+        {"id": 3, "fields": {}},
+        {"id": 999, "fields": {"tenancy_status": "Tenanted"}},
+    ])
+
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body["updated"] == 0
+    assert body["not_found"] == [0]
+    assert [error["index"] for error in body["errors"]] == [1, 2, 3, 4, 5]
+    assert body["errors"][4]["errors"] == {"id": ["Tenancy 999 appears more than once."]}
+
+
+def test_patch_filter_updates_every_matching_row(app, client, seeded):
+    response = client.patch("/tenancies/", json={
+        "filter": {"status": ["Sign-Up", "Vacant"]},
+        "fields": {"tenancy_status": "Tenanted"},
+    })
+
+    assert response.status_code == 200
+    assert response.get_json() == {"updated": 2, "ids": [1, 2]}
+    assert {tenancy(app, n).tenancy_status for n in (1, 2, 3)} == {"Tenanted"}
+
+
+def test_patch_filter_requires_a_filter_and_valid_fields(app, client, seeded):
+    assert client.patch("/tenancies/", json={"filter": {}, "fields": {"tenancy_status": "Vacant"}}).status_code == 400
+    assert client.patch("/tenancies/", json={"filter": {"status": ["Vacant"]}, "fields": {}}).status_code == 400
+    assert client.patch("/tenancies/", json={"fields": {"tenancy_status": "Vacant"}}).status_code == 400
+
+
+@pytest.mark.parametrize("filters", [{"stauts": ["Vacant"]}, {"status": ["Vacant"], "limit": 1}])
+def test_patch_filter_rejects_unknown_and_search_only_keys(app, client, seeded, filters):
+    response = client.patch("/tenancies/", json={"filter": filters, "fields": {"tenancy_status": "Tenanted"}})
+
+    assert response.status_code == 400
+    assert "filter" in response.get_json()["error"]
+    assert tenancy(app, 2).tenancy_status == "Vacant"
+
+
+def test_patch_empty_filter_updates_every_row_when_confirmed(app, client, seeded):
+    response = client.patch("/tenancies/", json={"filter": {}, "all": True, "fields": {"tenancy_status": "Vacant"}})
+
+    assert response.status_code == 200
+    assert response.get_json() == {"updated": 3, "ids": [1, 2, 3]}
+    assert {tenancy(app, n).tenancy_status for n in (1, 2, 3)} == {"Vacant"}
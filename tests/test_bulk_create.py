@@ -0,0 +1,89 @@
+"""Bulk create endpoints: POST /tenants/bulk, /tenancies/bulk and /properties/bulk."""
+
+# Third-party imports
+from sqlalchemy import select
+
+# Application modules
+from models.tenant import Tenant
+from models.tenancy import Tenancy
+from tests.conftest import count, scalars
+
+
+def test_bulk_create_tenants(app, client, database):
+    response = client.post("/tenants/bulk", json=[
+        {"name": "Ada Lovelace", "date_of_birth": "1980-12-10", "email": "ada@example.com"},
+        {"name": "Alan Turing", "date_of_birth": "1975-06-23"},
+    ])
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert [tenant["name"] for tenant in body["created"]] == ["Ada Lovelace", "Alan Turing"]
+    assert all(tenant["id"] for tenant in body["created"])
+    assert body["errors"] == []
+    assert count(app, Tenant) == 2
+
+
+def test_bulk_create_reports_errors_by_index_and_keeps_valid_rows(app, client, database):
+    response = client.post("/tenants/bulk", json=[
+        {"name": "Ada Lovelace", "date_of_birth": "1980-12-10"},
+        {"name": "No Birthday"},
+        {"name": "Alan Turing", "date_of_birth": "not a date"},
+        {"name": "Grace Hopper", "date_of_birth": "1976-12-09"},
+    ])
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert [tenant["name"] for tenant in body["created"]] == ["Ada Lovelace", "Grace Hopper"]
+    assert [error["index"] for error in body["errors"]] == [1, 2]
+    assert "date_of_birth" in body["errors"][0]["errors"]
+    assert "date_of_birth" in body["errors"][1]["errors"]
+    assert count(app, Tenant) == 2
+
+
+def test_bulk_create_with_only_invalid_rows_answers_400(app, client, database):
+    response = client.post("/tenants/bulk", json=[{"name": "No Birthday"}])
+
+    assert response.status_code == 400
+    assert response.get_json()["created"] == []
+    assert count(app, Tenant) == 0
+
+
+def test_bulk_create_rejects_a_body_that_is_not_a_list(app, client, database):
+    assert client.post("/tenants/bulk", json={"name": "Ada"}).status_code == 400
+    assert client.post("/tenants/bulk", json=[]).status_code == 400
+
+
+def test_bulk_create_rejects_more_than_bulk_max_items(app, client, database, monkeypatch):
+    monkeypatch.setitem(app.config, "BULK_MAX_ITEMS", 2)
+    payload = [{"name": f"Tenant {n}", "date_of_birth": "1980-01-01"} for n in range(3)]
+
+    assert client.post("/tenants/bulk", json=payload).status_code == 400
+    assert count(app, Tenant) == 0
+
+
+def test_bulk_create_tenancies_checks_property_references(app, client, seeded):
+    response = client.post("/tenancies/bulk", json=[
+        {"start_date": "2024-01-01", "tenancy_status": "Sign-Up", "property_id": 1},
+        {"start_date": "2024-01-01", "tenancy_status": "Sign-Up", "property_id": 999},
+    ])
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert len(body["created"]) == 1
+    assert body["errors"] == [
+        {"index": 1, "errors": {"property_id": ["Property 999 does not exist"]}}
+    ]
+    assert scalars(app, select(Tenancy.property_id).where(Tenancy.id == body["created"][0]["id"])) == [1]
+    assert count(app, Tenancy) == 4
+
+
+def test_bulk_create_properties(app, client, seeded):
+    response = client.post("/properties/bulk", json=[
+        {"address": "1 Test Street, Mildura, Vic, 3500", "property_manager_id": 1},
+        {"address": "2 Test Street, Mildura, Vic, 3500", "property_manager_id": 999},
+    ])
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert len(body["created"]) == 1
+    assert body["errors"][0]["index"] == 1
@@ -0,0 +1,89 @@
+"""Bulk link endpoints: POST /tenants/link_tenancies and /tenants/link_support_workers."""
+
+# Third-party imports
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+# Application modules
+from extensions import db
+from models.tenant_tenancy import TenantTenancy
+from models.tenant_support_worker import TenantSupportWorker
+from tests.conftest import count
+
+
+def test_link_tenancies(app, client, seeded):
+    # The seed links tenant n to tenancy n
+    response = client.post("/tenants/link_tenancies", json=[
+        {"tenant_id": 1, "tenancy_id": 2},
+        {"tenant_id": 2, "tenancy_id": 3},
+    ])
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body["linked"] == [{"tenant_id": 1, "tenancy_id": 2}, {"tenant_id": 2, "tenancy_id": 3}]
+    assert body["already_linked"] == []
+    assert body["errors"] == []
+    assert count(app, TenantTenancy) == 5
+
+
+def test_link_tenancies_skips_existing_and_repeated_pairs(app, client, seeded):
+    response = client.post("/tenants/link_tenancies", json=[
+        {"tenant_id": 1, "tenancy_id": 1},
+        {"tenant_id": 1, "tenancy_id": 2},
+        {"tenant_id": 1, "tenancy_id": 2},
+    ])
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body["linked"] == [{"tenant_id": 1, "tenancy_id": 2}]
+    assert body["already_linked"] == [0, 2]
+    assert count(app, TenantTenancy) == 4
+
+
+def test_link_tenancies_reports_unknown_ids_and_bad_items(app, client, seeded):
+    response = client.post("/tenants/link_tenancies", json=[
+        {"tenant_id": 999, "tenancy_id": 1},
+        {"tenant_id": "1", "tenancy_id": 2},
+        {"tenant_id": 2, "tenancy_id": 1},
+    ])
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body["linked"] == [{"tenant_id": 2, "tenancy_id": 1}]
+    assert body["errors"] == [
+        {"index": 0, "errors": {"tenant_id": ["Tenant 999 does not exist"]}},
+        {"index": 1, "errors": {"tenant_id": ["Must be an integer id."]}},
+    ]
+
+
+def test_link_with_nothing_new_answers_200(app, client, seeded):
+    response = client.post("/tenants/link_tenancies", json=[{"tenant_id": 1, "tenancy_id": 1}])
+
+    assert response.status_code == 200
+    assert response.get_json()["already_linked"] == [0]
+    assert count(app, TenantTenancy) == 3
+
+
+def test_link_support_workers(app, client, seeded):
+    response = client.post("/tenants/link_support_workers", json=[
+        {"tenant_id": 1, "support_worker_id": 2},
+        {"tenant_id": 1, "support_worker_id": 1},
+        {"tenant_id": 1, "support_worker_id": 999},
+    ])
+
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body["linked"] == [{"tenant_id": 1, "support_worker_id": 2}]
+    assert body["already_linked"] == [1]
+    assert [error["index"] for error in body["errors"]] == [2]
+    assert count(app, TenantSupportWorker) == 4
+
+
+def test_link_rejects_a_body_that_is_not_a_list(app, client, seeded):
+    assert client.post("/tenants/link_tenancies", json={"tenant_id": 1}).status_code == 400
+
+
+def test_junction_tables_reject_duplicate_pairs(app, seeded):
+    with app.app_context(), pytest.raises(IntegrityError):
+        db.session.execute(insert(TenantTenancy).values(tenant_id=1, tenancy_id=1, rank=9))
@@ -0,0 +1,113 @@
+"""Response compression: Accept-Encoding negotiation, Vary and the cached encodings."""
+
+# Standard library imports
+import gzip
+import json
+
+# Third-party imports
+import pytest
+
+# Application modules
+from utils.compression import Compression, brotli, zstandard
+
+
+@pytest.fixture()
+def negotiator():
+    """A Compression offering every encoding, to test negotiation alone."""
+    compression = Compression()
+    compression.encodings = ["zstd", "br", "gzip"]
+    return compression
+
+
+@pytest.mark.parametrize(("accept", "expected"), [
+    ("gzip", "gzip"),
+    ("br", "br"),
+    ("zstd", "zstd"),
+    ("gzip, br, zstd", "zstd"),
+    ("gzip, br", "br"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("*", "zstd"),
+    ("identity", None),
+    ("gzip;q=0", None),
+    ("deflate", None),
+    ("", None),
+])
+def test_negotiate_picks_the_best_accepted_encoding(negotiator, accept, expected):
+    assert negotiator.negotiate(accept) == expected
+
+
+def test_negotiate_skips_encodings_without_their_package(app):
+    compression = app.extensions["compression"]
+
+    assert ("br" in compression.encodings) == (brotli is not None)
+    assert ("zstd" in compression.encodings) == (zstandard is not None)
+    assert compression.negotiate("br, zstd, gzip") == compression.encodings[0]
+
+
+def test_gzip_response_decompresses_to_the_plain_body(client, scaled):
+    plain = client.get("/tenants/")
+    compressed = client.get("/tenants/", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in plain.headers
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(compressed.data) == plain.data
+    for response in (plain, compressed):
+        assert "Accept-Encoding" in response.headers["Vary"]
+
+
+@pytest.mark.parametrize(("encoding", "package"), [("br", "brotli"), ("zstd", "zstandard")])
+def test_optional_encodings_round_trip(app, encoding, package):
+    module = pytest.importorskip(package)
+    compression = app.extensions["compression"]
+    body = json.dumps({"data": list(range(1000))}).encode()
+
+    compressed = compression.compress(body, encoding)
+
+    if encoding == "br":
+        assert module.decompress(compressed) == body
+    else:
+        assert module.ZstdDecompressor().decompressobj().decompress(compressed) == body
+
+
+def test_small_and_identity_responses_stay_uncompressed(client, seeded):
+    small = client.get("/tenants/1/", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/tenants/", headers={"Accept-Encoding": "identity"})
+
+    assert "Content-Encoding" not in small.headers
+    assert "Content-Encoding" not in identity.headers
+    assert "Accept-Encoding" in small.headers["Vary"]
+
+
+def test_cached_compressed_body_is_only_served_to_clients_accepting_it(client, scaled):
+    first = client.get("/tenants/", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["X-Cache"] == "MISS"
+    assert first.headers["Content-Encoding"] == "gzip"
+
+    for accept in (None, "identity", "gzip;q=0", "deflate"):
+        headers = {"Accept-Encoding": accept} if accept else {}
+        response = client.get("/tenants/", headers=headers)
+        assert "Content-Encoding" not in response.headers
+        assert response.get_json()["data"][0]["id"] == 1
+
+    again = client.get("/tenants/", headers={"Accept-Encoding": "gzip"})
+    assert again.headers["X-Cache"] == "HIT"
+    assert again.headers["Content-Encoding"] == "gzip"
+    assert again.data == first.data
+
+
+def test_etag_differs_per_encoding(client, scaled):
+    plain = client.get("/tenants/").headers["ETag"]
+    compressed = client.get("/tenants/", headers={"Accept-Encoding": "gzip"}).headers["ETag"]
+
+    assert plain != compressed
+    assert client.get("/tenants/", headers={"If-None-Match": compressed}).status_code == 200
+
+
+def test_stream_is_compressed_incrementally(client, scaled):
+    headers = {"Accept": "application/x-ndjson"}
+    plain = client.get("/tenants/", headers=headers)
+    compressed = client.get("/tenants/", headers={**headers, "Accept-Encoding": "gzip"})
+
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in compressed.headers
+    assert gzip.decompress(compressed.data) == plain.data
@@ -0,0 +1,122 @@
+"""ETags and If-None-Match, driven by the table versions kept in the database."""
+
+# Standard library imports
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+# Third-party imports
+from sqlalchemy import select, text
+
+# Application modules
+from extensions import db
+from models.table_version import TableVersion
+from models.tenant import Tenant
+from tests.conftest import scalars
+
+
+def outside_write(app, sql):
+    """Write with a plain connection, as another worker or service would."""
+    with app.app_context(), db.engine.begin() as conn:
+        conn.execute(text(sql))
+
+
+def run_worker(*lines):
+    """Run ``lines`` in a new process with its own app on the same database; return its output lines."""
+    script = "\n".join(["from main import create_app", *lines])
+    env = {**os.environ, "PYTHONPATH": str(Path(__file__).resolve().parent.parent)}
+    result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.split()
+
+
+def queries(response):
+    return response.headers["Server-Timing"].split('desc="')[1].split(" ")[0]
+
+
+def test_matching_etag_answers_304_without_running_the_view(client, seeded):
+    first = client.get("/tenants/")
+    etag = first.headers["ETag"]
+
+    again = client.get("/tenants/", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert again.data == b""
+    # Only the table version read
+    assert queries(again) == "1"
+
+
+def test_etag_depends_on_the_query_arguments(client, seeded):
+    assert client.get("/tenants/").headers["ETag"] != client.get("/tenants/?limit=1").headers["ETag"]
+
+
+def test_etag_changes_with_a_write_through_the_api(client, seeded):
+    etag = client.get("/tenants/").headers["ETag"]
+
+    client.put("/tenants/1/", json={"phone": "0400000000"})
+
+    response = client.get("/tenants/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_etag_changes_when_an_outside_writer_bumps_the_version(app, client, seeded):
+    etag = client.get("/tenancies/").headers["ETag"]
+
+    outside_write(app, "UPDATE tenancy SET tenancy_status = 'Vacant' WHERE id = 1")
+    outside_write(app, "UPDATE table_version SET version = version + 1 WHERE name = 'tenancy'")
+
+    response = client.get("/tenancies/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_etag_changes_with_rows_removed_by_cascades(client, seeded):
+    etag = client.get("/tenancies/").headers["ETag"]
+
+    # Property 1's tenancy is removed by ON DELETE CASCADE, not by the session
+    assert client.delete("/properties/1/").status_code == 200
+
+    assert client.get("/tenancies/", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_versions_are_bumped_after_the_writing_transaction_commits(app, seeded):
+    def version():
+        return scalars(app, select(TableVersion.version).where(TableVersion.name == "tenant"))[0]
+
+    before = version()
+    with app.app_context():
+        db.session.get(Tenant, 1).phone = "0400000000"
+        db.session.flush()
+        # The writing transaction never touches the shared counter row
+        assert db.session.scalar(select(TableVersion.version).where(TableVersion.name == "tenant")) == before
+        db.session.commit()
+
+    assert version() == before + 1
+    with app.app_context():
+        assert not db.session.scalars(text("SELECT name FROM sqlite_master WHERE type = 'trigger'")).all()
+
+
+def test_etag_ignores_writes_to_other_tables(app, client, seeded):
+    etag = client.get("/tenants/").headers["ETag"]
+
+    outside_write(app, "UPDATE property SET address = 'Elsewhere' WHERE id = 1")
+
+    assert client.get("/tenants/", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_etags_are_shared_by_worker_processes(client, seeded):
+    etag = client.get("/tenants/").headers["ETag"]
+
+    # Another worker process revalidates our ETag, then changes a tenant
+    other_worker = run_worker(
+        "client = create_app().test_client()",
+        f"print(client.get('/tenants/', headers={{'If-None-Match': {etag!r}}}).status_code)",
+        "print(client.put('/tenants/1/', json={'phone': '0400000000'}).status_code)",
+    )
+
+    assert other_worker == ["304", "200"]
+    assert client.get("/tenants/", headers={"If-None-Match": etag}).status_code == 200
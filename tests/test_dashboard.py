@@ -0,0 +1,89 @@
+"""Portfolio dashboard aggregates, their response cache and ETags."""
+
+# Third-party imports
+from sqlalchemy import delete, select
+
+# Application modules
+from extensions import cache, db
+from models.table_version import TableVersion
+from utils.dashboard import DASHBOARD_VERSION, refresh_views
+from tests.conftest import scalars
+
+# The figures of the "flask db seed" rows: one property per manager, one tenant
+# per support worker, and only tenancy 3 (property 1) current and Tenanted
+SEED_TOTALS = {
+    "property_managers": 3, "properties": 3, "tenancies": 3, "tenants": 3, "support_workers": 3,
+    "occupied_properties": 1, "vacant_properties": 2,
+}
+
+
+def dashboard(client):
+    response = client.get("/dashboard/")
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_figures_match_the_seed(client, seeded):
+    data = dashboard(client)
+
+    assert data["source"] == "live"
+    assert data["totals"] == SEED_TOTALS
+    assert [row["properties"] for row in data["properties_per_manager"]] == [1, 1, 1]
+    assert data["tenancies_by_status"] == {"Sign-Up": 1, "Tenanted": 1, "Vacant": 1}
+    assert [row["tenants"] for row in data["tenants_per_support_worker"]] == [1, 1, 1]
+
+
+def test_refresh_leaves_live_figures_unchanged(app, client, seeded):
+    before = dashboard(client)
+
+    # Materialized views are PostgreSQL only: the live dashboard has nothing to refresh
+    with app.app_context():
+        assert refresh_views() is False
+    assert client.post("/dashboard/refresh").status_code == 400
+
+    assert dashboard(client)["totals"] == before["totals"] == SEED_TOTALS
+
+
+def test_figures_follow_writes(client, seeded):
+    dashboard(client)
+
+    assert client.delete("/tenancies/3/").status_code == 200
+
+    data = dashboard(client)
+    assert data["totals"]["tenancies"] == 2
+    assert data["totals"]["occupied_properties"] == 0
+    assert data["totals"]["vacant_properties"] == 3
+    assert data["tenancies_by_status"] == {"Sign-Up": 1, "Vacant": 1}
+
+
+def test_consecutive_gets_are_cached_and_revalidated(client, seeded):
+    first = client.get("/dashboard/")
+    second = client.get("/dashboard/")
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert client.get("/dashboard/", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+
+def test_refresh_version_invalidates_the_dashboard(app, client, seeded):
+    etag = client.get("/dashboard/").headers["ETag"]
+
+    # What refresh_views does once the materialized views are refreshed
+    with app.app_context():
+        cache.invalidate([DASHBOARD_VERSION])
+
+    response = client.get("/dashboard/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["X-Cache"] == "MISS"
+
+
+def test_migrate_adds_the_dashboard_version(app, seeded):
+    with app.app_context():
+        db.session.execute(delete(TableVersion).where(TableVersion.name == DASHBOARD_VERSION))
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["db", "migrate"])
+
+    assert result.exit_code == 0, result.output
+    assert scalars(app, select(TableVersion.name).where(TableVersion.name == DASHBOARD_VERSION))
@@ -0,0 +1,82 @@
+"""Set-based deletes through ON DELETE CASCADE, and the bulk purge jobs."""
+
+# Third-party imports
+import pytest
+from sqlalchemy import select
+
+# Application modules
+from models.property import Property
+from models.property_manager import PropertyManager
+from models.property_occupancy import PropertyOccupancy
+from models.tenancy import Tenancy
+from models.tenant import Tenant
+from models.tenant_support_worker import TenantSupportWorker
+from models.tenant_tenancy import TenantTenancy
+from tests.conftest import count, scalars, wait_for_job
+
+
+def test_delete_property_manager_cascades_in_the_database(app, client, seeded):
+    property_ids = scalars(app, select(Property.id).where(Property.property_manager_id == 1))
+    assert property_ids
+
+    response = client.delete("/property_managers/1/")
+
+    assert response.status_code == 200
+    assert response.get_json()["id"] == 1
+    assert count(app, PropertyManager, PropertyManager.id == 1) == 0
+    assert count(app, Property, Property.id.in_(property_ids)) == 0
+    assert count(app, Tenancy, Tenancy.property_id.in_(property_ids)) == 0
+    assert count(app, PropertyOccupancy, PropertyOccupancy.property_id.in_(property_ids)) == 0
+
+
+def test_delete_tenant_removes_its_links(app, client, seeded):
+    response = client.delete("/tenants/1/")
+
+    assert response.status_code == 200
+    assert count(app, TenantTenancy, TenantTenancy.tenant_id == 1) == 0
+    assert count(app, TenantSupportWorker, TenantSupportWorker.tenant_id == 1) == 0
+    assert count(app, Tenant) == 2
+
+
+def test_delete_unknown_row_answers_404(app, client, seeded):
+    assert client.delete("/properties/999/").status_code == 404
+
+
+@pytest.mark.parametrize("path, deleted", [
+    ("/property_managers/purge", {
+        "property_manager": 1, "property": 1, "property_occupancy": 1, "tenancy": 1, "tenant_tenancy": 1
+    }),
+    ("/properties/purge", {"property": 1, "property_occupancy": 1, "tenancy": 1, "tenant_tenancy": 1}),
+    ("/tenancies/purge", {"tenancy": 1, "tenant_tenancy": 1}),
+    ("/tenants/purge", {"tenant": 1, "tenant_support_worker": 1, "tenant_tenancy": 1}),
+    ("/support_workers/purge", {"support_worker": 1, "tenant_support_worker": 1}),
+])
+def test_purge_job_reports_rows_deleted_per_table(app, client, seeded, path, deleted):
+    job = wait_for_job(client, client.post(path, json={"ids": [1, 999, 1]}))
+
+    assert job["status"] == "succeeded", job["error"]
+    assert job["result"] == {"requested": 2, "not_found": [999], "deleted": deleted}
+
+
+def test_purge_is_applied_in_the_database(app, client, seeded):
+    wait_for_job(client, client.post("/tenants/purge", json={"ids": [1, 2]}))
+
+    assert scalars(app, select(Tenant.id)) == [3]
+    assert count(app, TenantTenancy, TenantTenancy.tenant_id.in_([1, 2])) == 0
+
+
+def test_purge_refreshes_occupancy(app, client, seeded):
+    assert count(app, PropertyOccupancy, PropertyOccupancy.tenancy_id == 3) == 1
+
+    wait_for_job(client, client.post("/tenancies/purge", json={"ids": [3]}))
+
+    assert count(app, PropertyOccupancy, PropertyOccupancy.tenancy_id == 3) == 0
+
+
+@pytest.mark.parametrize("body", [{}, {"ids": []}, {"ids": ["1"]}, {"ids": [True]}, [1, 2]])
+def test_purge_rejects_invalid_ids(app, client, seeded, body):
+    assert client.post("/tenants/purge", json=body).status_code == 400
+
+
+def test_unknown_job_answers_404(client, database):
+    assert client.get("/jobs/unknown").status_code == 404
@@ -0,0 +1,65 @@
+"""Sparse fieldsets: ?fields= restricts both the JSON and the selected columns."""
+
+# Third-party imports
+import pytest
+from sqlalchemy import event
+
+# Application modules
+from extensions import db
+
+
+@pytest.fixture()
+def statements(app):
+    """Record the SQL of every statement run on the primary."""
+    with app.app_context():
+        engine = db.engine
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def tenant_selects(executed):
+    return [statement for statement in executed if "FROM tenant" in statement]
+
+
+@pytest.mark.parametrize("url", ["/tenants/?fields=id,name", "/tenants/?fields=name,id,name", "/tenants/1/?fields=id,name"])
+def test_fields_restrict_the_json_and_the_columns(client, seeded, statements, url):
+    response = client.get(url)
+
+    assert response.status_code == 200
+    body = response.get_json()
+    for tenant in body.get("data", [body]):
+        assert set(tenant) == {"id", "name"}
+    [select] = tenant_selects(statements)
+    assert "tenant.name" in select
+    for column in ("date_of_birth", "phone", "email", "version_id"):
+        assert f"tenant.{column}" not in select
+
+
+def test_nested_fields_restrict_the_nested_columns(client, seeded, statements):
+    response = client.get("/tenants/tenancies?fields=id,tenancies.id")
+
+    assert response.status_code == 200
+    assert response.get_json()["data"][0] == {"id": 1, "tenancies": [{"id": 1}]}
+    assert not [statement for statement in statements if "tenant.name" in statement]
+    assert not [statement for statement in statements if "tenancy.start_date" in statement]
+
+
+def test_without_fields_every_column_is_selected(client, seeded, statements):
+    tenant = client.get("/tenants/1/").get_json()
+
+    assert {"date_of_birth", "email", "version_id"} <= set(tenant)
+    assert "tenant.email" in tenant_selects(statements)[0]
+
+
+@pytest.mark.parametrize("url", [
+    "/tenants/?fields=id,nope", "/tenants/1/?fields=nope", "/tenants/tenancies?fields=tenancies.nope",
+    "/tenants/?fields=name.id", "/tenants/?fields=,",
+])
+def test_unknown_field_is_rejected(client, seeded, url):
+    assert client.get(url).status_code == 400
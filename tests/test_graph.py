@@ -0,0 +1,64 @@
+"""Property graphs: ?include= output shape, validation and query bound."""
+
+# Third-party imports
+import pytest
+from flask import g, request_finished
+
+# Application modules
+from models.property import Property
+from utils.graph import plan_include
+
+INCLUDE = "manager,tenancies.tenants.support_workers"
+
+
+@pytest.fixture()
+def spent(app):
+    """Record the number of queries each request ran from the start of its view."""
+    counts = []
+
+    def record(sender, response, **extra):
+        counts.append(g._queries.count - g._queries.budget_start)
+
+    with request_finished.connected_to(record, app):
+        yield counts
+
+
+def test_include_nests_the_named_relationships(client, seeded):
+    response = client.get(f"/properties/1/graph?include={INCLUDE}")
+
+    assert response.status_code == 200
+    graph = response.get_json()
+    assert graph["manager"]["name"] == "Janice Justice"
+    assert "properties" not in graph["manager"]
+    [tenancy] = graph["tenancies"]
+    assert tenancy["id"] == 3
+    [tenant] = tenancy["tenants"]
+    assert tenant["id"] == 3
+    assert [worker["id"] for worker in tenant["support_workers"]] == [3]
+    assert "tenancies" not in tenant
+
+
+def test_without_include_only_the_columns_are_returned(client, seeded):
+    graph = client.get("/properties/1/graph").get_json()
+
+    assert set(graph) == {"id", "address", "version_id"}
+
+
+@pytest.mark.parametrize("include", ["owner", "tenancies.tenants.nope", "manager..properties", "a.b.c.d.e"])
+def test_invalid_include_is_rejected(client, seeded, include):
+    assert client.get(f"/properties/graph?include={include}").status_code == 400
+    assert client.get(f"/properties/1/graph?include={include}").status_code == 400
+
+
+def test_list_stays_within_the_query_bound(client, scaled, spent):
+    plan = plan_include(Property, INCLUDE)
+
+    response = client.get(f"/properties/graph?include={INCLUDE}&limit=500")
+
+    assert response.status_code == 200
+    properties = response.get_json()["data"]
+    assert len(properties) == 20
+    assert any(tenancy["tenants"] for prop in properties for tenancy in prop["tenancies"])
+    # Root query plus one per collection, however many properties are returned
+    assert plan.query_bound == 4
+    assert spent[0] <= plan.query_bound
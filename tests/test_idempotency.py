@@ -0,0 +1,109 @@
+"""Idempotency-Key handling of POST requests."""
+
+# Standard library imports
+from datetime import datetime, timedelta, timezone
+
+# Third-party imports
+from sqlalchemy import insert
+
+# Application modules
+from extensions import db, idempotency
+from models.idempotency_key import IdempotencyKey
+from models.tenant import Tenant
+from models.tenant_tenancy import TenantTenancy
+from tests.conftest import count
+from utils.idempotency import Idempotency
+
+TENANT = {
+    "name": "Ada Lovelace", "date_of_birth": "1980-12-10", "phone": "0400000001", "email": "ada@example.com"
+}
+
+
+def claim(app, key, age, fingerprint="0" * 64):
+    """Insert an unfinished claim on ``key`` started ``age`` seconds ago."""
+    started = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=age)
+    with app.app_context():
+        db.session.execute(insert(IdempotencyKey).values(
+            key=key, fingerprint=fingerprint, created_at=started, claimed_at=started
+        ))
+        db.session.commit()
+
+
+def fingerprint_of(app, path, body):
+    with app.test_request_context(path, method="POST", json=body):
+        return Idempotency.fingerprint()
+
+
+def test_retry_replays_the_stored_response(app, client, database):
+    headers = {"Idempotency-Key": "create-ada"}
+    first = client.post("/tenants/", json=TENANT, headers=headers)
+    retry = client.post("/tenants/", json=TENANT, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.get_json() == first.get_json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert count(app, Tenant) == 1
+
+
+def test_retried_link_does_not_fail_as_already_linked(app, client, seeded):
+    headers = {"Idempotency-Key": "link-1-2"}
+    first = client.post("/tenants/1/link_tenancy/2/", headers=headers)
+    retry = client.post("/tenants/1/link_tenancy/2/", headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert count(app, TenantTenancy, TenantTenancy.tenant_id == 1) == 2
+
+
+def test_same_key_with_a_different_request_answers_422(app, client, database):
+    headers = {"Idempotency-Key": "create-ada"}
+    client.post("/tenants/", json=TENANT, headers=headers)
+
+    response = client.post("/tenants/", json={**TENANT, "name": "Grace Hopper"}, headers=headers)
+
+    assert response.status_code == 422
+    assert count(app, Tenant) == 1
+
+
+def test_requests_without_the_header_are_not_deduplicated(app, client, database):
+    client.post("/tenants/", json=TENANT)
+    client.post("/tenants/", json=TENANT)
+
+    assert count(app, Tenant) == 2
+
+
+def test_key_length_is_checked(client, database):
+    response = client.post("/tenants/", json=TENANT, headers={"Idempotency-Key": "k" * 256})
+
+    assert response.status_code == 400
+
+
+def test_retry_during_a_running_request_answers_409(app, client, database):
+    claim(app, "running", age=1, fingerprint=fingerprint_of(app, "/tenants/", TENANT))
+
+    response = client.post("/tenants/", json=TENANT, headers={"Idempotency-Key": "running"})
+
+    assert response.status_code == 409
+    assert count(app, Tenant) == 0
+
+
+def test_retry_takes_over_a_claim_older_than_the_claim_timeout(app, client, database, monkeypatch):
+    monkeypatch.setattr(idempotency, "claim_timeout", 30)
+    claim(app, "crashed", age=31, fingerprint=fingerprint_of(app, "/tenants/", TENANT))
+    headers = {"Idempotency-Key": "crashed"}
+
+    response = client.post("/tenants/", json=TENANT, headers=headers)
+    retry = client.post("/tenants/", json=TENANT, headers=headers)
+
+    assert response.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert count(app, Tenant) == 1
+
+
+def test_stale_claim_of_a_different_request_is_not_taken_over(app, client, database):
+    claim(app, "crashed", age=3600)
+
+    response = client.post("/tenants/", json=TENANT, headers={"Idempotency-Key": "crashed"})
+
+    assert response.status_code == 422
+    assert count(app, Tenant) == 0
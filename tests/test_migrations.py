@@ -0,0 +1,71 @@
+"""``flask db migrate``: bringing an existing database up to the models."""
+
+# Third-party imports
+import pytest
+from sqlalchemy import insert, inspect, text
+
+# Application modules
+from extensions import db
+from models.tenant_tenancy import TenantTenancy
+from tests.conftest import count
+
+UNIQUE_LINK_INDEX = "ix_tenant_tenancy_tenant_id_tenancy_id"
+
+
+def migrate(app, *options):
+    result = app.test_cli_runner().invoke(args=["db", "migrate", *options])
+    assert result.exit_code == 0, result.output
+    return result.output
+
+
+def indexes(app, table):
+    with app.app_context():
+        return {index["name"] for index in inspect(db.engine).get_indexes(table)}
+
+
+def execute(app, statement, parameters=None):
+    with app.app_context(), db.engine.begin() as conn:
+        conn.execute(statement, parameters or {})
+
+
+def test_migrate_on_an_up_to_date_database_changes_nothing(app, seeded):
+    assert "Database migrated" in migrate(app)
+    assert "Database migrated" in migrate(app)
+
+
+@pytest.mark.parametrize("table, index", [
+    ("tenant_tenancy", UNIQUE_LINK_INDEX),
+    ("tenant_support_worker", "ix_tenant_support_worker_tenant_id_support_worker_id"),
+    ("tenancy", "ix_tenancy_status_start_date"),
+])
+def test_migrate_builds_missing_indexes(app, seeded, table, index):
+    execute(app, text(f"DROP INDEX {index}"))
+    assert index not in indexes(app, table)
+
+    output = migrate(app)
+
+    assert "Database migrated" in output
+    assert index in indexes(app, table)
+
+
+def test_duplicate_links_are_reported_and_removed_with_dedupe(app, seeded):
+    execute(app, text(f"DROP INDEX {UNIQUE_LINK_INDEX}"))
+    execute(app, insert(TenantTenancy).values(tenant_id=1, tenancy_id=1, rank=9))
+
+    assert "Migration incomplete, failed: " + UNIQUE_LINK_INDEX in migrate(app)
+    assert count(app, TenantTenancy) == 4
+
+    assert "Database migrated" in migrate(app, "--dedupe")
+    assert count(app, TenantTenancy) == 3
+    assert UNIQUE_LINK_INDEX in indexes(app, "tenant_tenancy")
+
+
+def test_migrate_adds_missing_columns(app, seeded):
+    execute(app, text("ALTER TABLE idempotency_key DROP COLUMN claimed_at"))
+
+    output = migrate(app)
+
+    assert "Added column idempotency_key.claimed_at" in output
+    with app.app_context():
+        columns = {column["name"] for column in inspect(db.engine).get_columns("idempotency_key")}
+    assert "claimed_at" in columns
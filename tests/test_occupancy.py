@@ -0,0 +1,146 @@
+"""The property occupancy read model and its endpoints."""
+
+# Standard library imports
+from datetime import date
+
+# Third-party imports
+from sqlalchemy import select
+
+# Application modules
+from extensions import db
+from models.property_occupancy import PropertyOccupancy
+from tests.conftest import wait_for_job
+from utils.occupancy import rebuild_occupancy
+
+# In the seed, property 1 is occupied by tenancy 3 (tenant 3); tenancy 2 at
+# property 2 has ended and tenancy 1 at property 3 is still signing up
+OCCUPIED = {
+    "property_id": 1, "occupied": True, "tenancy_id": 3, "start_date": "2019-05-01", "end_date": None,
+    "tenants": [{"id": 3, "name": "Paula Deakin"}],
+}
+
+
+def occupancy(client, property_id):
+    response = client.get(f"/properties/{property_id}/occupancy")
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def snapshot(app):
+    with app.app_context():
+        return [
+            (row.property_id, row.tenancy_id, row.start_date, row.end_date, row.tenants)
+            for row in db.session.scalars(select(PropertyOccupancy).order_by(PropertyOccupancy.property_id))
+        ]
+
+
+def test_property_occupancy(client, seeded):
+    assert occupancy(client, 1) == OCCUPIED
+    assert occupancy(client, 2) == {
+        "property_id": 2, "occupied": False, "tenancy_id": None, "start_date": None, "end_date": None,
+        "tenants": [],
+    }
+    assert client.get("/properties/999/occupancy").status_code == 404
+
+
+def test_occupancy_list_filters_and_pages(client, seeded):
+    occupied = client.get("/properties/occupancy?occupied=true").get_json()
+    vacant = client.get("/properties/occupancy?occupied=false&limit=1").get_json()
+
+    assert occupied == {"data": [OCCUPIED], "next_cursor": None}
+    assert [row["property_id"] for row in vacant["data"]] == [2]
+    following = client.get(f"/properties/occupancy?occupied=false&limit=1&after={vacant['next_cursor']}")
+    assert [row["property_id"] for row in following.get_json()["data"]] == [3]
+
+
+def test_linking_a_tenant_updates_the_tenant_list(client, seeded):
+    assert occupancy(client, 1) == OCCUPIED
+
+    assert client.post("/tenants/1/link_tenancy/3/").status_code == 201
+
+    assert sorted(tenant["name"] for tenant in occupancy(client, 1)["tenants"]) == [
+        "James Arquette", "Paula Deakin"
+    ]
+
+
+def test_bulk_link_updates_the_tenant_list(client, seeded):
+    client.post("/tenants/link_tenancies", json=[{"tenant_id": 2, "tenancy_id": 3}])
+
+    assert sorted(tenant["id"] for tenant in occupancy(client, 1)["tenants"]) == [2, 3]
+
+
+def test_renaming_a_tenant_updates_the_tenant_list(client, seeded):
+    client.put("/tenants/3/", json={"name": "Paula Smith"})
+
+    assert occupancy(client, 1)["tenants"] == [{"id": 3, "name": "Paula Smith"}]
+
+
+def test_tenancy_changes_update_occupancy(client, seeded):
+    client.put("/tenancies/3/", json={"tenancy_status": "Vacant"})
+    assert occupancy(client, 1)["occupied"] is False
+
+    client.patch("/tenancies/", json=[{"id": 3, "fields": {"tenancy_status": "Tenanted"}}])
+    assert occupancy(client, 1) == OCCUPIED
+
+    client.put("/tenancies/3/", json={"property_id": 2})
+    assert occupancy(client, 1)["occupied"] is False
+    assert occupancy(client, 2)["tenancy_id"] == 3
+
+
+def test_new_current_tenancy_occupies_the_property(client, seeded):
+    response = client.post("/tenancies/", json={
+        "start_date": date.today().isoformat(), "tenancy_status": "Tenanted", "property_id": 2
+    })
+
+    assert response.status_code == 201
+    assert occupancy(client, 2)["tenancy_id"] == response.get_json()["id"]
+
+
+def test_deleting_the_tenancy_or_its_tenants_updates_occupancy(client, seeded):
+    client.delete("/tenants/3/")
+    assert occupancy(client, 1)["tenants"] == []
+
+    client.delete("/tenancies/3/")
+    assert occupancy(client, 1)["occupied"] is False
+
+
+def test_purging_tenancies_updates_occupancy(client, seeded):
+    job = wait_for_job(client, client.post("/tenancies/purge", json={"ids": [3]}))
+
+    assert job["status"] == "succeeded", job["error"]
+    assert occupancy(client, 1)["occupied"] is False
+
+
+def test_purging_a_property_removes_its_occupancy(client, seeded):
+    job = wait_for_job(client, client.post("/properties/purge", json={"ids": [1]}))
+
+    assert job["status"] == "succeeded", job["error"]
+    assert job["result"]["deleted"]["property_occupancy"] == 1
+    assert client.get("/properties/1/occupancy").status_code == 404
+
+
+def test_incremental_refreshes_match_a_rebuild(app, client, scaled):
+    client.patch("/tenancies/", json={"filter": {"status": ["Vacant"]}, "fields": {"tenancy_status": "Tenanted"}})
+    client.post("/tenants/link_tenancies", json=[{"tenant_id": n, "tenancy_id": n + 1} for n in range(1, 20)])
+    client.put("/tenants/5/", json={"name": "Renamed Tenant"})
+    client.delete("/tenancies/2/")
+    wait_for_job(client, client.post("/tenants/purge", json={"ids": [6, 7, 8]}))
+    incremental = snapshot(app)
+
+    with app.app_context():
+        rebuild_occupancy()
+
+    assert incremental
+    assert snapshot(app) == incremental
+
+
+def test_migrate_creates_and_fills_a_missing_occupancy_table(app, client, seeded):
+    before = snapshot(app)
+    with app.app_context():
+        PropertyOccupancy.__table__.drop(db.engine)
+
+    result = app.test_cli_runner().invoke(args=["db", "migrate"])
+
+    assert "Database migrated" in result.output, result.output
+    assert snapshot(app) == before
+    assert occupancy(client, 1) == OCCUPIED
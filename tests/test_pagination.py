@@ -0,0 +1,39 @@
+"""Keyset pagination and its query parameters."""
+
+# Third-party imports
+import pytest
+
+
+@pytest.mark.parametrize("url", ["/tenants/", "/tenants/search?q=e", "/properties/occupancy", "/tenancies/properties"])
+@pytest.mark.parametrize("limit", ["abc", "0", "-1", "1.5", "", " 2", "+2", "1_0", "²", "١", "１"])
+def test_invalid_limit_is_rejected(client, seeded, url, limit):
+    separator = "&" if "?" in url else "?"
+
+    response = client.get(f"{url}{separator}limit={limit}")
+
+    assert response.status_code == 400
+    assert response.get_json()["description"] == "limit must be a positive integer"
+
+
+@pytest.mark.parametrize("after", ["abc", "-1", "1_0", "²", "١", "１"])
+def test_invalid_after_is_rejected(client, seeded, after):
+    response = client.get(f"/tenants/?after={after}")
+
+    assert response.status_code == 400
+    assert response.get_json()["description"] == "after must be a valid cursor"
+
+
+def test_pages_follow_the_cursor(client, scaled):
+    first = client.get("/tenants/?limit=15").get_json()
+    second = client.get(f"/tenants/?limit=15&after={first['next_cursor']}").get_json()
+
+    assert [tenant["id"] for tenant in first["data"]] == list(range(1, 16))
+    assert [tenant["id"] for tenant in second["data"]] == list(range(16, 31))
+
+
+def test_limit_defaults_and_is_capped(app, client, scaled, monkeypatch):
+    monkeypatch.setitem(app.config, "PAGINATION_DEFAULT_LIMIT", 4)
+    monkeypatch.setitem(app.config, "PAGINATION_MAX_LIMIT", 10)
+
+    assert len(client.get("/tenants/").get_json()["data"]) == 4
+    assert len(client.get("/tenants/?limit=1000").get_json()["data"]) == 10
@@ -0,0 +1,84 @@
+"""Connection pool figures: InstrumentedQueuePool, pool_stats and GET /metrics/pool."""
+
+# Third-party imports
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+# Application modules
+from utils.pool import InstrumentedQueuePool, pool_stats
+
+QUEUE_POOL_KEYS = {"pool", "status", "size", "checked_in", "checked_out", "overflow", "max_overflow", "timeout"}
+INSTRUMENTED_KEYS = QUEUE_POOL_KEYS | {"checkouts", "timeouts", "avg_wait_ms", "max_wait_ms"}
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    """An engine with a one-connection InstrumentedQueuePool that times out quickly."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_pool_stats_of_an_unused_pool(engine):
+    stats = pool_stats(engine)
+
+    assert set(stats) == INSTRUMENTED_KEYS
+    assert stats["pool"] == "InstrumentedQueuePool"
+    assert stats["size"] == 1
+    assert stats["checkouts"] == stats["timeouts"] == 0
+    assert stats["avg_wait_ms"] is None
+
+
+def test_pool_stats_count_checkouts_and_timeouts(engine):
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        busy = pool_stats(engine)
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+    stats = pool_stats(engine)
+    assert busy["checked_out"] == 1
+    assert stats["checked_out"] == 0
+    assert stats["checked_in"] == 1
+    assert stats["checkouts"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["avg_wait_ms"] >= 0
+    assert stats["max_wait_ms"] >= stats["avg_wait_ms"]
+
+
+def test_counters_survive_dispose(engine):
+    with engine.connect():
+        pass
+
+    engine.dispose()
+
+    assert pool_stats(engine)["checkouts"] == 1
+
+
+def test_metrics_pool_reports_the_primary(client, seeded):
+    response = client.get("/metrics/pool")
+
+    assert response.status_code == 200
+    stats = response.get_json()
+    # SQLite keeps the default QueuePool, without the checkout wait figures
+    assert set(stats) == QUEUE_POOL_KEYS | {"replicas"}
+    assert stats["pool"] == "QueuePool"
+    assert stats["replicas"] == []
+
+
+def test_metrics_pool_reports_each_replica(client, replicated):
+    client.get("/tenants/1/")
+
+    replicas = client.get("/metrics/pool").get_json()["replicas"]
+
+    assert [replica["name"] for replica in replicas] == ["replica-1", "replica-2"]
+    for replica in replicas:
+        assert set(replica) == {"name", "url", "healthy", "reads", "failures", "pool"}
+        assert replica["healthy"] is True
+        assert replica["failures"] == 0
+        assert {"pool", "status"} <= set(replica["pool"])
+    assert sum(replica["reads"] for replica in replicas) == 1
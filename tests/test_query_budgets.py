@@ -0,0 +1,103 @@
+"""
+Query budgets of every budgeted route, on a dataset large enough to expose N+1 queries.
+
+TestingConfig enforces the budgets, so a route running more queries than it
+declares (e.g. a relationship lazy loaded per row) raises QueryBudgetExceeded
+and fails its test.
+"""
+
+# Third-party imports
+import pytest
+from flask import g, request_finished
+
+NDJSON = {"Accept": "application/x-ndjson"}
+INCLUDE = "manager,tenancies.tenants.support_workers"
+
+# (endpoint, url, headers): every budgeted GET, with the variants that load more
+BUDGETED_GETS = [
+    ("dashboard.get_dashboard", "/dashboard/", {}),
+    ("properties.get_properties", "/properties/", {}),
+    ("properties.get_properties", "/properties/?fields=id,address", {}),
+    ("properties.get_properties", "/properties/", NDJSON),
+    ("properties.get_property", "/properties/1/", {}),
+    ("properties.search_properties", "/properties/search?q=e", {}),
+    ("properties.get_properties_with_managers", "/properties/property_managers", {}),
+    ("properties.get_properties_with_managers", "/properties/property_managers", NDJSON),
+    ("properties.get_property_graphs", f"/properties/graph?include={INCLUDE}", {}),
+    ("properties.get_property_graph", f"/properties/1/graph?include={INCLUDE}", {}),
+    ("properties.get_properties_occupancy", "/properties/occupancy", {}),
+    ("properties.get_properties_occupancy", "/properties/occupancy?occupied=true", {}),
+    ("properties.get_property_occupancy", "/properties/1/occupancy", {}),
+    ("property_managers.get_property_managers", "/property_managers/", {}),
+    ("property_managers.get_property_manager", "/property_managers/1/", {}),
+    ("property_managers.get_property_managers_with_properties", "/property_managers/properties", {}),
+    ("property_managers.get_property_managers_with_properties", "/property_managers/properties", NDJSON),
+    ("support_workers.get_support_workers", "/support_workers/", {}),
+    ("support_workers.get_support_worker", "/support_workers/1/", {}),
+    ("support_workers.search_support_workers", "/support_workers/search?q=e", {}),
+    ("support_workers.get_support_workers_tenants", "/support_workers/tenants", {}),
+    ("support_workers.get_support_workers_tenants", "/support_workers/tenants", NDJSON),
+    ("tenancies.get_tenancies", "/tenancies/", {}),
+    ("tenancies.get_tenancy", "/tenancies/1/", {}),
+    ("tenancies.search_tenancies", "/tenancies/search?status=Tenanted&sort=-start_date", {}),
+    ("tenancies.get_tenancies_with_properties", "/tenancies/properties", {}),
+    ("tenancies.get_tenancies_with_properties", "/tenancies/properties", NDJSON),
+    ("tenancies.get_tenancies_with_tenants", "/tenancies/tenants", {}),
+    ("tenancies.get_tenancies_with_tenants", "/tenancies/tenants", NDJSON),
+    ("tenants.get_tenants", "/tenants/", {}),
+    ("tenants.get_tenant", "/tenants/1/", {}),
+    ("tenants.search_tenants", "/tenants/search?q=e", {}),
+    ("tenants.get_tenants_with_tenancies", "/tenants/tenancies", {}),
+    ("tenants.get_tenants_with_tenancies", "/tenants/tenancies", NDJSON),
+    ("tenants.get_tenants_support_workers", "/tenants/support_workers", {}),
+    ("tenants.get_tenants_support_workers", "/tenants/support_workers", NDJSON),
+]
+
+BUDGETED_DELETES = [
+    ("properties.delete_property", "/properties/1/"),
+    ("property_managers.delete_property_manager", "/property_managers/1/"),
+    ("support_workers.delete_support_worker", "/support_workers/1/"),
+    ("tenancies.delete_tenancy", "/tenancies/1/"),
+    ("tenants.delete_tenant", "/tenants/1/"),
+]
+
+# GET routes without a budget: they never touch the domain tables
+UNBUDGETED_GETS = {"landing_page", "static", "jobs.get_job", "metrics.get_cache_stats", "metrics.get_pool_stats"}
+
+
+@pytest.fixture()
+def budgets(app):
+    """Record the query budget each request declared."""
+    declared = []
+
+    def record(sender, response, **extra):
+        declared.append(g._queries.budget if "_queries" in g else None)
+
+    with request_finished.connected_to(record, app):
+        yield declared
+
+
+def test_every_get_and_delete_route_is_listed(app):
+    endpoints = {rule.endpoint: rule.methods for rule in app.url_map.iter_rules()}
+    gets = {endpoint for endpoint, methods in endpoints.items() if "GET" in methods}
+    deletes = {endpoint for endpoint, methods in endpoints.items() if "DELETE" in methods}
+
+    assert gets - UNBUDGETED_GETS == {endpoint for endpoint, _, _ in BUDGETED_GETS}
+    assert deletes == {endpoint for endpoint, _ in BUDGETED_DELETES}
+
+
+@pytest.mark.parametrize(("endpoint", "url", "headers"), BUDGETED_GETS)
+def test_get_stays_within_its_budget(client, scaled, budgets, endpoint, url, headers):
+    response = client.get(url, headers=headers)
+    response.get_data()
+
+    assert response.status_code == 200, response.get_data(as_text=True)
+    assert budgets[0] is not None
+
+
+@pytest.mark.parametrize(("endpoint", "url"), BUDGETED_DELETES)
+def test_delete_stays_within_its_budget(client, scaled, budgets, endpoint, url):
+    response = client.delete(url)
+
+    assert response.status_code == 200, response.get_data(as_text=True)
+    assert budgets[0] is not None
@@ -0,0 +1,86 @@
+"""Query instrumentation: N+1 detection, repeated statements and enforced budgets."""
+
+# Standard library imports
+import logging
+
+# Third-party imports
+import pytest
+from flask import Response
+from sqlalchemy import select, text
+from sqlalchemy.orm import selectinload
+
+# Application modules
+from extensions import db, query_monitor
+from models.property import Property
+from utils.query_monitor import QueryBudgetExceeded
+
+
+def finish(queries_made, budget=None):
+    """Run ``queries_made`` inside a request declaring ``budget`` and return its response."""
+    if budget is not None:
+        query_monitor.expect(budget)
+    queries_made()
+    return query_monitor._after_request(Response())
+
+
+def lazy_load_tenancies():
+    for prop in db.session.scalars(select(Property)).all():
+        prop.tenancies
+
+
+def test_lazy_load_per_row_is_logged_as_n_plus_one(app, scaled, caplog):
+    with app.test_request_context("/properties/"), caplog.at_level(logging.WARNING, "utils.query_monitor"):
+        response = finish(lazy_load_tenancies)
+
+    [record] = caplog.records
+    assert "N+1 query in GET /properties/: Property.tenancies lazy loaded 20 times" in record.getMessage()
+    assert 'desc="21 queries"' in response.headers["Server-Timing"]
+
+
+def test_eager_load_is_not_reported(app, scaled, caplog):
+    def eager_load_tenancies():
+        stmt = select(Property).options(selectinload(Property.tenancies))
+        for prop in db.session.scalars(stmt).all():
+            prop.tenancies
+
+    with app.test_request_context("/properties/"), caplog.at_level(logging.WARNING, "utils.query_monitor"):
+        finish(eager_load_tenancies, budget=2)
+
+    assert not caplog.records
+
+
+def test_repeated_statement_is_logged_with_its_sql(app, seeded, caplog):
+    def repeat():
+        for _ in range(query_monitor.repeat_threshold):
+            db.session.execute(text("SELECT 1"))
+
+    with app.test_request_context("/"), caplog.at_level(logging.WARNING, "utils.query_monitor"):
+        finish(repeat)
+
+    [record] = caplog.records
+    assert record.getMessage() == f"Statement repeated {query_monitor.repeat_threshold} times in GET /: SELECT 1"
+
+
+def test_n_plus_one_exceeds_an_enforced_budget(app, scaled):
+    assert query_monitor.enforce
+
+    with app.test_request_context("/properties/"):
+        with pytest.raises(QueryBudgetExceeded, match="GET /properties/ ran 21 queries, budget is 2"):
+            finish(lazy_load_tenancies, budget=2)
+
+
+def test_budget_counts_from_the_start_of_the_view(app, seeded):
+    with app.test_request_context("/"):
+        db.session.execute(text("SELECT 1"))
+        response = finish(lambda: db.session.execute(text("SELECT 2")), budget=1)
+
+    assert 'desc="2 queries"' in response.headers["Server-Timing"]
+
+
+def test_logged_budget_when_not_enforced(app, scaled, caplog, monkeypatch):
+    monkeypatch.setattr(query_monitor, "enforce", False)
+
+    with app.test_request_context("/properties/"), caplog.at_level(logging.WARNING, "utils.query_monitor"):
+        finish(lazy_load_tenancies, budget=2)
+
+    assert "GET /properties/ ran 21 queries, budget is 2" in [record.getMessage() for record in caplog.records]
@@ -0,0 +1,71 @@
+"""Read replica routing, with two SQLite files standing in for the replicas."""
+
+# Application modules
+from extensions import cache, replicas
+
+
+def phones(client):
+    return {tenant["id"]: tenant["phone"] for tenant in client.get("/tenants/").get_json()["data"]}
+
+
+def test_reads_are_spread_over_the_replicas(client, replicated):
+    for _ in range(4):
+        assert client.get("/tenants/1/").status_code == 200
+
+    assert [replica.reads for replica in replicas.replicas] == [2, 2]
+
+
+def test_writes_go_to_the_primary(client, replicated):
+    response = client.put("/tenants/1/", json={"phone": "0400000000"})
+
+    assert response.status_code == 200
+    assert [replica.reads for replica in replicas.replicas] == [0, 0]
+    # Not replicated yet
+    assert client.get("/tenants/1/").get_json()["phone"] != "0400000000"
+    replicated()
+    assert client.get("/tenants/1/").get_json()["phone"] == "0400000000"
+
+
+def test_lagging_replica_never_caches_old_rows_under_the_new_version(client, replicated):
+    phones(client)
+    client.put("/tenants/1/", json={"phone": "0400000000"})
+
+    # The replicas have not caught up: every read is cached under the old version
+    for _ in range(4):
+        assert phones(client)[1] != "0400000000"
+
+    replicated()
+
+    assert phones(client)[1] == "0400000000"
+    assert phones(client)[1] == "0400000000"
+
+
+def test_etag_of_a_lagging_replica_is_not_reused_after_it_catches_up(client, replicated):
+    client.put("/tenants/1/", json={"phone": "0400000000"})
+    stale_etag = client.get("/tenants/").headers["ETag"]
+
+    replicated()
+
+    response = client.get("/tenants/", headers={"If-None-Match": stale_etag})
+    assert response.status_code == 200
+    assert response.get_json()["data"][0]["phone"] == "0400000000"
+
+
+def test_versions_kept_outside_the_database_read_cached_routes_from_the_primary(client, replicated, monkeypatch):
+    monkeypatch.setattr(cache, "version_store", cache.backend)
+    client.put("/tenants/1/", json={"phone": "0400000000"})
+
+    assert phones(client)[1] == "0400000000"
+    assert [replica.reads for replica in replicas.replicas] == [0, 0]
+
+
+def test_unreachable_replica_is_skipped(app, client, replicated, tmp_path, monkeypatch):
+    urls = [app.config["DATABASE_REPLICA_URLS"][0], f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"]
+    monkeypatch.setitem(app.config, "DATABASE_REPLICA_URLS", urls)
+    replicas.init_app(app)
+
+    for _ in range(4):
+        assert client.get("/tenants/1/").status_code == 200
+
+    assert [replica.healthy for replica in replicas.replicas] == [True, False]
+    assert replicas.replicas[0].reads == 4
@@ -0,0 +1,76 @@
+"""The compiled serializers dump exactly what the Marshmallow schemas dump."""
+
+# Standard library imports
+import importlib
+import pkgutil
+
+# Third-party imports
+import pytest
+from marshmallow import Schema
+from sqlalchemy import inspect, select
+
+# Application modules
+import schemas
+from extensions import db
+from models.property import Property
+from models.property_occupancy import PropertyOccupancy
+from utils.occupancy import get_occupancy
+from utils.serializers import serialize
+
+# Schemas that only load request input and are never serialized
+INPUT_SCHEMAS = {"TenancyFilterSchema", "TenancySearchSchema"}
+
+
+def registered_schemas():
+    """Return every module-level schema instance of the schemas package, as ``precompile_schemas`` finds them."""
+    found = []
+    for module_info in pkgutil.iter_modules(schemas.__path__):
+        module = importlib.import_module(f"schemas.{module_info.name}")
+        for name, value in vars(module).items():
+            if isinstance(value, Schema) and type(value).__name__ not in INPUT_SCHEMAS:
+                found.append(pytest.param(value, id=f"{module_info.name}.{name}"))
+    return found
+
+
+def model_of(schema):
+    model = getattr(schema.opts, "model", None)
+    return PropertyOccupancy if model is None else model
+
+
+def bare_objects(model):
+    """
+    Return transient instances whose columns are all null: one with empty
+    (or null) relationships, and one whose relationships hold a null instance.
+    """
+    empty, filled = model(), model()
+    for relationship in inspect(model).relationships:
+        related = relationship.mapper.class_()
+        setattr(filled, relationship.key, [related] if relationship.uselist else related)
+    return [empty, filled]
+
+
+def stored_objects(schema):
+    """Return the stored rows ``schema`` serializes, relationships loaded."""
+    if model_of(schema) is PropertyOccupancy:
+        # Rows of utils.occupancy, including vacant properties with null tenancy fields
+        property_ids = db.session.scalars(select(Property.id)).all()
+        rows = [get_occupancy(property_id) for property_id in property_ids]
+        assert {row.occupied for row in rows} == {True, False}
+        return rows
+    return db.session.scalars(select(model_of(schema))).all()
+
+
+@pytest.mark.parametrize("schema", registered_schemas())
+def test_serialize_matches_dump(app, scaled, schema):
+    with app.app_context():
+        rows = stored_objects(schema)
+        if model_of(schema) is not PropertyOccupancy:
+            rows += bare_objects(model_of(schema))
+        assert rows
+
+        if schema.many:
+            assert serialize(schema, rows) == schema.dump(rows)
+            assert serialize(schema, []) == schema.dump([]) == []
+        else:
+            for row in rows:
+                assert serialize(schema, row) == schema.dump(row)
@@ -0,0 +1,37 @@
+"""NDJSON exports, read in keyset batches."""
+
+# Standard library imports
+import json
+
+# Third-party imports
+import pytest
+
+NDJSON = {"Accept": "application/x-ndjson"}
+
+
+def lines(response):
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+@pytest.fixture()
+def small_batches(app, monkeypatch):
+    monkeypatch.setitem(app.config, "STREAM_BATCH_SIZE", 7)
+
+
+@pytest.mark.parametrize("url", [
+    "/tenants/", "/tenants/tenancies", "/tenants/support_workers",
+    "/tenancies/properties", "/tenancies/tenants", "/properties/property_managers",
+])
+def test_stream_matches_the_pages_across_batches(client, scaled, small_batches, url):
+    page = client.get(f"{url}?limit=500").get_json()
+
+    assert page["next_cursor"] is None
+    assert lines(client.get(url, headers=NDJSON)) == page["data"]
+
+
+def test_stream_resumes_after_a_cursor(client, scaled, small_batches):
+    rows = lines(client.get("/tenancies/tenants?stream=1&after=10"))
+
+    assert [row["id"] for row in rows] == list(range(11, 31))
@@ -0,0 +1,80 @@
+"""Ranked text search (/search?q=) and its in-process NGramIndex fallback."""
+
+# Third-party imports
+import pytest
+
+# Application modules
+from utils.text_search import MATCH_THRESHOLD, NGramIndex, trigrams
+
+NAMES = ["Bob Johnson", "Jon Smith", "Bob Jonson", "Ann Lee", "Jonsonne Park", "Jo Jonson"]
+
+
+@pytest.fixture()
+def tenants(client, database):
+    """Create a tenant per name, in order, so ids follow NAMES."""
+    for name in NAMES:
+        response = client.post("/tenants/", json={
+            "name": name, "date_of_birth": "1990-01-01", "email": f"{name.split()[1].lower()}@example.com",
+        })
+        assert response.status_code == 201, response.get_json()
+
+
+def names(response):
+    assert response.status_code == 200, response.get_json()
+    return [tenant["name"] for tenant in response.get_json()["data"]]
+
+
+def test_trigrams_are_padded_like_pg_trgm():
+    assert trigrams("Ann") == {"  a", " an", "ann", "nn "}
+    assert trigrams("Jo-Ann") == {"  j", " jo", "jo ", "  a", " an", "ann", "nn "}
+
+
+def test_index_ranks_substrings_first_then_similar_words():
+    index = NGramIndex([(row_id, name) for row_id, name in enumerate(NAMES, start=1)])
+
+    results = index.search("jonson")
+
+    # Substring matches score 1.0 in id order; "Bob Johnson" is only similar
+    assert [row_id for _, row_id in results] == [3, 5, 6, 1]
+    assert [score for score, _ in results[:3]] == [1.0, 1.0, 1.0]
+    assert MATCH_THRESHOLD <= results[3][0] < 1.0
+    assert index.search("zzz") == []
+
+
+def test_index_matches_short_words_as_substrings():
+    index = NGramIndex([(1, "Jo Jonson"), (2, "Ann Lee"), (3, None)])
+
+    assert index.search("jo") == [(1.0, 1)]
+    assert index.search("e") == [(1.0, 2)]
+
+
+def test_search_returns_the_best_match_first(client, tenants):
+    assert names(client.get("/tenants/search?q=jonson")) == ["Bob Jonson", "Jonsonne Park", "Jo Jonson", "Bob Johnson"]
+    assert names(client.get("/tenants/search?q=smith@example")) == ["Jon Smith"]
+
+
+def test_pages_follow_the_cursor(client, tenants):
+    everything = names(client.get("/tenants/search?q=jonson&limit=500"))
+
+    pages, url = [], "/tenants/search?q=jonson&limit=1"
+    while url:
+        response = client.get(url)
+        pages.append(names(response))
+        cursor = response.get_json()["next_cursor"]
+        url = cursor and f"/tenants/search?q=jonson&limit=1&after={cursor}"
+
+    assert pages == [[name] for name in everything]
+
+
+def test_fallback_index_follows_writes(client, tenants):
+    assert names(client.get("/tenants/search?q=jonson")) == ["Bob Jonson", "Jonsonne Park", "Jo Jonson", "Bob Johnson"]
+
+    assert client.put("/tenants/4/", json={"name": "Ann Jonson"}).status_code == 200
+    assert client.delete("/tenants/3/").status_code == 200
+
+    assert names(client.get("/tenants/search?q=jonson")) == ["Ann Jonson", "Jonsonne Park", "Jo Jonson", "Bob Johnson"]
+
+
+@pytest.mark.parametrize("query", ["q=", "q=%20", f"q={'a' * 101}", "q=jo&after=abc", "q=jo&after=WzFd"])
+def test_invalid_search_is_rejected(client, tenants, query):
+    assert client.get(f"/tenants/search?{query}").status_code == 400
@@ -0,0 +1,69 @@
+"""Optimistic concurrency: version_id columns, If-Match and 409 Conflict."""
+
+# Third-party imports
+import pytest
+from sqlalchemy import update
+from sqlalchemy.orm.exc import StaleDataError
+
+# Application modules
+from extensions import db
+from models.tenant import Tenant
+
+
+def test_put_with_current_version_updates_and_bumps_it(client, seeded):
+    version = client.get("/tenants/1/").get_json()["version_id"]
+
+    response = client.put("/tenants/1/", json={"phone": "0400000000"}, headers={"If-Match": f'"{version}"'})
+
+    assert response.status_code == 200
+    assert response.get_json()["phone"] == "0400000000"
+    assert response.get_json()["version_id"] == version + 1
+
+
+@pytest.mark.parametrize("path", ["/tenants/1/", "/tenancies/1/", "/properties/1/", "/property_managers/1/", "/support_workers/1/"])
+def test_put_with_stale_if_match_answers_409(client, seeded, path):
+    version = client.get(path).get_json()["version_id"]
+
+    response = client.put(path, json={}, headers={"If-Match": f'"{version - 1}"'})
+
+    assert response.status_code == 409
+
+
+def test_put_with_stale_body_version_answers_409(client, seeded):
+    version = client.get("/tenancies/1/").get_json()["version_id"]
+    assert client.put("/tenancies/1/", json={"tenancy_status": "Vacant"}).status_code == 200
+
+    response = client.put("/tenancies/1/", json={"tenancy_status": "Tenanted", "version_id": version})
+
+    assert response.status_code == 409
+    assert client.get("/tenancies/1/").get_json()["tenancy_status"] == "Vacant"
+
+
+def test_put_rejects_non_integer_versions(client, seeded):
+    assert client.put("/tenants/1/", json={}, headers={"If-Match": '"abc"'}).status_code == 400
+    assert client.put("/tenants/1/", json={"version_id": "1"}).status_code == 400
+
+
+def test_delete_with_stale_if_match_answers_409(client, seeded):
+    version = client.get("/tenants/2/").get_json()["version_id"]
+
+    assert client.delete("/tenants/2/", headers={"If-Match": f'"{version + 1}"'}).status_code == 409
+    assert client.delete("/tenants/2/", headers={"If-Match": f'"{version}"'}).status_code == 200
+
+
+def test_write_based_on_a_row_changed_meanwhile_raises_stale_data(app, seeded):
+    with app.app_context():
+        tenant = db.session.get(Tenant, 1)
+        # Another writer commits first
+        with db.engine.begin() as conn:
+            conn.execute(update(Tenant).where(Tenant.id == 1).values(version_id=Tenant.version_id + 1))
+
+        tenant.phone = "0400000000"
+        with pytest.raises(StaleDataError):
+            db.session.commit()
+
+
+def test_only_entity_tables_are_versioned():
+    versioned = {table.name for table in db.metadata.sorted_tables if "version_id" in table.c}
+
+    assert versioned == {"property", "property_manager", "support_worker", "tenancy", "tenant"}
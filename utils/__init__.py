@@ -0,0 +1,8 @@
+"""
+Utilities Package
+
+Shared helpers used across the controllers of the Property Management API,
+such as request parsing and response building that would otherwise be
+repeated in every blueprint.
+
+"""
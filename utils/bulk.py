@@ -0,0 +1,542 @@
+"""
+Bulk Operations
+
+Helpers for endpoints that create, update or delete many rows in one request.
+
+Bulk create: every item is
+validated with the same schema (and model validators) as the single-object
+endpoint, foreign keys are checked with one set-based query per reference,
+and the valid rows are written with a single multi-row
+``INSERT ... RETURNING`` in one transaction. Invalid items are reported by
+index without aborting the valid ones.
+
+Bulk link: a list of id pairs is checked for existence and for existing
+links with one set-based query each, and the new association rows are
+written with ``INSERT ... ON CONFLICT DO NOTHING`` backed by the junction
+table's unique index, so concurrent requests cannot create duplicates.
+
+Bulk update: items ``{"id", "fields", "expected"}`` are validated like
+single-object updates and grouped by identical changes, so a batch of
+status transitions becomes one ``UPDATE ... WHERE id IN (...) RETURNING
+id`` per distinct transition, all in one transaction. ``expected`` holds
+the values a row must still have (e.g. its current ``tenancy_status``);
+it is part of the UPDATE's WHERE clause, so a row changed concurrently is
+left alone and reported as a conflict instead of being overwritten; it
+may include the row's ``version_id``. Every update increments ``version_id``.
+``update_where`` applies one change to every row matching a filter with a
+single UPDATE.
+
+Bulk purge: a list of ids is deleted with one ``DELETE ... WHERE id IN``
+and the database removes the dependent rows through its ``ON DELETE
+CASCADE`` foreign keys (see ``utils.cascade``). The result is a count of
+the rows removed per table, taken with one query before the delete,
+instead of the deleted objects. Purges run as background jobs.
+
+Note: PostgreSQL batches the ordered RETURNING insert into multi-row
+statements; SQLite cannot guarantee RETURNING order for a batch, so
+SQLAlchemy executes it row by row there (still in one transaction).
+
+"""
+
+from flask import abort, current_app, jsonify
+from marshmallow import ValidationError
+from sqlalchemy import delete, func, insert, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+# Application modules
+from extensions import db
+from utils.cascade import cascade_selects
+from utils.serializers import serialize
+from utils.versioning import version_bump
+
+
+def check_batch(payload):
+    """
+    Reject a bulk payload that is not a non-empty list or exceeds BULK_MAX_ITEMS.
+
+    Raises:
+        BadRequest: If the payload is not a non-empty list or is too large.
+    """
+    if not isinstance(payload, list) or not payload:
+        abort(400, description="Request body must be a non-empty JSON array")
+    max_items = current_app.config.get("BULK_MAX_ITEMS", 5000)
+    if len(payload) > max_items:
+        abort(400, description=f"A bulk request may contain at most {max_items} items")
+
+
+def validate_items(model, schema, payload, columns):
+    """
+    Validate a list of items against a schema and the model's validators.
+
+    Args:
+        model (db.Model): Model the rows will be inserted into.
+        schema (Schema): Single-object schema used to load each item.
+        payload (list[dict]): Items from the request body.
+        columns (list[str]): Columns written for each row.
+
+    Returns:
+        tuple[list[tuple[int, dict]], dict[int, dict]]: The valid rows with
+        their index in the payload, and error messages keyed by index.
+
+    Raises:
+        BadRequest: If the payload is not a non-empty list or is too large.
+    """
+    check_batch(payload)
+
+    valid, errors = [], {}
+    for index, item in enumerate(payload):
+        try:
+            fields = schema.load(item)
+            # Build a transient instance so the model's @validates rules apply
+            model(**{key: value for key, value in fields.items() if value is not None})
+        except ValidationError as ve:
+            errors[index] = ve.normalized_messages()
+            continue
+        valid.append((index, {column: fields.get(column) for column in columns}))
+    return valid, errors
+
+
+def check_references(valid, errors, references):
+    """
+    Drop rows whose foreign keys point at rows that do not exist.
+
+    One ``SELECT id ... WHERE id IN (...)`` is issued per referenced model.
+
+    Args:
+        valid (list[tuple[int, dict]]): Rows returned by validate_items.
+        errors (dict[int, dict]): Error messages keyed by index (updated in place).
+        references (dict[str, db.Model]): Foreign key column -> referenced model.
+            Rows without the column are kept as they are.
+
+    Returns:
+        list[tuple[int, dict]]: The rows whose references all exist.
+    """
+    for column, referenced in references.items():
+        wanted = {row[column] for _, row in valid if row.get(column) is not None}
+        existing = set(db.session.scalars(
+            select(referenced.id).where(referenced.id.in_(wanted))
+        )) if wanted else set()
+
+        kept = []
+        for index, row in valid:
+            if row.get(column) is not None and row[column] not in existing:
+                errors.setdefault(index, {})[column] = [
+                    f"{referenced.__name__} {row[column]} does not exist"
+                ]
+            else:
+                kept.append((index, row))
+        valid = kept
+    return valid
+
+
+def bulk_create(model, schema, many_schema, payload, columns, references=None, before_commit=None):
+    """
+    Validate and insert many rows in a single transaction.
+
+    Args:
+        model (db.Model): Model to insert into.
+        schema (Schema): Single-object schema used to validate each item.
+        many_schema (Schema): Schema (many=True) used to serialize created rows.
+        payload (list[dict]): Items from the request body.
+        columns (list[str]): Columns written for each row.
+        references (dict[str, db.Model], optional): Foreign keys to check.
+        before_commit (callable, optional): Called with the created objects
+            before committing, to update derived rows in the same transaction.
+
+    Returns:
+        tuple[list[dict], dict[int, dict]]: The serialized created rows (in
+        payload order) and error messages keyed by payload index.
+    """
+    valid, errors = validate_items(model, schema, payload, columns)
+    if references:
+        valid = check_references(valid, errors, references)
+    if not valid:
+        return [], errors
+
+    stmt = insert(model).returning(model, sort_by_parameter_order=True)
+    created = db.session.scalars(stmt, [row for _, row in valid]).all()
+    # Serialize before committing: RETURNING already populated every column,
+    # whereas commit would expire the rows and reload each one on access
+    data = serialize(many_schema, created)
+    if before_commit:
+        before_commit(created)
+    db.session.commit()
+    return data, errors
+
+
+def bulk_response(created, errors):
+    """
+    Build the response for a bulk create.
+
+    Args:
+        created (list[dict]): Serialized created rows.
+        errors (dict[int, dict]): Error messages keyed by payload index.
+
+    Returns:
+        tuple[Response, int]: 201 if any row was created, otherwise 400.
+    """
+    body = {
+        "created": created,
+        "errors": [{"index": index, "errors": errors[index]} for index in sorted(errors)]
+    }
+    return jsonify(body), 201 if created else 400
+
+
+def _insert_ignore(model):
+    """Return an INSERT for ``model`` that skips rows violating a unique index."""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model).on_conflict_do_nothing()
+    if dialect == "sqlite":
+        return sqlite.insert(model).on_conflict_do_nothing()
+    return insert(model).prefix_with("IGNORE")
+
+
+def bulk_link(link_model, left, right, payload, before_commit=None):
+    """
+    Create many association rows from a list of id pairs.
+
+    Args:
+        link_model (db.Model): Junction model (e.g. TenantTenancy).
+        left (tuple[str, db.Model]): First foreign key column and its model,
+            e.g. ("tenant_id", Tenant).
+        right (tuple[str, db.Model]): Second foreign key column and its model.
+        payload (list[dict]): Items such as {"tenant_id": 1, "tenancy_id": 2}.
+        before_commit (callable, optional): Called with the inserted
+            (left id, right id) pairs before committing.
+
+    Returns:
+        dict: "linked" (new pairs), "already_linked" (payload indexes whose
+        pair existed or was repeated) and "errors" (per-index messages).
+
+    Raises:
+        BadRequest: If the payload is not a non-empty list or is too large.
+    """
+    check_batch(payload)
+
+    (left_key, left_model), (right_key, right_model) = left, right
+    errors, pairs = {}, []
+    for index, item in enumerate(payload):
+        ids = [item.get(key) if isinstance(item, dict) else None for key in (left_key, right_key)]
+        missing = {
+            key: ["Must be an integer id."]
+            for key, value in zip((left_key, right_key), ids)
+            if not isinstance(value, int) or isinstance(value, bool)
+        }
+        if missing:
+            errors[index] = missing
+            continue
+        pairs.append((index, tuple(ids)))
+
+    # One existence query per side
+    existing_ids = {}
+    for position, (key, model) in enumerate((left, right)):
+        wanted = {pair[position] for _, pair in pairs}
+        existing_ids[key] = set(db.session.scalars(
+            select(model.id).where(model.id.in_(wanted))
+        )) if wanted else set()
+
+    # One query for pairs that are already linked
+    wanted_pairs = {pair for _, pair in pairs}
+    left_column, right_column = getattr(link_model, left_key), getattr(link_model, right_key)
+    linked = set(map(tuple, db.session.execute(
+        select(left_column, right_column).where(tuple_(left_column, right_column).in_(wanted_pairs))
+    ).all())) if wanted_pairs else set()
+
+    already_linked, new_rows = [], []
+    for index, (left_id, right_id) in pairs:
+        not_found = {
+            key: [f"{model.__name__} {value} does not exist"]
+            for key, model, value in ((left_key, left_model, left_id), (right_key, right_model, right_id))
+            if value not in existing_ids[key]
+        }
+        if not_found:
+            errors[index] = not_found
+        elif (left_id, right_id) in linked:
+            already_linked.append(index)
+        else:
+            linked.add((left_id, right_id))
+            new_rows.append({left_key: left_id, right_key: right_id})
+
+    inserted = []
+    if new_rows:
+        stmt = _insert_ignore(link_model).returning(left_column, right_column)
+        inserted = db.session.execute(stmt, new_rows).all()
+        if before_commit:
+            before_commit(inserted)
+        db.session.commit()
+
+    return {
+        "linked": [{left_key: left_id, right_key: right_id} for left_id, right_id in inserted],
+        "already_linked": already_linked,
+        "errors": [{"index": index, "errors": errors[index]} for index in sorted(errors)]
+    }
+
+
+def _load_changes(model, schema, fields, columns):
+    """
+    Validate the fields of an update like the single-object PUT does.
+
+    Returns:
+        dict: The loaded values of the ``columns`` present in ``fields``.
+
+    Raises:
+        ValidationError: If a field is invalid or no column is changed.
+    """
+    if not isinstance(fields, dict):
+        raise ValidationError("Must be an object.")
+    loaded = schema.load(fields, partial=True)
+    # Build a transient instance so the model's @validates rules apply
+    model(**{key: value for key, value in loaded.items() if value is not None})
+    changes = {column: loaded[column] for column in columns if column in loaded}
+    if not changes:
+        raise ValidationError(f"Must change at least one of: {', '.join(columns)}.")
+    return changes
+
+
+def _load_expected(schema, expected, columns):
+    """
+    Validate the values a row must still hold for an update to apply.
+
+    Returns:
+        dict: Expected value per column, including "version_id" if given.
+
+    Raises:
+        ValidationError: If a value is invalid.
+    """
+    if not isinstance(expected, dict):
+        raise ValidationError("Must be an object.")
+    expected = dict(expected)
+    version = expected.pop("version_id", None)
+    if version is not None and (not isinstance(version, int) or isinstance(version, bool)):
+        raise ValidationError({"version_id": ["Must be an integer."]})
+    loaded = schema.load(expected, partial=True)
+    conditions = {column: loaded[column] for column in columns if column in loaded}
+    if version is not None:
+        conditions["version_id"] = version
+    return conditions
+
+
+def _expected_conditions(model, expected):
+    """WHERE clauses requiring each column to still hold its expected value."""
+    return [
+        getattr(model, column).is_(None) if value is None else getattr(model, column) == value
+        for column, value in expected.items()
+    ]
+
+
+def bulk_update(model, schema, payload, columns, references=None, before_commit=None):
+    """
+    Apply many per-row updates in a single transaction.
+
+    Items are ``{"id": 1, "fields": {...}, "expected": {...}}``; items with
+    the same fields and expected values are written with one UPDATE.
+
+    Args:
+        model (db.Model): Model to update.
+        schema (Schema): Single-object schema used to validate fields.
+        payload (list[dict]): Items from the request body.
+        columns (list[str]): Columns that may be updated or expected
+            ("version_id" may always be expected).
+        references (dict[str, db.Model], optional): Foreign keys to check.
+        before_commit (callable, optional): Called with the updated ids
+            before committing.
+
+    Returns:
+        dict: "updated" (number of rows), "ids" (updated ids in payload
+        order), "conflicts" (indexes whose row no longer held the expected
+        values), "not_found" (indexes whose row does not exist) and
+        "errors" (per-index messages).
+
+    Raises:
+        BadRequest: If the payload is not a non-empty list or is too large.
+    """
+    check_batch(payload)
+
+    errors, items, seen = {}, {}, set()
+    for index, item in enumerate(payload):
+        row_id = item.get("id") if isinstance(item, dict) else None
+        if not isinstance(row_id, int) or isinstance(row_id, bool):
+            errors[index] = {"id": ["Must be an integer id."]}
+            continue
+        if row_id in seen:
+            errors[index] = {"id": [f"{model.__name__} {row_id} appears more than once."]}
+            continue
+        seen.add(row_id)
+        item_errors = {}
+        try:
+            changes = _load_changes(model, schema, item.get("fields"), columns)
+        except ValidationError as ve:
+            item_errors["fields"] = ve.normalized_messages()
+        try:
+            expected = _load_expected(schema, item.get("expected") or {}, columns)
+        except ValidationError as ve:
+            item_errors["expected"] = ve.normalized_messages()
+        if item_errors:
+            errors[index] = item_errors
+            continue
+        items[index] = (row_id, changes, expected)
+
+    if references:
+        reference_errors = {}
+        kept = check_references(
+            [(index, changes) for index, (_, changes, _) in items.items()], reference_errors, references
+        )
+        errors.update({index: {"fields": messages} for index, messages in reference_errors.items()})
+        items = {index: items[index] for index, _ in kept}
+
+    # One UPDATE per distinct (fields, expected) combination
+    groups = {}
+    for row_id, changes, expected in items.values():
+        key = (tuple(changes.items()), tuple(expected.items()))
+        groups.setdefault(key, []).append(row_id)
+
+    updated = set()
+    for (changes, expected), ids in groups.items():
+        stmt = (
+            update(model)
+            .where(model.id.in_(ids), *_expected_conditions(model, dict(expected)))
+            .values({**dict(changes), **version_bump(model)})
+            .returning(model.id)
+            .execution_options(synchronize_session=False)
+        )
+        updated.update(db.session.scalars(stmt))
+
+    # Rows left untouched either changed under us or do not exist
+    missed = [row_id for row_id, _, _ in items.values() if row_id not in updated]
+    existing = set(db.session.scalars(
+        select(model.id).where(model.id.in_(missed))
+    )) if missed else set()
+    if before_commit and updated:
+        before_commit(sorted(updated))
+    db.session.commit()
+
+    return {
+        "updated": len(updated),
+        "ids": [row_id for row_id, _, _ in items.values() if row_id in updated],
+        "conflicts": [index for index, (row_id, _, _) in items.items() if row_id in existing],
+        "not_found": [
+            index for index, (row_id, _, _) in items.items()
+            if row_id not in updated and row_id not in existing
+        ],
+        "errors": [{"index": index, "errors": errors[index]} for index in sorted(errors)]
+    }
+
+
+def bulk_update_response(result):
+    """
+    Build the response for a bulk update.
+
+    Args:
+        result (dict): Result of bulk_update.
+
+    Returns:
+        tuple[Response, int]: 200 if any row was updated, otherwise 409 if
+        rows conflicted and 400 if every item was invalid or missing.
+    """
+    if result["updated"]:
+        status = 200
+    else:
+        status = 409 if result["conflicts"] else 400
+    return jsonify(result), status
+
+
+def update_where(model, schema, clauses, fields, columns, references=None, before_commit=None):
+    """
+    Apply one change to every row matching ``clauses`` with a single UPDATE.
+
+    The filter is evaluated by the UPDATE itself, so a row that stopped
+    matching before the statement ran is not changed.
+
+    Args:
+        model (db.Model): Model to update.
+        schema (Schema): Single-object schema used to validate fields.
+        clauses (list[ColumnElement]): WHERE clauses selecting the rows.
+        fields (dict): Values to set, from the request body.
+        columns (list[str]): Columns that may be updated.
+        references (dict[str, db.Model], optional): Foreign keys to check.
+        before_commit (callable, optional): Called with the updated ids
+            before committing.
+
+    Returns:
+        dict: "updated" (number of rows) and "ids" (the updated ids).
+
+    Raises:
+        ValidationError: If a field is invalid or a reference does not exist.
+    """
+    try:
+        changes = _load_changes(model, schema, fields, columns)
+    except ValidationError as ve:
+        raise ValidationError({"fields": ve.normalized_messages()})
+    errors = {}
+    check_references([(0, changes)], errors, references or {})
+    if errors:
+        raise ValidationError({"fields": errors[0]})
+
+    stmt = (
+        update(model)
+        .where(*clauses)
+        .values({**changes, **version_bump(model)})
+        .returning(model.id)
+        .execution_options(synchronize_session=False)
+    )
+    ids = sorted(db.session.scalars(stmt))
+    if before_commit and ids:
+        before_commit(ids)
+    db.session.commit()
+    return {"updated": len(ids), "ids": ids}
+
+
+def purge_ids(payload):
+    """
+    Validate the body of a purge request, ``{"ids": [1, 2, ...]}``.
+
+    Returns:
+        list[int]: The distinct ids, in request order.
+
+    Raises:
+        BadRequest: If "ids" is not a non-empty list of integers or is too large.
+    """
+    ids = payload.get("ids") if isinstance(payload, dict) else None
+    if not isinstance(ids, list) or not ids:
+        abort(400, description='Request body must be {"ids": [...]} with at least one id')
+    if not all(isinstance(value, int) and not isinstance(value, bool) for value in ids):
+        abort(400, description="ids must be integers")
+    max_items = current_app.config.get("BULK_MAX_ITEMS", 5000)
+    if len(ids) > max_items:
+        abort(400, description=f"A bulk request may contain at most {max_items} items")
+    return list(dict.fromkeys(ids))
+
+
+def bulk_purge(model, ids, before_commit=None):
+    """
+    Delete rows of ``model`` and, through ON DELETE CASCADE, their dependents.
+
+    Args:
+        model (db.Model): Model to delete from.
+        ids (list[int]): Primary keys to delete.
+        before_commit (callable, optional): Called with the deleted ids
+            before committing.
+
+    Returns:
+        dict: "requested" (number of ids), "not_found" (ids that did not
+        exist) and "deleted" (rows removed per table name).
+    """
+    selects = cascade_selects(model.__table__, ids)
+    counts = db.session.execute(select(*(
+        select(func.count()).select_from(stmt.subquery()).scalar_subquery().label(name)
+        for name, stmt in selects.items()
+    ))).one()._asdict()
+    found = set(db.session.scalars(select(model.id).where(model.id.in_(ids))))
+    db.session.execute(
+        delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False)
+    )
+    if before_commit:
+        before_commit(sorted(found))
+    db.session.commit()
+    return {
+        "requested": len(ids),
+        "not_found": [value for value in ids if value not in found],
+        "deleted": counts,
+    }
+
@@ -0,0 +1,473 @@
+"""
+Response Cache
+
+A pluggable server-side cache for GET responses, keyed by route and query
+arguments. Each cached route declares the tables its response is built
+from; every table carries a version counter that is bumped whenever a
+change to it is committed (see the version stores below). The versions of the
+involved tables are part of the cache key, so a commit invalidates every
+dependent entry at once without having to find and delete them.
+
+Version stores (CACHE_VERSION_STORE):
+    - "database" (default): counters in the ``table_version`` table, bumped
+      in a short transaction of their own after the app's sessions commit
+      (see ``utils.table_versions``). Shared by every worker and process;
+      writers outside the app bump them with one UPDATE. Costs one indexed
+      read per cacheable request.
+    - "backend": counters kept by the cache backend and bumped when the
+      app's sessions commit. Per process for "lru", so only correct with a
+      single worker; shared for "redis", but writes made outside the app
+      invalidate nothing. These counters can be ahead of a lagging read
+      replica, so requests reading them use the primary (see
+      ``table_versions``); use the "database" store with replicas.
+
+Responses are stored as sent: when the client negotiates a compressed
+encoding (see ``utils.compression``) the compressed bytes are cached under
+a key that includes the encoding, so hot payloads are not recompressed.
+
+Backends (CACHE_BACKEND):
+    - "lru": In-process LRU dictionary (default). Each worker keeps its own
+      entries; with the "database" version store they are still invalidated
+      by writes from any worker.
+    - "redis": Any Redis-compatible client. CACHE_REDIS_URL selects the
+      server; "local://" uses LocalRedis, an in-process stand-in useful for
+      development and tests without a Redis server.
+    - "null": Caching disabled (versions are still tracked).
+
+"""
+
+# Standard library imports
+import functools
+import hashlib
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+# Third-party imports
+from flask import has_request_context, make_response, request
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+try:
+    import redis
+except ImportError:  # redis is optional, only needed for CACHE_BACKEND="redis"
+    redis = None
+
+# Application module
+from utils.cascade import cascaded_tables
+from utils.table_versions import DatabaseVersions
+
+
+class LocalRedis:
+    """
+    In-process stand-in implementing the subset of the Redis client API used
+    by RedisBackend (get, set with expiry/nx, incr, mget, delete, flushdb).
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._expires = {}
+        self._lock = threading.Lock()
+
+    def _expired(self, key):
+        expires = self._expires.get(key)
+        if expires is not None and expires <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+            return True
+        return False
+
+    def get(self, key):
+        with self._lock:
+            if self._expired(key):
+                return None
+            return self._data.get(key)
+
+    def mget(self, keys):
+        with self._lock:
+            return [None if self._expired(key) else self._data.get(key) for key in keys]
+
+    def set(self, key, value, ex=None, nx=False):
+        with self._lock:
+            if nx and key in self._data and not self._expired(key):
+                return None
+            self._data[key] = value
+            if ex:
+                self._expires[key] = time.monotonic() + ex
+            else:
+                self._expires.pop(key, None)
+            return True
+
+    def incr(self, key, amount=1):
+        with self._lock:
+            value = int(self._data.get(key, 0)) + amount
+            self._data[key] = str(value).encode()
+            return value
+
+    def delete(self, *keys):
+        with self._lock:
+            removed = 0
+            for key in keys:
+                removed += self._data.pop(key, None) is not None
+                self._expires.pop(key, None)
+            return removed
+
+    def dbsize(self):
+        with self._lock:
+            return len(self._data)
+
+    def flushdb(self):
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
+            return True
+
+
+class LRUBackend:
+    """In-process LRU store for cached responses and table versions."""
+
+    def __init__(self, max_entries=1024, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._epoch = uuid.uuid4().hex
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def versions(self, tables):
+        with self._lock:
+            return tuple(self._versions.get(table, 0) for table in tables)
+
+    def epoch(self):
+        # Versions restart at 0 with the process, so they are only
+        # comparable within one epoch
+        return self._epoch
+
+    def bump(self, tables):
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisBackend:
+    """Store cached responses and table versions in a Redis-compatible client."""
+
+    def __init__(self, client, ttl=None, prefix="pmapi:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return None if raw is None else pickle.loads(raw)
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=self.ttl)
+
+    def versions(self, tables):
+        raw = self.client.mget([f"{self.prefix}version:{table}" for table in tables])
+        return tuple(int(value or 0) for value in raw)
+
+    def epoch(self):
+        # A new epoch is started whenever the server loses the version keys
+        key = f"{self.prefix}epoch"
+        self.client.set(key, uuid.uuid4().hex, nx=True)
+        epoch = self.client.get(key)
+        return epoch.decode() if isinstance(epoch, bytes) else epoch
+
+    def bump(self, tables):
+        for table in tables:
+            self.client.incr(f"{self.prefix}version:{table}")
+
+    def clear(self):
+        # Bumping versions is the invalidation mechanism; a flush is only used
+        # for the local stand-in, never against a shared server.
+        if isinstance(self.client, LocalRedis):
+            self.client.flushdb()
+
+    def __len__(self):
+        return self.client.dbsize()
+
+
+class NullBackend(LRUBackend):
+    """Backend that tracks versions but never stores a response."""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+
+class ResponseCache:
+    """
+    Flask extension caching GET responses with per-table invalidation.
+
+    Attributes:
+        backend: Storage backend (LRUBackend, RedisBackend or NullBackend).
+        version_store: Source of the table versions (DatabaseVersions or the backend).
+        hits (int): Number of responses served from the cache.
+        misses (int): Number of cacheable requests that ran the view.
+        invalidations (int): Number of table version bumps.
+    """
+
+    def __init__(self, app=None):
+        self.backend = LRUBackend()
+        self.version_store = self.backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._stats_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Select the backend from config and start tracking table changes."""
+        backend = app.config.get("CACHE_BACKEND", "lru")
+        ttl = app.config.get("CACHE_DEFAULT_TTL", 300)
+        if backend == "redis":
+            url = app.config.get("CACHE_REDIS_URL", "local://")
+            if url == "local://":
+                client = LocalRedis()
+            elif redis is None:
+                raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+            else:
+                client = redis.Redis.from_url(url)
+            self.backend = RedisBackend(client, ttl=ttl)
+        elif backend == "null":
+            self.backend = NullBackend()
+        else:
+            self.backend = LRUBackend(app.config.get("CACHE_MAX_ENTRIES", 1024), ttl=ttl)
+        if app.config.get("CACHE_VERSION_STORE", "database") == "database":
+            self.version_store = DatabaseVersions()
+        else:
+            self.version_store = self.backend
+
+        app.extensions["response_cache"] = self
+        if not event.contains(Session, "after_commit", _after_commit):
+            event.listen(Session, "after_flush", _after_flush)
+            event.listen(Session, "do_orm_execute", _do_orm_execute)
+            event.listen(Session, "after_commit", _after_commit)
+            event.listen(Session, "after_rollback", _after_rollback)
+        if self not in _listeners:
+            _listeners.append(self)
+
+    # --------------------------------------------------------
+    # Table versions
+    # --------------------------------------------------------
+    def table_versions(self, tables):
+        """Return the current version of each table, in order."""
+        if not isinstance(self.version_store, DatabaseVersions):
+            # A bump here may not have reached the read replicas yet: read the
+            # data these versions label from the primary, or a lagging replica's
+            # old rows would be cached under the new version
+            _pin_primary()
+        return self.version_store.versions(tables)
+
+    def version_stamp(self, tables, versions=None):
+        """
+        Return a stamp identifying the current state of the given tables.
+
+        The stamp combines the backend epoch with each table's version, so
+        it changes whenever one of the tables is committed to and never
+        repeats after a restart of the version store.
+
+        Args:
+            tables (tuple[str]): Table names.
+            versions (tuple, optional): Versions already read for ``tables``
+                (e.g. by the ASGI routes); read from the version store if omitted.
+        """
+        if versions is None:
+            versions = self.table_versions(tables)
+        versions = ".".join(str(version) for version in versions)
+        return f"{self.version_store.epoch()}:{versions}"
+
+    def invalidate(self, tables):
+        """Bump the version of each table, invalidating dependent entries."""
+        tables = sorted(set(tables))
+        if tables:
+            self.version_store.bump(tables)
+            with self._stats_lock:
+                self.invalidations += len(tables)
+
+    # --------------------------------------------------------
+    # Response caching
+    # --------------------------------------------------------
+    def key_for(self, path, args, tables, encoding=None, versions=None):
+        """Build the cache key for a path, its query arguments, table versions and content encoding."""
+        if versions is None:
+            versions = self.table_versions(tables)
+        raw = repr((path, sorted(args), tables, tuple(versions), encoding))
+        return "resp:" + hashlib.sha1(raw.encode()).hexdigest()
+
+    def make_key(self, tables, encoding=None):
+        """Build the cache key for the current request and table versions."""
+        return self.key_for(request.path, request.args.items(multi=True), tables, encoding)
+
+    def record(self, hit):
+        """Count a cache hit or miss."""
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def cached(self, *tables):
+        """
+        Decorator caching a GET view's 200 responses.
+
+        Args:
+            *tables: Models or table names the response is built from.
+        """
+        table_names = tuple(sorted(getattr(table, "__tablename__", table) for table in tables))
+
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                if request.method != "GET" or _is_stream_request():
+                    return view(*args, **kwargs)
+
+                compression = _compression()
+                encoding = compression.request_encoding()
+                key = self.make_key(table_names, encoding)
+                entry = self.backend.get(key)
+                if entry is not None:
+                    self.record(hit=True)
+                    body, status, mimetype, content_encoding = entry
+                    response = make_response(body, status)
+                    response.mimetype = mimetype
+                    if content_encoding:
+                        response.headers["Content-Encoding"] = content_encoding
+                    response.headers["X-Cache"] = "HIT"
+                    return response
+
+                self.record(hit=False)
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    # Compress before storing so hits are served without recompressing
+                    compression.compress_response(response, encoding)
+                    self.backend.set(key, (
+                        response.get_data(), 200, response.mimetype,
+                        response.headers.get("Content-Encoding")
+                    ))
+                response.headers["X-Cache"] = "MISS"
+                return response
+            return wrapper
+        return decorator
+
+    def stats(self):
+        """Return hit/miss counters for the metrics endpoint."""
+        total = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "version_store": type(self.version_store).__name__,
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None,
+            "invalidations": self.invalidations
+        }
+
+    def clear(self):
+        """Drop all cached responses and reset the counters."""
+        self.backend.clear()
+        with self._stats_lock:
+            self.hits = self.misses = self.invalidations = 0
+
+
+def _is_stream_request():
+    """Return True if the request asks for a streamed NDJSON response."""
+    # Imported here because utils.streaming depends on the extensions module
+    from utils.streaming import wants_stream
+    return wants_stream()
+
+
+def _compression():
+    """Return the response compression extension."""
+    # Imported here because the extensions module imports this one
+    from extensions import compression
+    return compression
+
+
+def _pin_primary():
+    """Send the rest of the current request's queries to the primary database."""
+    if has_request_context():
+        from extensions import db
+        db.session.info["pinned_primary"] = True
+
+
+# ============================================================
+# Session events: track changed tables and bump on commit
+# ============================================================
+_listeners = []
+
+
+def _changed_tables(session):
+    return session.info.setdefault("changed_tables", set())
+
+
+def _after_flush(session, flush_context):
+    """Record the tables written by a unit of work flush."""
+    changed = _changed_tables(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        mapper = inspect(obj).mapper
+        changed.update(table.name for table in mapper.tables)
+        for relationship in mapper.relationships:
+            if relationship.secondary is not None:
+                changed.add(relationship.secondary.name)
+    # Rows removed by ON DELETE CASCADE never pass through the session
+    for obj in session.deleted:
+        for table in inspect(obj).mapper.tables:
+            changed.update(cascaded_tables(table))
+
+
+def _do_orm_execute(orm_execute_state):
+    """Record the table targeted by INSERT/UPDATE/DELETE statements."""
+    state = orm_execute_state
+    if state.is_insert or state.is_update or state.is_delete:
+        table = getattr(state.statement, "table", None)
+        if table is not None:
+            _changed_tables(state.session).add(table.name)
+            if state.is_delete:
+                _changed_tables(state.session).update(cascaded_tables(table))
+
+
+def _after_commit(session):
+    """Bump the versions of every table changed in the committed transaction."""
+    changed = session.info.pop("changed_tables", None)
+    if changed:
+        for cache in _listeners:
+            cache.invalidate(changed)
+
+
+def _after_rollback(session):
+    session.info.pop("changed_tables", None)
@@ -0,0 +1,95 @@
+"""
+Database-Level Delete Cascades
+
+Deleting a row removes its dependents with ``ON DELETE CASCADE`` foreign
+keys in the database, not in the ORM:
+
+    property_manager -> property -> tenancy -> tenant_tenancy
+    property -> property_occupancy
+    tenant -> tenant_tenancy, tenant_support_worker
+    support_worker -> tenant_support_worker
+
+Every relationship that cascades deletes is declared with
+``passive_deletes=True``, so ``db.session.delete(obj)`` emits a single
+DELETE for ``obj`` instead of loading each child row and deleting it one
+statement at a time.
+
+SQLite only enforces foreign keys (and so only cascades) when
+``PRAGMA foreign_keys`` is on; it is switched on for every SQLite
+connection here.
+
+``cascaded_tables`` lists the tables a delete reaches, so the response
+cache can invalidate them although the ORM never sees the child rows.
+
+"""
+
+# Standard library imports
+import functools
+import sqlite3
+
+# Third-party imports
+from sqlalchemy import event, or_, select
+from sqlalchemy.engine import Engine
+
+
+@event.listens_for(Engine, "connect")
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+def _cascading_foreign_keys(table):
+    """Yield the foreign keys of ``table`` declared ``ON DELETE CASCADE``."""
+    for foreign_key in table.foreign_keys:
+        if (foreign_key.ondelete or "").upper() == "CASCADE":
+            yield foreign_key
+
+
+def _primary_key(table):
+    """Return the single primary key column of ``table`` (``id``, or e.g. ``property_id``)."""
+    return list(table.primary_key)[0]
+
+
+@functools.lru_cache(maxsize=None)
+def cascaded_tables(table):
+    """
+    Return the names of the tables whose rows a DELETE on ``table`` can cascade to.
+
+    Args:
+        table (Table): The table rows are deleted from.
+
+    Returns:
+        tuple[str]: Dependent table names, parents before children.
+    """
+    reached = {table}
+    for candidate in table.metadata.sorted_tables:
+        if any(fk.column.table in reached for fk in _cascading_foreign_keys(candidate)):
+            reached.add(candidate)
+    return tuple(t.name for t in table.metadata.sorted_tables if t in reached and t is not table)
+
+
+def cascade_selects(table, ids):
+    """
+    Build, for ``table`` and every table a delete cascades to, a SELECT of
+    the primary keys of the rows deleting ``ids`` from ``table`` would remove.
+
+    Args:
+        table (Table): The table rows are deleted from.
+        ids (list[int]): Primary keys to delete.
+
+    Returns:
+        dict[str, Select]: Table name -> SELECT of the affected rows' primary
+        key, parents before children.
+    """
+    selects = {table: select(_primary_key(table)).where(_primary_key(table).in_(ids))}
+    for candidate in table.metadata.sorted_tables:
+        conditions = [
+            fk.parent.in_(selects[fk.column.table])
+            for fk in _cascading_foreign_keys(candidate)
+            if fk.column.table in selects
+        ]
+        if conditions and candidate not in selects:
+            selects[candidate] = select(_primary_key(candidate)).where(or_(*conditions))
+    return {t.name: stmt for t, stmt in selects.items()}
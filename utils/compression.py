@@ -0,0 +1,227 @@
+"""
+Response Compression
+
+Compresses response bodies with the best encoding the client accepts
+(``Accept-Encoding``), in server preference order COMPRESSION_ENCODINGS
+(default ``zstd,br,gzip``):
+
+    - zstd: needs the optional ``zstandard`` package
+    - br: needs the optional ``brotli`` (or ``brotlicffi``) package
+    - gzip: always available (zlib)
+
+Encodings whose package is not installed are skipped. Only text-like
+bodies (JSON, NDJSON, HTML, plain text) are compressed:
+
+    - Buffered responses smaller than COMPRESSION_MIN_SIZE bytes are sent as
+      they are; compressing them costs more CPU than it saves on the wire.
+    - Streamed responses (NDJSON exports) are compressed incrementally and
+      flushed every STREAM_FLUSH_BYTES of input, so clients keep receiving
+      rows as they are produced.
+
+Cached GET responses are stored compressed (``ResponseCache`` keys them by
+encoding) and ETags differ per encoding (``utils.etag``), so a hot payload
+is compressed once per encoding rather than on every request.
+
+"""
+
+# Standard library imports
+import zlib
+
+# Third-party imports
+from flask import request
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, only needed for "br"
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional, only needed for "zstd"
+    zstandard = None
+
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "text/html",
+    "text/plain",
+    "text/css",
+}
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+
+# Uncompressed bytes of a stream buffered before a flush pushes them to the client
+STREAM_FLUSH_BYTES = 64 * 1024
+
+
+class GzipEncoder:
+    """Incremental gzip encoder."""
+
+    def __init__(self):
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    """Incremental brotli encoder."""
+
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    """Incremental zstd encoder."""
+
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def _available_encoders():
+    encoders = {"gzip": GzipEncoder}
+    if brotli is not None:
+        encoders["br"] = BrotliEncoder
+    if zstandard is not None:
+        encoders["zstd"] = ZstdEncoder
+    return encoders
+
+
+class Compression:
+    """
+    Flask extension negotiating and applying response compression.
+
+    Attributes:
+        enabled (bool): Compress responses at all.
+        min_size (int): Smallest buffered body compressed, in bytes.
+        encodings (list[str]): Usable encodings in server preference order.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = True
+        self.min_size = 1024
+        self.encodings = ["gzip"]
+        self._encoders = _available_encoders()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read settings from config and hook into the request cycle."""
+        self.enabled = app.config.get("COMPRESSION_ENABLED", True)
+        self.min_size = app.config.get("COMPRESSION_MIN_SIZE", 1024)
+        preferred = app.config.get("COMPRESSION_ENCODINGS", "zstd,br,gzip")
+        self.encodings = [
+            name.strip() for name in preferred.split(",") if name.strip() in self._encoders
+        ]
+        app.after_request(self._after_request)
+        app.extensions["compression"] = self
+
+    def negotiate(self, accept_encoding):
+        """
+        Return the encoding to use for an ``Accept-Encoding`` header value.
+
+        Returns:
+            str | None: The accepted encoding with the highest quality (ties
+            go to the server's preference), or None for an uncompressed body.
+        """
+        if not self.enabled or not self.encodings or not accept_encoding:
+            return None
+        return parse_accept_header(accept_encoding).best_match(self.encodings)
+
+    def request_encoding(self):
+        """Return the encoding negotiated for the current request, or None."""
+        return self.negotiate(request.headers.get("Accept-Encoding", ""))
+
+    def compress(self, data, encoding):
+        """Compress a complete body with ``encoding``."""
+        encoder = self._encoders[encoding]()
+        return encoder.compress(data) + encoder.finish()
+
+    def compressible(self, response):
+        """Return True if the response's content may be compressed."""
+        return (
+            response.mimetype in COMPRESSIBLE_MIMETYPES
+            and response.status_code >= 200
+            and response.status_code not in (204, 304)
+            and "Content-Encoding" not in response.headers
+            and not response.direct_passthrough
+        )
+
+    def compress_response(self, response, encoding):
+        """
+        Compress ``response`` in place with ``encoding`` if it qualifies.
+
+        Buffered bodies below ``min_size`` are left uncompressed; streamed
+        bodies are always compressed, chunk by chunk.
+
+        Returns:
+            Response: The same response object.
+        """
+        if encoding is None or not self.compressible(response):
+            return response
+        if response.is_streamed:
+            response.response = self._stream(response.response, encoding)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            response.set_data(self.compress(data, encoding))
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    def _stream(self, chunks, encoding):
+        """Compress an iterable of chunks, flushing every STREAM_FLUSH_BYTES of input."""
+        encoder = self._encoders[encoding]()
+        pending = 0
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode()
+                output = encoder.compress(chunk)
+                pending += len(chunk)
+                if pending >= STREAM_FLUSH_BYTES:
+                    output += encoder.flush()
+                    pending = 0
+                if output:
+                    yield output
+            yield encoder.finish()
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()
+
+    def _after_request(self, response):
+        if response.mimetype in COMPRESSIBLE_MIMETYPES and self.enabled:
+            response.vary.add("Accept-Encoding")
+        return self.compress_response(response, self.request_encoding())
@@ -0,0 +1,216 @@
+"""
+Portfolio Dashboard
+
+Computes the portfolio aggregates served by ``GET /dashboard/`` in SQL, as
+four statements instead of loading rows into Python:
+
+    - totals: one row of scalar subqueries (counts of each resource and the
+      occupied/vacant property counts)
+    - properties per property manager (GROUP BY manager)
+    - tenancies per tenancy_status (GROUP BY status)
+    - tenants per support worker (GROUP BY support worker)
+
+A property is occupied when it has a "Tenanted" tenancy that is current
+(started on or before today and not ended before today); every other
+property counts as vacant.
+
+Materialized mode (DASHBOARD_MATERIALIZED, PostgreSQL only): the same
+statements are stored as materialized views by ``flask db migrate`` and
+the dashboard reads the views, so a request costs four small scans however
+large the tables are. The views are brought up to date with
+``flask db refresh-dashboard`` or ``POST /dashboard/refresh`` (e.g. from
+cron), using ``REFRESH MATERIALIZED VIEW CONCURRENTLY`` so reads are not
+blocked while they refresh.
+
+"""
+
+# Third-party imports
+from flask import current_app
+from sqlalchemy import func, literal, or_, select, text
+from sqlalchemy.exc import DBAPIError
+
+# Application modules
+from extensions import db, cache
+from models.property import Property
+from models.property_manager import PropertyManager
+from models.support_worker import SupportWorker
+from models.tenancy import Tenancy
+from models.tenant import Tenant
+from models.tenant_support_worker import TenantSupportWorker
+
+# Version bumped by a refresh of the materialized views (one of DERIVED_VERSIONS
+# in utils.table_versions, so it has a table_version row)
+DASHBOARD_VERSION = "dashboard"
+
+# Tables the dashboard is built from, and the version of its materialized views
+DASHBOARD_TABLES = (
+    Property, PropertyManager, SupportWorker, Tenancy, Tenant, TenantSupportWorker, DASHBOARD_VERSION
+)
+
+OCCUPIED_STATUS = "Tenanted"
+
+
+def _count(model):
+    return select(func.count()).select_from(model).scalar_subquery()
+
+
+def totals_query():
+    """Return a one-row SELECT of resource counts and occupied/vacant properties."""
+    today = func.current_date()
+    occupied = (
+        select(func.count(func.distinct(Tenancy.property_id)))
+        .where(
+            Tenancy.tenancy_status == OCCUPIED_STATUS,
+            Tenancy.start_date <= today,
+            or_(Tenancy.end_date.is_(None), Tenancy.end_date >= today),
+        )
+        .scalar_subquery()
+    )
+    return select(
+        literal(1).label("id"),
+        func.current_timestamp().label("as_of"),
+        _count(PropertyManager).label("property_managers"),
+        _count(Property).label("properties"),
+        _count(Tenancy).label("tenancies"),
+        _count(Tenant).label("tenants"),
+        _count(SupportWorker).label("support_workers"),
+        occupied.label("occupied_properties"),
+    )
+
+
+def properties_per_manager_query():
+    """Return the number of properties of each property manager."""
+    return (
+        select(
+            PropertyManager.id.label("property_manager_id"),
+            PropertyManager.name,
+            func.count(Property.id).label("properties"),
+        )
+        .outerjoin(Property, Property.property_manager_id == PropertyManager.id)
+        .group_by(PropertyManager.id, PropertyManager.name)
+        .order_by(PropertyManager.id)
+    )
+
+
+def tenancies_by_status_query():
+    """Return the number of tenancies per tenancy_status."""
+    return (
+        select(Tenancy.tenancy_status, func.count().label("tenancies"))
+        .group_by(Tenancy.tenancy_status)
+        .order_by(Tenancy.tenancy_status)
+    )
+
+
+def tenants_per_support_worker_query():
+    """Return the number of tenants assigned to each support worker."""
+    return (
+        select(
+            SupportWorker.id.label("support_worker_id"),
+            SupportWorker.name,
+            func.count(TenantSupportWorker.tenant_id).label("tenants"),
+        )
+        .outerjoin(TenantSupportWorker, TenantSupportWorker.support_worker_id == SupportWorker.id)
+        .group_by(SupportWorker.id, SupportWorker.name)
+        .order_by(SupportWorker.id)
+    )
+
+
+# Materialized view name -> (query, unique key column required by CONCURRENTLY)
+VIEWS = {
+    "dashboard_totals": (totals_query, "id"),
+    "dashboard_properties_per_manager": (properties_per_manager_query, "property_manager_id"),
+    "dashboard_tenancies_by_status": (tenancies_by_status_query, "tenancy_status"),
+    "dashboard_tenants_per_support_worker": (tenants_per_support_worker_query, "support_worker_id"),
+}
+
+
+def materialized_enabled():
+    """Return True if the dashboard reads from materialized views."""
+    return (
+        current_app.config.get("DASHBOARD_MATERIALIZED", False)
+        and db.engine.dialect.name == "postgresql"
+    )
+
+
+def _rows(name):
+    """Return the rows of a dashboard statement, live or from its materialized view."""
+    if materialized_enabled():
+        key = VIEWS[name][1]
+        return db.session.execute(text(f"SELECT * FROM {name} ORDER BY {key}")).mappings().all()
+    return db.session.execute(VIEWS[name][0]()).mappings().all()
+
+
+def dashboard_data():
+    """
+    Return the portfolio aggregates.
+
+    Returns:
+        dict: Totals, properties per manager, tenancies by status and
+        tenants per support worker, plus the data source ("live" or
+        "materialized") and the time the figures were computed (``as_of``,
+        the last refresh in materialized mode).
+    """
+    totals = dict(_rows("dashboard_totals")[0])
+    totals.pop("id")
+    as_of = totals.pop("as_of")
+    totals["vacant_properties"] = totals["properties"] - totals["occupied_properties"]
+    return {
+        "source": "materialized" if materialized_enabled() else "live",
+        # SQLite returns CURRENT_TIMESTAMP as text, PostgreSQL as a datetime
+        "as_of": as_of.isoformat() if hasattr(as_of, "isoformat") else as_of,
+        "totals": totals,
+        "properties_per_manager": [dict(row) for row in _rows("dashboard_properties_per_manager")],
+        "tenancies_by_status": {
+            row["tenancy_status"]: row["tenancies"] for row in _rows("dashboard_tenancies_by_status")
+        },
+        "tenants_per_support_worker": [
+            dict(row) for row in _rows("dashboard_tenants_per_support_worker")
+        ],
+    }
+
+
+def create_views(engine, echo=print):
+    """
+    Create the dashboard materialized views and their unique indexes.
+
+    Only runs on PostgreSQL with DASHBOARD_MATERIALIZED enabled; views that
+    already exist are left as they are.
+
+    Args:
+        engine (Engine): Engine for the target database.
+        echo (Callable[[str], None]): Progress output.
+
+    Returns:
+        list[str]: Names of views that could not be created.
+    """
+    if engine.dialect.name != "postgresql" or not current_app.config.get("DASHBOARD_MATERIALIZED"):
+        return []
+    failed = []
+    for name, (query, key) in VIEWS.items():
+        sql = query().compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(f"CREATE MATERIALIZED VIEW IF NOT EXISTS {name} AS {sql}"))
+                conn.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS ix_{name}_{key} ON {name} ({key})"))
+            echo(f"Materialized view {name} is present")
+        except DBAPIError as e:
+            failed.append(name)
+            echo(f"Materialized view {name} failed: {e.orig}")
+    return failed
+
+
+def refresh_views():
+    """
+    Refresh the dashboard materialized views without blocking readers.
+
+    Returns:
+        bool: False if materialized mode is not enabled (nothing refreshed).
+    """
+    if not materialized_enabled():
+        return False
+    with db.engine.begin() as conn:
+        for name in VIEWS:
+            conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {name}"))
+    # The refresh happens outside the session, so bump the views' version explicitly
+    cache.invalidate([DASHBOARD_VERSION])
+    return True
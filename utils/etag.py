@@ -0,0 +1,101 @@
+"""
+Conditional GET
+
+Adds strong ETags to GET responses and answers ``If-None-Match`` with
+``304 Not Modified``. The ETag is derived from the route, the query
+arguments and the version stamp of the tables the response is built from
+(see ``utils.cache``), so it can be checked before the view runs: a
+matching request costs one indexed read of the table versions and no
+Marshmallow dump at all.
+
+With the default CACHE_VERSION_STORE="database" the versions are the
+``table_version`` counters bumped after every commit (see
+``utils.table_versions``), so every worker computes the same ETag for the
+same data, and a write from any worker changes it. The counters never
+expire or restart, so an ETag can never be reissued for different data.
+
+Each content encoding negotiated by ``utils.compression`` is a separate
+representation with its own ETag, as required for strong validators.
+
+"""
+
+# Standard library imports
+import functools
+import hashlib
+
+# Third-party imports
+from flask import Response, make_response, request
+
+# Application module
+from extensions import cache, compression
+from utils.streaming import wants_stream
+
+
+def etag_for(path, args, representation, table_names, stamp=None):
+    """
+    Compute the strong ETag of a response.
+
+    Args:
+        path (str): Request path.
+        args (Iterable[tuple[str, str]]): Query arguments (any order).
+        representation (str): "json" or "ndjson", followed by "+<encoding>"
+            for a compressed representation (e.g. "json+gzip").
+        table_names (tuple[str]): Tables the response is built from.
+        stamp (str, optional): Version stamp of ``table_names`` already
+            computed (e.g. by the ASGI routes); computed if omitted.
+
+    Returns:
+        str: ETag value (without quotes).
+    """
+    if stamp is None:
+        stamp = cache.version_stamp(table_names)
+    raw = repr((path, sorted(args), representation, table_names, stamp))
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def compute_etag(table_names):
+    """
+    Compute the strong ETag for the current request.
+
+    Args:
+        table_names (tuple[str]): Tables the response is built from.
+
+    Returns:
+        str: ETag value (without quotes).
+    """
+    representation = "ndjson" if wants_stream() else "json"
+    encoding = compression.request_encoding()
+    if encoding:
+        representation += f"+{encoding}"
+    return etag_for(request.path, request.args.items(multi=True), representation, table_names)
+
+
+def conditional(*tables):
+    """
+    Decorator adding ETag / If-None-Match support to a GET view.
+
+    Args:
+        *tables: Models or table names the response is built from.
+    """
+    table_names = tuple(sorted(getattr(table, "__tablename__", table) for table in tables))
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(*args, **kwargs)
+
+            etag = compute_etag(table_names)
+            if request.if_none_match.contains(etag):
+                not_modified = Response(status=304)
+                not_modified.set_etag(etag)
+                return not_modified
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+                # Allow clients to store the response but always revalidate it
+                response.headers.setdefault("Cache-Control", "no-cache")
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,142 @@
+"""
+Sparse Fieldsets
+
+Lets clients ask GET endpoints for a subset of fields with
+``?fields=id,name``. Nested fields are selected with dotted names, e.g.
+``?fields=id,tenancies.id`` on ``/tenants/tenancies``.
+
+The subset is applied at both ends:
+
+    - Serialization: ``sparse(schema)`` returns the schema restricted with
+      Marshmallow's ``only=``. Restricted instances are cached per schema
+      and field combination, so each combination is built and compiled once.
+    - SQL: ``sparse_options(model, schema)`` returns a ``load_only`` option
+      selecting only the columns the restricted schema reads (plus the keys
+      its nested relationships are loaded by), so the other columns are
+      never fetched. Projected list endpoints (``paginate_projected``)
+      derive their columns from the schema and need no option.
+
+Without ``?fields=`` both helpers leave the endpoint unchanged.
+
+"""
+
+# Standard library imports
+import functools
+
+# Third-party imports
+from flask import abort, request
+from marshmallow import fields
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+# Application module
+from utils.serializers import get_serializer
+
+# Distinct restricted schemas kept; each valid field combination uses one entry
+MAX_CACHED_FIELDSETS = 256
+
+
+def get_fields():
+    """
+    Return the field names requested with ``?fields=``.
+
+    Returns:
+        tuple[str] | None: Field names in request order without duplicates,
+        or None if the parameter is absent.
+
+    Raises:
+        BadRequest: If the parameter names no field.
+    """
+    value = request.args.get("fields")
+    if value is None:
+        return None
+    names = tuple(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    if not names:
+        abort(400, description="fields must name at least one field")
+    return names
+
+
+def _exists(schema, path):
+    """Return True if a dotted field path (as a list of names) exists on ``schema``."""
+    field = schema.fields.get(path[0])
+    if field is None:
+        return False
+    if len(path) == 1:
+        return True
+    if isinstance(field, fields.List):
+        field = field.inner
+    if not isinstance(field, fields.Nested):
+        return False
+    return _exists(field.schema, path[1:])
+
+
+@functools.lru_cache(maxsize=MAX_CACHED_FIELDSETS)
+def _restricted(schema, names):
+    return type(schema)(only=names, many=schema.many)
+
+
+def sparse(schema):
+    """
+    Return ``schema`` restricted to the fields requested with ``?fields=``.
+
+    Args:
+        schema (Schema): Schema instance used by the endpoint.
+
+    Returns:
+        Schema: A cached schema instance with ``only=`` applied, or ``schema``
+        itself when no fields were requested.
+
+    Raises:
+        BadRequest: If a requested field does not exist on the schema.
+    """
+    names = get_fields()
+    if names is None:
+        return schema
+    unknown = [name for name in names if not _exists(schema, name.split("."))]
+    if unknown:
+        abort(400, description=f"Unknown fields: {', '.join(unknown)}")
+    try:
+        # Sorted so that the same set in a different order shares one instance
+        return _restricted(schema, tuple(sorted(names)))
+    except ValueError as e:
+        abort(400, description=str(e))
+
+
+def _columns(model, schema):
+    """Return the column attributes of ``model`` read when serializing with ``schema``."""
+    mapper = inspect(model)
+    names = []
+    for field_plan in get_serializer(schema).plan.fields:
+        attribute = field_plan.attribute
+        if attribute in mapper.column_attrs:
+            names.append(attribute)
+        elif attribute in mapper.relationships:
+            # Keep the foreign key a nested relationship is loaded by
+            for column in mapper.relationships[attribute].local_columns:
+                names.append(mapper.get_property_by_column(column).key)
+        else:
+            # A computed field may read any column; load the whole row
+            return None
+    return list(dict.fromkeys(names))
+
+
+def sparse_options(model, schema, *always):
+    """
+    Return the loader options projecting ``model`` to the columns ``schema`` reads.
+
+    Args:
+        model (db.Model): Model selected by the endpoint's query.
+        schema (Schema): The schema returned by ``sparse``.
+        *always: Column attributes the endpoint itself reads (e.g. a sort key
+            used to build the cursor).
+
+    Returns:
+        list: ``[load_only(...)]`` when fields were requested, otherwise ``[]``.
+    """
+    if get_fields() is None or get_serializer(schema).plan.passthrough:
+        return []
+    names = _columns(model, schema)
+    if names is None:
+        return []
+    # The primary key is always loaded anyway; naming it keeps load_only() non-empty
+    return [load_only(*(getattr(model, name) for name in names or ["id"]), *always)]
@@ -0,0 +1,194 @@
+"""
+Include Planner
+
+Turns an ``?include=`` spec such as ``manager,tenancies.tenants.support_workers``
+into the eager-loading options and the nested schema needed to return a
+whole object graph from one request:
+
+    - Many-to-one relationships (e.g. a property's manager) are loaded with
+      ``joinedload``: a LEFT OUTER JOIN on the query that loads the parent
+      rows, so they cost no extra query and never multiply rows.
+    - Collections (one-to-many and many-to-many) are loaded with
+      ``selectinload``: one ``SELECT ... WHERE parent_id IN (...)`` per
+      relationship for all parents at once.
+
+The number of queries is therefore 1 + the number of collections in the
+spec, whatever the number of rows (SQLAlchemy splits a ``selectinload`` IN
+list into chunks of 500 parents). ``IncludePlan.query_bound`` reports that
+number.
+
+The output schema is built from each model's basic schema with a Nested
+field per included relationship, under the name used in the spec. Plans
+(and their schemas) are cached per spec, so each distinct spec is only
+planned and compiled once.
+
+"""
+
+# Standard library imports
+import functools
+
+# Third-party imports
+from flask import abort, request
+from marshmallow import fields
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+
+# Application modules
+from models.property import Property
+from models.property_manager import PropertyManager
+from models.support_worker import SupportWorker
+from models.tenancy import Tenancy
+from models.tenant import Tenant
+from schemas.property_schema import PropertySchema
+from schemas.property_manager_schema import PropertyManagerSchema
+from schemas.support_worker_schema import SupportWorkerSchema
+from schemas.tenancy_schema import TenancySchema
+from schemas.tenant_schema import TenantSchema
+
+# Basic schema used for each model in a graph; relationships to other models cannot be included
+SCHEMAS = {
+    Property: PropertySchema,
+    PropertyManager: PropertyManagerSchema,
+    SupportWorker: SupportWorkerSchema,
+    Tenancy: TenancySchema,
+    Tenant: TenantSchema,
+}
+
+# Short names accepted in include specs
+ALIASES = {"manager": "property_manager"}
+
+MAX_INCLUDE_DEPTH = 4
+MAX_INCLUDE_PATHS = 10
+
+
+class IncludePlan:
+    """
+    Eager-loading options and output schema for one include spec.
+
+    Attributes:
+        model (db.Model): Root model.
+        tree (tuple): Normalized include tree, ``((name, subtree), ...)``.
+        options (list): Loader options to pass to ``select(model).options(...)``.
+        schema (Schema): Nested schema for the graph (pass ``many=True`` to
+            ``serialize`` for lists).
+        query_bound (int): Maximum number of queries per 500 root rows.
+    """
+
+    def __init__(self, model, tree):
+        self.model = model
+        self.tree = tree
+        self.options, self.query_bound = _loader_options(model, tree)
+        self.schema = _schema_class(model, tree)()
+
+
+def parse_include(spec):
+    """
+    Parse an include spec into a tree of relationship names.
+
+    ``"manager,tenancies.tenants,tenancies.property"`` becomes
+    ``{"manager": {}, "tenancies": {"tenants": {}, "property": {}}}``.
+
+    Raises:
+        ValueError: If the spec is too deep, too long or has empty names.
+    """
+    tree = {}
+    paths = [path.strip() for path in spec.split(",") if path.strip()]
+    if len(paths) > MAX_INCLUDE_PATHS:
+        raise ValueError(f"include accepts at most {MAX_INCLUDE_PATHS} paths")
+    for path in paths:
+        names = [name.strip() for name in path.split(".")]
+        if len(names) > MAX_INCLUDE_DEPTH:
+            raise ValueError(f"include paths are limited to {MAX_INCLUDE_DEPTH} levels")
+        if not all(names):
+            raise ValueError(f"invalid include path {path!r}")
+        node = tree
+        for name in names:
+            node = node.setdefault(name, {})
+    return tree
+
+
+def _freeze(tree):
+    """Return a hashable, order-independent form of an include tree."""
+    return tuple(sorted((name, _freeze(subtree)) for name, subtree in tree.items()))
+
+
+def _relationship(model, name):
+    """
+    Resolve an include name to a relationship of ``model``.
+
+    Raises:
+        ValueError: If ``name`` is not an includable relationship.
+    """
+    relationships = inspect(model).relationships
+    relationship = relationships.get(ALIASES.get(name, name))
+    if relationship is None or relationship.mapper.class_ not in SCHEMAS:
+        valid = sorted(
+            key for key, rel in relationships.items() if rel.mapper.class_ in SCHEMAS
+        )
+        raise ValueError(
+            f"{model.__name__} has no relationship {name!r}; valid: {', '.join(valid)}"
+        )
+    return relationship
+
+
+def _loader_options(model, tree):
+    """
+    Build the loader options for a tree and count the queries they issue.
+
+    Returns:
+        tuple[list, int]: Loader options and the query bound (1 for the
+        root query plus one per collection).
+    """
+    options, queries = [], 1
+    for name, subtree in tree:
+        relationship = _relationship(model, name)
+        attribute = getattr(model, relationship.key)
+        if relationship.uselist:
+            loader = selectinload(attribute)
+        else:
+            loader = joinedload(attribute)
+        child_options, child_queries = _loader_options(relationship.mapper.class_, subtree)
+        if child_options:
+            loader = loader.options(*child_options)
+        options.append(loader)
+        # A selectin load adds its own query; a joined load runs inside its parent's
+        queries += child_queries if relationship.uselist else child_queries - 1
+    return options, queries
+
+
+def _schema_class(model, tree):
+    """Build a schema class for ``model`` with a Nested field per included relationship."""
+    attributes = {}
+    for name, subtree in tree:
+        relationship = _relationship(model, name)
+        nested = _schema_class(relationship.mapper.class_, subtree)
+        attributes[name] = fields.Nested(
+            nested, many=relationship.uselist, attribute=relationship.key, data_key=name
+        )
+    if not attributes:
+        return SCHEMAS[model]
+    base = SCHEMAS[model]
+    return type(base.__name__.replace("Schema", "GraphSchema"), (base,), attributes)
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_plan(model, frozen_tree):
+    return IncludePlan(model, frozen_tree)
+
+
+def plan_include(model, spec):
+    """
+    Return the (cached) IncludePlan for an include spec on ``model``.
+
+    Raises:
+        ValueError: If the spec is malformed or names unknown relationships.
+    """
+    return _cached_plan(model, _freeze(parse_include(spec)))
+
+
+def get_include_plan(model):
+    """Return the IncludePlan for the request's ``?include=``, aborting with 400 if invalid."""
+    try:
+        return plan_include(model, request.args.get("include", ""))
+    except ValueError as e:
+        abort(400, description=str(e))
@@ -0,0 +1,218 @@
+"""
+Idempotency Keys
+
+Makes POST requests to the resource blueprints safe to retry. A client
+sends a unique ``Idempotency-Key`` header (e.g. a UUID) with a POST; the
+first request with that key runs normally and its response is stored in the
+``idempotency_key`` table. A retry with the same key and the same request
+is answered with the stored response (marked ``Idempotent-Replayed: true``)
+from a single primary key lookup, without running the handler or touching
+the domain tables, so a retried create cannot insert a duplicate row and a
+retried link cannot fail with "already linked".
+
+    - Same key, different method/path/query/body: ``422 Unprocessable Entity``.
+    - Same key while the first request is still running: ``409 Conflict``.
+    - Responses with a 5xx status are not stored; the key is released so the
+      request can be retried.
+
+The key is claimed with an INSERT into the table before the handler runs,
+so two concurrent requests with one key cannot both execute. A claim left
+without a response for IDEMPOTENCY_CLAIM_TIMEOUT seconds (the worker died
+between the claim and storing the response) is taken over by the next
+request with the key instead of answering 409 until the key expires; the
+takeover is a conditional UPDATE, so only one retry wins it. Keys are kept
+for IDEMPOTENCY_TTL seconds (default one day); expired rows are deleted at
+most once a minute per process. Requests without the header are unaffected.
+
+"""
+
+# Standard library imports
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+
+# Third-party imports
+from flask import Response, abort, g, request
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+# Seconds between deletions of expired keys, per process
+EVICTION_INTERVAL = 60
+
+
+def _model():
+    # Imported lazily: the model module imports extensions, which imports this module
+    from models.idempotency_key import IdempotencyKey
+    return IdempotencyKey
+
+
+def _engine():
+    from extensions import db
+    return db.engine
+
+
+def _utcnow():
+    """Current UTC time as a naive datetime (the column has no time zone)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class Idempotency:
+    """
+    Flask extension replaying the stored response of a retried POST.
+
+    Attributes:
+        enabled (bool): Honour Idempotency-Key headers at all (IDEMPOTENCY_ENABLED).
+        ttl (int): Seconds a key and its response are kept (IDEMPOTENCY_TTL).
+        claim_timeout (int): Seconds after which an unfinished claim can be
+            taken over (IDEMPOTENCY_CLAIM_TIMEOUT).
+    """
+
+    def __init__(self, app=None):
+        self.enabled = True
+        self.ttl = 86400
+        self.claim_timeout = 60
+        self._last_eviction = 0.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read settings from config and hook into the request cycle."""
+        self.enabled = app.config.get("IDEMPOTENCY_ENABLED", True)
+        self.ttl = app.config.get("IDEMPOTENCY_TTL", 86400)
+        self.claim_timeout = app.config.get("IDEMPOTENCY_CLAIM_TIMEOUT", 60)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.extensions["idempotency"] = self
+
+    @staticmethod
+    def fingerprint():
+        """Return the SHA-256 of the current request's method, path, query string and body."""
+        digest = hashlib.sha256(f"{request.method} {request.full_path}\n".encode())
+        digest.update(request.get_data(cache=True))
+        return digest.hexdigest()
+
+    # --------------------------------------------------------
+    # Storage
+    # --------------------------------------------------------
+    def _lookup(self, key, cutoff):
+        model = _model()
+        with _engine().connect() as conn:
+            return conn.execute(
+                select(model.fingerprint, model.status_code, model.body, model.mimetype, model.location)
+                .where(model.key == key, model.created_at >= cutoff)
+            ).first()
+
+    def _claim(self, key, fingerprint, now, cutoff):
+        """Insert an in-progress row for ``key``; return False if another request holds it."""
+        model = _model()
+        try:
+            with _engine().begin() as conn:
+                conn.execute(delete(model).where(model.key == key, model.created_at < cutoff))
+                conn.execute(insert(model).values(
+                    key=key, fingerprint=fingerprint, created_at=now, claimed_at=now
+                ))
+            return True
+        except IntegrityError:
+            return False
+
+    def _take_over(self, key, now):
+        """Claim ``key`` if its holder left it unfinished for claim_timeout seconds."""
+        model = _model()
+        stale = now - timedelta(seconds=self.claim_timeout)
+        with _engine().begin() as conn:
+            result = conn.execute(update(model).where(
+                model.key == key,
+                model.status_code.is_(None),
+                # Rows claimed before the column existed only have created_at
+                func.coalesce(model.claimed_at, model.created_at) < stale
+            ).values(claimed_at=now))
+        return result.rowcount == 1
+
+    def _store(self, key, claimed_at, response):
+        model = _model()
+        with _engine().begin() as conn:
+            # Matches nothing if the claim was taken over meanwhile
+            conn.execute(update(model).where(model.key == key, model.claimed_at == claimed_at).values(
+                status_code=response.status_code,
+                body=response.get_data(),
+                mimetype=response.mimetype,
+                location=response.headers.get("Location"),
+            ))
+
+    def _release(self, key, claimed_at):
+        model = _model()
+        with _engine().begin() as conn:
+            conn.execute(delete(model).where(
+                model.key == key, model.claimed_at == claimed_at, model.status_code.is_(None)
+            ))
+
+    def _evict(self, cutoff):
+        """Delete expired keys, at most once every EVICTION_INTERVAL seconds."""
+        if time.monotonic() - self._last_eviction < EVICTION_INTERVAL:
+            return
+        self._last_eviction = time.monotonic()
+        model = _model()
+        with _engine().begin() as conn:
+            conn.execute(delete(model).where(model.created_at < cutoff))
+
+    # --------------------------------------------------------
+    # Request cycle
+    # --------------------------------------------------------
+    def _replay(self, record, fingerprint):
+        if record.fingerprint != fingerprint:
+            abort(422, description=f"{HEADER} was already used with a different request")
+        if record.status_code is None:
+            abort(409, description=f"A request with this {HEADER} is still in progress")
+        response = Response(record.body, status=record.status_code, mimetype=record.mimetype)
+        if record.location:
+            response.headers["Location"] = record.location
+        response.headers["Idempotent-Replayed"] = "true"
+        return response
+
+    def _before_request(self):
+        key = request.headers.get(HEADER)
+        if not self.enabled or key is None or request.method != "POST" or request.blueprint is None:
+            return None
+        if not key or len(key) > MAX_KEY_LENGTH:
+            abort(400, description=f"{HEADER} must be 1 to {MAX_KEY_LENGTH} characters")
+
+        fingerprint = self.fingerprint()
+        now = _utcnow()
+        cutoff = now - timedelta(seconds=self.ttl)
+        record = self._lookup(key, cutoff)
+        if record is None:
+            self._evict(cutoff)
+            if self._claim(key, fingerprint, now, cutoff):
+                g.idempotency_claim = (key, now)
+                return None
+            # Claimed by a concurrent request between the lookup and the insert
+            record = self._lookup(key, cutoff)
+            if record is None:
+                abort(409, description=f"A request with this {HEADER} is still in progress")
+        elif (
+            record.status_code is None and record.fingerprint == fingerprint
+            and self._take_over(key, now)
+        ):
+            g.idempotency_claim = (key, now)
+            return None
+        return self._replay(record, fingerprint)
+
+    def _after_request(self, response):
+        claim = g.pop("idempotency_claim", None)
+        if claim is not None:
+            # Runs before compression (registered later), so the stored body is uncompressed
+            if response.status_code >= 500 or response.is_streamed:
+                self._release(*claim)
+            else:
+                self._store(*claim, response)
+        return response
+
+    def _teardown_request(self, exc):
+        # The handler raised past the error handlers; let the client retry
+        claim = g.pop("idempotency_claim", None)
+        if claim is not None:
+            self._release(*claim)
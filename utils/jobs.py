@@ -0,0 +1,143 @@
+"""
+Background Jobs
+
+Runs long operations (e.g. bulk purges) in a thread pool so the request
+that starts them can answer ``202 Accepted`` straight away. The client
+polls ``GET /jobs/<job_id>`` for the status and, once finished, the result.
+
+Jobs run inside an application context of their own, with their own
+database session. Jobs and their results are kept in process memory for
+JOB_RESULT_TTL seconds after they finish: with several gunicorn workers a
+job is only visible on the worker that started it, so poll through the
+same worker (sticky sessions) or run a single worker for admin traffic.
+
+"""
+
+# Standard library imports
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+
+class Job:
+    """
+    One background job.
+
+    Attributes:
+        id (str): Random job id.
+        name (str): Short description, e.g. "purge tenant".
+        status (str): "queued", "running", "succeeded" or "failed".
+        result: Return value of the job function once it succeeded.
+        error (str | None): Error message if it failed.
+        created_at (datetime): When the job was submitted.
+        finished_at (datetime | None): When it succeeded or failed.
+    """
+
+    def __init__(self, name):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.created_at = datetime.now(timezone.utc)
+        self.finished_at = None
+        # Monotonic finish time used for expiry
+        self.expires_from = None
+
+    def to_dict(self):
+        """Return the job as a JSON-serializable dict."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class JobRunner:
+    """
+    Flask extension running jobs in a per-process thread pool.
+
+    Attributes:
+        max_workers (int): Jobs run at the same time (JOB_WORKERS).
+        result_ttl (int): Seconds finished jobs are kept (JOB_RESULT_TTL).
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.max_workers = 1
+        self.result_ttl = 3600
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read settings from config."""
+        self.app = app
+        self.max_workers = app.config.get("JOB_WORKERS", 1)
+        self.result_ttl = app.config.get("JOB_RESULT_TTL", 3600)
+        app.extensions["jobs"] = self
+
+    def _pool(self):
+        # Created on first use in each process: threads do not survive a fork
+        if self._executor is None or self._pid != os.getpid():
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="job")
+            self._pid = os.getpid()
+        return self._executor
+
+    def submit(self, name, function, *args):
+        """
+        Queue ``function(*args)`` as a background job.
+
+        Args:
+            name (str): Short description of the job.
+            function (Callable): Runs inside an application context; its
+                return value (JSON-serializable) becomes the job's result.
+
+        Returns:
+            Job: The queued job.
+        """
+        job = Job(name)
+        with self._lock:
+            self._evict()
+            self._jobs[job.id] = job
+        self._pool().submit(self._run, job, function, args)
+        return job
+
+    def get(self, job_id):
+        """Return the job with ``job_id``, or None if unknown or expired."""
+        with self._lock:
+            self._evict()
+            return self._jobs.get(job_id)
+
+    def _run(self, job, function, args):
+        job.status = "running"
+        try:
+            with self.app.app_context():
+                job.result = function(*args)
+            job.status = "succeeded"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+            self.app.logger.exception("Job %s (%s) failed", job.id, job.name)
+        job.finished_at = datetime.now(timezone.utc)
+        job.expires_from = time.monotonic()
+
+    def _evict(self):
+        """Drop finished jobs older than ``result_ttl`` (caller holds the lock)."""
+        cutoff = time.monotonic() - self.result_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.expires_from is not None and job.expires_from < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
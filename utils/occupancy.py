@@ -0,0 +1,252 @@
+"""
+Property Occupancy
+
+Maintains the ``property_occupancy`` read model: one row per occupied
+property with its current tenancy and that tenancy's tenants (id and name),
+so ``GET /properties/<id>/occupancy`` is a single primary key lookup instead
+of a walk over ``Property.tenancies`` and ``Tenancy.tenants``.
+
+A property is occupied when it has a "Tenanted" tenancy that is current
+(started on or before today and not ended before today), as on the
+dashboard; if several are, the one that started last wins.
+
+Rows are recomputed incrementally, in the same transaction as the change:
+
+    - ``affected_properties(model, ids)`` finds the properties whose
+      occupancy a change to tenancies or tenants can alter (including the
+      property a tenancy moved away from, and the property of a deleted
+      tenancy, through the read model's own ``tenancy_id``).
+    - ``refresh_occupancy(property_ids)`` recomputes their rows with a few
+      set-based statements.
+
+Deleting a property removes its row through ``ON DELETE CASCADE``.
+Occupancy also changes with the calendar (a tenancy reaching its end_date
+or start_date); ``occupied`` is evaluated against today when reading, and
+``flask db refresh-occupancy`` (e.g. nightly from cron) rebuilds every row.
+
+"""
+
+# Standard library imports
+import datetime
+
+# Third-party imports
+from flask import abort, request
+from sqlalchemy import and_, case, delete, insert, or_, select, union
+
+# Application modules
+from extensions import db
+from utils.bulk import bulk_purge
+from utils.dashboard import OCCUPIED_STATUS
+from utils.pagination import get_page_args
+from models.property import Property
+from models.property_occupancy import PropertyOccupancy
+from models.tenancy import Tenancy
+from models.tenant import Tenant
+from models.tenant_tenancy import TenantTenancy
+
+# Properties recomputed per statement by refresh_occupancy and rebuild_occupancy
+REFRESH_BATCH = 1000
+
+
+def affected_properties(model, ids):
+    """
+    Return the properties whose occupancy a change to rows of ``model`` can alter.
+
+    Call it after an update or delete of tenancies (it also finds the
+    property whose row still points at a changed or deleted tenancy), and
+    before a delete of tenants (their links are deleted with them).
+
+    Args:
+        model (db.Model): Tenancy or Tenant.
+        ids (Iterable[int]): Primary keys of the changed rows.
+
+    Returns:
+        set[int]: Property ids.
+    """
+    ids = list(ids)
+    if not ids:
+        return set()
+    if model is Tenancy:
+        stmt = union(
+            select(Tenancy.property_id).where(Tenancy.id.in_(ids)),
+            select(PropertyOccupancy.property_id).where(PropertyOccupancy.tenancy_id.in_(ids)),
+        )
+    elif model is Tenant:
+        stmt = (
+            select(PropertyOccupancy.property_id)
+            .join(TenantTenancy, TenantTenancy.tenancy_id == PropertyOccupancy.tenancy_id)
+            .where(TenantTenancy.tenant_id.in_(ids))
+        )
+    else:
+        raise ValueError(f"Occupancy does not depend on {model.__name__}")
+    return set(db.session.scalars(stmt))
+
+
+def _current_tenancies(property_ids, today):
+    """Return the current tenancy of each occupied property among ``property_ids``."""
+    rows = db.session.execute(
+        select(Tenancy.id, Tenancy.property_id, Tenancy.start_date, Tenancy.end_date)
+        .where(
+            Tenancy.property_id.in_(property_ids),
+            Tenancy.tenancy_status == OCCUPIED_STATUS,
+            Tenancy.start_date <= today,
+            or_(Tenancy.end_date.is_(None), Tenancy.end_date >= today),
+        )
+        .order_by(Tenancy.property_id, Tenancy.start_date.desc(), Tenancy.id.desc())
+    ).all()
+    current = {}
+    for row in rows:
+        current.setdefault(row.property_id, row)
+    return current
+
+
+def _tenants(tenancy_ids):
+    """Return the tenants ({"id", "name"}) of each tenancy, in link rank order."""
+    tenants = {tenancy_id: [] for tenancy_id in tenancy_ids}
+    if tenancy_ids:
+        rows = db.session.execute(
+            select(TenantTenancy.tenancy_id, Tenant.id, Tenant.name)
+            .join(Tenant, Tenant.id == TenantTenancy.tenant_id)
+            .where(TenantTenancy.tenancy_id.in_(tenancy_ids))
+            .order_by(TenantTenancy.tenancy_id, TenantTenancy.rank.nulls_last(), TenantTenancy.id)
+        ).all()
+        for tenancy_id, tenant_id, name in rows:
+            tenants[tenancy_id].append({"id": tenant_id, "name": name})
+    return tenants
+
+
+def refresh_occupancy(property_ids):
+    """
+    Recompute the occupancy rows of ``property_ids`` in the current transaction.
+
+    Pending changes are flushed first, so call it after making them and
+    before committing.
+
+    Args:
+        property_ids (Iterable[int]): Properties to recompute (None is ignored).
+    """
+    property_ids = sorted({property_id for property_id in property_ids if property_id is not None})
+    today = datetime.date.today()
+    for start in range(0, len(property_ids), REFRESH_BATCH):
+        batch = property_ids[start:start + REFRESH_BATCH]
+        current = _current_tenancies(batch, today)
+        tenants = _tenants([tenancy.id for tenancy in current.values()])
+        db.session.execute(
+            delete(PropertyOccupancy)
+            .where(PropertyOccupancy.property_id.in_(batch))
+            .execution_options(synchronize_session=False)
+        )
+        if current:
+            db.session.execute(insert(PropertyOccupancy), [
+                {
+                    "property_id": property_id,
+                    "tenancy_id": tenancy.id,
+                    "start_date": tenancy.start_date,
+                    "end_date": tenancy.end_date,
+                    "tenants": tenants[tenancy.id],
+                }
+                for property_id, tenancy in current.items()
+            ])
+
+
+def purge_with_occupancy(model, ids):
+    """
+    Purge tenancies or tenants (see utils.bulk.bulk_purge) and refresh the
+    occupancy of the properties they affected, in the same transaction.
+    """
+    property_ids = affected_properties(model, ids)
+    return bulk_purge(model, ids, before_commit=lambda _: refresh_occupancy(property_ids))
+
+
+def rebuild_occupancy():
+    """
+    Recompute the occupancy of every property and commit.
+
+    Returns:
+        int: Number of occupied properties.
+    """
+    db.session.execute(delete(PropertyOccupancy).execution_options(synchronize_session=False))
+    last_id = 0
+    while True:
+        property_ids = db.session.scalars(
+            select(Property.id).where(Property.id > last_id).order_by(Property.id).limit(REFRESH_BATCH)
+        ).all()
+        if not property_ids:
+            break
+        refresh_occupancy(property_ids)
+        last_id = property_ids[-1]
+    occupied = db.session.scalar(select(db.func.count()).select_from(PropertyOccupancy))
+    db.session.commit()
+    return occupied
+
+
+def _occupancy_select():
+    """SELECT of every property left joined to its occupancy row, with ``occupied`` as of today."""
+    today = datetime.date.today()
+    occupied = and_(
+        PropertyOccupancy.property_id.is_not(None),
+        or_(PropertyOccupancy.end_date.is_(None), PropertyOccupancy.end_date >= today),
+    )
+    return select(
+        Property.id.label("property_id"),
+        case((occupied, True), else_=False).label("occupied"),
+        PropertyOccupancy.tenancy_id,
+        PropertyOccupancy.start_date,
+        PropertyOccupancy.end_date,
+        PropertyOccupancy.tenants,
+    ).outerjoin(PropertyOccupancy, PropertyOccupancy.property_id == Property.id), occupied
+
+
+def get_occupancy(property_id):
+    """
+    Return the occupancy of one property with a single primary key lookup.
+
+    Returns:
+        Row | None: The occupancy row (vacant properties have ``occupied``
+        False and null tenancy fields), or None if the property does not exist.
+    """
+    stmt, _ = _occupancy_select()
+    return db.session.execute(stmt.where(Property.id == property_id)).first()
+
+
+def get_occupied_arg():
+    """
+    Read the optional ``occupied`` query parameter.
+
+    Returns:
+        bool | None: True or False to filter by occupancy, None for every property.
+
+    Raises:
+        BadRequest: If the value is not true or false.
+    """
+    value = request.args.get("occupied")
+    if value is None:
+        return None
+    value = value.lower()
+    if value not in ("1", "true", "0", "false"):
+        abort(400, description="occupied must be true or false")
+    return value in ("1", "true")
+
+
+def occupancy_page():
+    """
+    Return a keyset paginated page of property occupancies, ordered by
+    property id (?limit=&after=), optionally only occupied or vacant ones
+    (?occupied=true|false).
+
+    Returns:
+        tuple[list[Row], int | None]: The rows for this page and the cursor
+        for the next page.
+    """
+    limit, after = get_page_args()
+    occupied = get_occupied_arg()
+    stmt, condition = _occupancy_select()
+    if occupied is not None:
+        stmt = stmt.where(condition if occupied else ~condition)
+    if after is not None:
+        stmt = stmt.where(Property.id > after)
+    rows = db.session.execute(stmt.order_by(Property.id).limit(limit + 1)).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1].property_id
+    return rows, None
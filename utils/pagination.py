@@ -0,0 +1,160 @@
+"""
+Keyset Pagination
+
+Provides cursor based pagination for collection endpoints. Pages are
+selected with ``WHERE id > :after ORDER BY id LIMIT :limit`` on the primary
+key, so the database can seek straight to the start of a page through the
+primary key index. Unlike OFFSET pagination, the cost of a page does not
+grow with how deep the client has paged.
+
+Query parameters:
+    limit (int): Number of rows to return (defaults to PAGINATION_DEFAULT_LIMIT,
+        capped at PAGINATION_MAX_LIMIT).
+    after (int): Cursor returned as ``next_cursor`` by the previous page.
+
+"""
+
+# Standard library imports
+import base64
+import binascii
+import json
+
+from flask import current_app, request, abort
+
+# Application module
+from extensions import db
+
+
+def is_ascii_integer(value):
+    """
+    Return whether ``value`` is a plain ASCII run of digits.
+
+    ``str.isdigit`` also accepts characters such as "²" or "١" that ``int``
+    rejects, and ``int`` accepts signs, spaces and underscores.
+    """
+    return value.isascii() and value.isdecimal()
+
+
+def get_limit(limit=None):
+    """
+    Return the page size, defaulting and capping it from config.
+
+    Args:
+        limit (int, optional): Already validated page size; read from the
+            ``limit`` query parameter if omitted.
+
+    Raises:
+        BadRequest: If the ``limit`` query parameter is not a positive integer.
+    """
+    default_limit = current_app.config.get("PAGINATION_DEFAULT_LIMIT", 50)
+    max_limit = current_app.config.get("PAGINATION_MAX_LIMIT", 500)
+
+    if limit is None:
+        limit = request.args.get("limit")
+        if limit is None:
+            limit = default_limit
+        elif not is_ascii_integer(limit) or int(limit) < 1:
+            abort(400, description="limit must be a positive integer")
+        else:
+            limit = int(limit)
+    return min(limit, max_limit)
+
+
+def get_page_args():
+    """
+    Read and validate the ``limit`` and ``after`` query parameters.
+
+    Returns:
+        tuple[int, int | None]: The page size and the cursor (or None for the first page).
+
+    Raises:
+        BadRequest: If either parameter is not a valid positive integer.
+    """
+    limit = get_limit()
+
+    after = request.args.get("after")
+    if after is not None:
+        if not is_ascii_integer(after):
+            abort(400, description="after must be a valid cursor")
+        after = int(after)
+
+    return limit, after
+
+
+def paginate(stmt, model):
+    """
+    Apply keyset pagination to a select statement and execute it.
+
+    One extra row is fetched to detect whether another page exists, so no
+    separate COUNT query is needed.
+
+    Args:
+        stmt (Select): Statement selecting ``model`` entities (options such as
+            ``selectinload`` are preserved).
+        model (db.Model): Model whose ``id`` column is used as the cursor.
+
+    Returns:
+        tuple[list, int | None]: The rows for this page and the cursor for the
+        next page (None when this is the last page).
+    """
+    limit, after = get_page_args()
+
+    if after is not None:
+        stmt = stmt.where(model.id > after)
+    stmt = stmt.order_by(model.id).limit(limit + 1)
+
+    rows = db.session.scalars(stmt).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1].id
+    return rows, None
+
+
+def encode_cursor(values):
+    """
+    Encode the sort values of the last row of a page as an opaque cursor.
+
+    Used by endpoints ordered by more than the primary key, where the cursor
+    must carry every sort value (e.g. ``[rank, id]``).
+
+    Args:
+        values (list): JSON-serializable sort values.
+
+    Returns:
+        str: A url-safe token for the ``after`` query parameter.
+    """
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Returns:
+        list: The encoded sort values.
+
+    Raises:
+        BadRequest: If the cursor is malformed.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        values = None
+    if not isinstance(values, list):
+        abort(400, description="after must be a valid cursor")
+    return values
+
+
+def page_response(data, next_cursor):
+    """
+    Build the JSON body for a page of results.
+
+    Args:
+        data (list[dict]): Serialized rows for this page.
+        next_cursor (int | None): Cursor for the next page.
+
+    Returns:
+        dict: ``{"data": [...], "next_cursor": ...}``
+    """
+    return {"data": data, "next_cursor": next_cursor}
@@ -0,0 +1,135 @@
+"""
+Connection Pool Management
+
+Helpers for running the API under a pre-forking server (gunicorn) against a
+PostgreSQL server that drops idle connections (e.g. serverless Postgres):
+
+    - InstrumentedQueuePool: QueuePool that records how long requests wait
+      to check out a connection, so pool exhaustion shows up in metrics.
+    - dispose_after_fork: Makes each forked worker start with an empty pool
+      instead of sharing the parent's sockets.
+    - pool_stats: Pool figures for GET /metrics/pool.
+
+The pool itself is configured through ``SQLALCHEMY_ENGINE_OPTIONS`` in
+``config.py``.
+
+"""
+
+# Standard library imports
+import os
+import threading
+import time
+import weakref
+
+# Third-party imports
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool recording checkout wait times.
+
+    The wait covers everything between asking for a connection and getting
+    one: blocking on an exhausted pool and opening a new connection.
+
+    Attributes:
+        checkouts (int): Number of connections handed out.
+        timeouts (int): Checkouts that failed after ``pool_timeout``.
+        total_wait (float): Sum of checkout waits in seconds.
+        max_wait (float): Longest checkout wait in seconds.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        waited = time.perf_counter() - started
+        with self._stats_lock:
+            self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+        return connection
+
+    def recreate(self):
+        # dispose() replaces the pool with a recreated one; carry the counters over
+        pool = super().recreate()
+        with self._stats_lock:
+            pool.checkouts, pool.timeouts = self.checkouts, self.timeouts
+            pool.total_wait, pool.max_wait = self.total_wait, self.max_wait
+        return pool
+
+
+_fork_engines = weakref.WeakSet()
+_fork_lock = threading.Lock()
+_fork_registered = False
+
+
+def _dispose_in_child():
+    """Drop the pooled connections inherited from the parent process."""
+    for engine in list(_fork_engines):
+        # close=False: the sockets belong to the parent, only forget them here
+        engine.dispose(close=False)
+
+
+def dispose_after_fork(engines):
+    """
+    Reset the given engines' pools in every child process after a fork.
+
+    Gunicorn forks its workers from the master; without this a connection
+    opened in the master (e.g. with ``--preload``) would be shared by all
+    workers, corrupting the protocol stream.
+
+    Args:
+        engines (Iterable[Engine]): Engines to reset.
+    """
+    global _fork_registered
+    with _fork_lock:
+        _fork_engines.update(engines)
+        if not _fork_registered and hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=_dispose_in_child)
+            _fork_registered = True
+
+
+def pool_stats(engine):
+    """
+    Return the current state of an engine's connection pool.
+
+    Args:
+        engine (Engine): Engine whose pool is reported.
+
+    Returns:
+        dict: Pool class, size, checked in/out and overflow connections, and
+        checkout wait figures when the pool is an InstrumentedQueuePool.
+    """
+    pool = engine.pool
+    stats = {"pool": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+        })
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update({
+            "checkouts": pool.checkouts,
+            "timeouts": pool.timeouts,
+            "avg_wait_ms": round(pool.total_wait / pool.checkouts * 1000, 3) if pool.checkouts else None,
+            "max_wait_ms": round(pool.max_wait * 1000, 3),
+        })
+    return stats
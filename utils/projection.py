@@ -0,0 +1,189 @@
+"""
+Column-Projected Reads
+
+Nested list endpoints only emit a handful of columns (e.g. ``only=["id", "name"]``
+on nested tenants) but loading them through the ORM hydrates full entities
+and identity-map entries for every row. This module derives the columns a
+schema needs from its compiled serializer plan and issues plain row queries,
+e.g. ``select(Tenant.id, Tenant.name)``, one per nesting level. Rows are
+assembled into lightweight records in the shape the schema expects, without
+instantiating any models.
+
+Supported relationships are many-to-one, one-to-many and many-to-many
+through a secondary table, each joined on a single column.
+
+"""
+
+# Standard library imports
+from types import SimpleNamespace
+
+# Third-party imports
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import RelationshipDirection
+
+# Application modules
+from extensions import db
+from utils.pagination import get_page_args
+from utils.serializers import get_serializer
+
+# Label used for the parent key column selected alongside child rows
+PARENT_KEY = "_parent_key"
+
+
+def _split_plan(model, plan):
+    """
+    Split a serializer plan into column attributes and nested relationships.
+
+    Args:
+        model (db.Model): Model the plan serializes.
+        plan (SerializerPlan): Compiled plan for the schema.
+
+    Returns:
+        tuple[list[str], list[tuple[str, Relationship, SerializerPlan]]]
+
+    Raises:
+        ValueError: If a field maps to neither a column nor a relationship.
+    """
+    mapper = inspect(model)
+    if plan.passthrough:
+        raise ValueError(f"{type(plan.schema).__name__} cannot be projected")
+
+    columns, relationships = [], []
+    for field_plan in plan.fields:
+        attribute = field_plan.attribute
+        if attribute in mapper.column_attrs:
+            columns.append(attribute)
+        elif field_plan.kind == "nested" and attribute in mapper.relationships:
+            relationships.append((attribute, mapper.relationships[attribute], field_plan.nested))
+        else:
+            raise ValueError(
+                f"{type(plan.schema).__name__}.{field_plan.key} cannot be projected to a column"
+            )
+    return columns, relationships
+
+
+def _single_pair(pairs, relationship):
+    """Return the only (local, remote) column pair of a relationship join."""
+    if len(pairs) != 1:
+        raise ValueError(f"{relationship} joins on more than one column")
+    return pairs[0]
+
+
+def _parent_key_column(relationship):
+    """Return the column on the parent table whose values identify its children."""
+    if relationship.secondary is not None:
+        local, _ = _single_pair(relationship.synchronize_pairs, relationship)
+    else:
+        local, _ = _single_pair(relationship.local_remote_pairs, relationship)
+    return local
+
+
+def _load_children(relationship, plan, parent_keys):
+    """
+    Load the records of one relationship for a set of parent keys.
+
+    Args:
+        relationship (Relationship): Relationship being loaded.
+        plan (SerializerPlan): Plan of the nested schema.
+        parent_keys (set): Values of the parent's key column.
+
+    Returns:
+        dict: Parent key -> record (many-to-one) or list of records.
+    """
+    target = relationship.mapper.class_
+    columns, nested = _split_plan(target, plan)
+
+    if relationship.secondary is not None:
+        _, key_column = _single_pair(relationship.synchronize_pairs, relationship)
+        # Keep link order, matching what the ORM collection would contain
+        order_by = list(relationship.secondary.primary_key.columns)
+        stmt = (
+            select(key_column.label(PARENT_KEY))
+            .select_from(target)
+            .join(relationship.secondary, relationship.secondaryjoin)
+        )
+    else:
+        _, key_column = _single_pair(relationship.local_remote_pairs, relationship)
+        order_by = [target.id]
+        stmt = select(key_column.label(PARENT_KEY))
+
+    stmt = stmt.add_columns(*_projected_columns(target, columns, nested))
+    stmt = stmt.where(key_column.in_(parent_keys)).order_by(key_column, *order_by)
+    records = _assemble(db.session.execute(stmt).all(), columns, nested)
+
+    if relationship.direction is RelationshipDirection.MANYTOONE:
+        return {record.__dict__.pop(PARENT_KEY): record for record in records}
+    grouped = {}
+    for record in records:
+        grouped.setdefault(record.__dict__.pop(PARENT_KEY), []).append(record)
+    return grouped
+
+
+def _projected_columns(model, columns, relationships):
+    """Return the labelled columns to select for a model, including relationship keys."""
+    selected = [getattr(model, name).label(name) for name in columns]
+    for name, relationship, _ in relationships:
+        key_column = _parent_key_column(relationship)
+        selected.append(key_column.label(f"_{name}_key"))
+    return selected
+
+
+def _assemble(rows, columns, relationships):
+    """
+    Turn result rows into records and attach their nested relationships.
+
+    Args:
+        rows (list[Row]): Rows from a projected select.
+        columns (list[str]): Column attributes selected for the model.
+        relationships (list[tuple]): Relationships to load for these rows.
+
+    Returns:
+        list[SimpleNamespace]: Records with the attributes the schema reads.
+    """
+    records = [SimpleNamespace(**row._asdict()) for row in rows]
+    for name, relationship, plan in relationships:
+        key_name = f"_{name}_key"
+        keys = {getattr(record, key_name) for record in records}
+        keys.discard(None)
+        children = _load_children(relationship, plan, keys) if keys else {}
+        many = relationship.uselist
+        for record in records:
+            key = record.__dict__.pop(key_name)
+            setattr(record, name, children.get(key, [] if many else None))
+    return records
+
+
+def paginate_projected(model, schema):
+    """
+    Return a keyset paginated page of records projected from a schema.
+
+    Equivalent to ``paginate(select(model).options(selectinload(...)), model)``
+    for the fields ``schema`` dumps, but without constructing ORM entities.
+
+    Args:
+        model (db.Model): Model at the root of the schema.
+        schema (Schema): Schema describing the output (its compiled plan is reused).
+
+    Returns:
+        tuple[list[SimpleNamespace], int | None]: The records for this page and
+        the cursor for the next page.
+    """
+    plan = get_serializer(schema).plan
+    columns, relationships = _split_plan(model, plan)
+    limit, after = get_page_args()
+
+    stmt = select(model.id.label(PARENT_KEY), *_projected_columns(model, columns, relationships))
+    if after is not None:
+        stmt = stmt.where(model.id > after)
+    stmt = stmt.order_by(model.id).limit(limit + 1)
+
+    rows = db.session.execute(stmt).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1]._mapping[PARENT_KEY]
+
+    records = _assemble(rows, columns, relationships)
+    for record in records:
+        del record.__dict__[PARENT_KEY]
+    return records, next_cursor
@@ -0,0 +1,203 @@
+"""
+Query Instrumentation
+
+Counts the SQL statements each request runs, on the primary and on the read
+replicas, using SQLAlchemy's ``before_cursor_execute``/``after_cursor_execute``
+engine events:
+
+    - Server-Timing: every response gets a header such as
+      ``Server-Timing: db;dur=3.2;desc="4 queries"`` so query count and
+      database time show up in browser dev tools and load test reports.
+    - N+1 detection: a relationship lazy loaded QUERY_REPEAT_THRESHOLD or
+      more times in one request (e.g. a nested schema reading
+      ``Property.property_manager`` for every row because the route did not
+      eager load it) is logged with the relationship's name. Any other
+      statement repeated that often is logged with its SQL.
+    - Query budgets: ``@query_monitor.budget(n)`` declares the number of
+      queries a view may run, counted from the start of the view (so the
+      table version read of the response cache and ETags is not part of
+      it). A view exceeding it is logged, or fails with
+      QueryBudgetExceeded when QUERY_BUDGET_ENFORCE is set (the default in
+      TestingConfig), so a missing eager load fails the test suite instead
+      of slowing production down.
+
+Statements run outside a request (CLI commands, the ASGI native routes) are
+not counted. Rows streamed after the view returns are not counted either.
+
+"""
+
+# Standard library imports
+import functools
+import logging
+import time
+from collections import Counter
+
+# Third-party imports
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a view runs more queries than its declared budget (enforced mode)."""
+
+
+class RequestQueries:
+    """
+    The statements run by one request.
+
+    Attributes:
+        count (int): Number of statements executed.
+        duration (float): Total database time in seconds.
+        statements (Counter): Executions per SQL string (statement shape;
+            parameters are bound separately, so repeated shapes differ only
+            in their values).
+        lazy_loads (dict): SQL string -> relationship ("Model.attribute")
+            whose lazy load emitted it.
+        budget (int | None): Query budget declared by the view.
+        budget_start (int): Statements run before the budget was declared.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+        self.lazy_loads = {}
+        self.budget = None
+        self.budget_start = 0
+        # Relationship whose lazy load is about to execute
+        self.loading = None
+
+
+class QueryMonitor:
+    """
+    Flask extension collecting per-request query statistics.
+
+    Attributes:
+        repeat_threshold (int): Repetitions of one statement or lazy load
+            reported as an N+1 pattern.
+        enforce (bool): Raise QueryBudgetExceeded instead of logging.
+        server_timing (bool): Add the Server-Timing header.
+    """
+
+    def __init__(self, app=None):
+        self.repeat_threshold = 5
+        self.enforce = False
+        self.server_timing = True
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read settings from config and hook into the request cycle."""
+        self.repeat_threshold = app.config.get("QUERY_REPEAT_THRESHOLD", 5)
+        self.enforce = app.config.get("QUERY_BUDGET_ENFORCE", False)
+        self.server_timing = app.config.get("SERVER_TIMING", True)
+        app.after_request(self._after_request)
+        app.extensions["query_monitor"] = self
+
+    @staticmethod
+    def current():
+        """Return the RequestQueries of the current request, or None outside one."""
+        if not has_request_context():
+            return None
+        if "_queries" not in g:
+            g._queries = RequestQueries()
+        return g._queries
+
+    def budget(self, max_queries):
+        """
+        Decorator declaring the maximum number of queries a view may run.
+
+        Place it directly above the view function, below ``cache.cached``, so
+        cache hits (which run no queries) are not checked.
+
+        Args:
+            max_queries (int): Allowed number of statements.
+        """
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                self.expect(max_queries)
+                return view(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def expect(self, max_queries):
+        """Set the query budget of the current request (for budgets known only at runtime)."""
+        queries = self.current()
+        if queries is not None:
+            queries.budget = max_queries
+            queries.budget_start = queries.count
+
+    def _after_request(self, response):
+        queries = self.current()
+        if self.server_timing:
+            noun = "query" if queries.count == 1 else "queries"
+            response.headers.add(
+                "Server-Timing",
+                f'db;dur={queries.duration * 1000:.1f};desc="{queries.count} {noun}"'
+            )
+        self._report_repeats(queries)
+        spent = queries.count - queries.budget_start
+        if queries.budget is not None and spent > queries.budget:
+            message = (
+                f"{request.method} {request.path} ran {spent} queries, "
+                f"budget is {queries.budget}"
+            )
+            if self.enforce:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+    def _report_repeats(self, queries):
+        """Log the statements run repeatedly in this request, naming lazy loaded relationships."""
+        for statement, times in queries.statements.items():
+            if times < self.repeat_threshold:
+                continue
+            relationship = queries.lazy_loads.get(statement)
+            if relationship is not None:
+                logger.warning(
+                    "N+1 query in %s %s: %s lazy loaded %d times; eager load it with "
+                    "selectinload/joinedload", request.method, request.path, relationship, times
+                )
+            else:
+                logger.warning(
+                    "Statement repeated %d times in %s %s: %s",
+                    times, request.method, request.path, " ".join(statement.split())
+                )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    queries = QueryMonitor.current()
+    queries.count += 1
+    queries.duration += time.perf_counter() - started
+    queries.statements[statement] += 1
+    if queries.loading is not None:
+        queries.lazy_loads[statement] = queries.loading
+        queries.loading = None
+
+
+def _do_orm_execute(orm_execute_state):
+    # Lazy loads carry the instance they load for; eager (selectin) loads do not
+    if not orm_execute_state.is_select or not has_request_context():
+        return
+    if orm_execute_state.lazy_loaded_from is None:
+        return
+    relationship = orm_execute_state.loader_strategy_path[-1]
+    QueryMonitor.current().loading = f"{relationship.parent.class_.__name__}.{relationship.key}"
+
+
+event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+event.listen(Session, "do_orm_execute", _do_orm_execute)
@@ -0,0 +1,243 @@
+"""
+Read Replica Routing
+
+Sends the queries of GET/HEAD requests to read replicas listed in
+DATABASE_REPLICA_URLS, round-robin, while everything else stays on the
+primary DATABASE_URL:
+
+    - RoutingSession: Session class used by ``db.session``; its ``get_bind``
+      picks a replica for reads and the primary otherwise.
+    - ReplicaRouter: Flask extension owning the replica engines and their
+      health.
+
+A request is pinned to the primary as soon as its session writes (a flush
+or an INSERT/UPDATE/DELETE statement), so it reads its own writes.
+
+A replica that fails with a connection error is taken out of rotation and
+health checked with ``SELECT 1`` again after REPLICA_RETRY_INTERVAL
+seconds. When no replica is healthy, reads go to the primary.
+
+"""
+
+# Standard library imports
+import itertools
+import threading
+import time
+
+# Third-party imports
+from flask import current_app, has_request_context, request
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+# Methods whose queries may run on a replica
+READ_METHODS = {"GET", "HEAD"}
+
+
+class Replica:
+    """
+    A read replica engine and its health.
+
+    Attributes:
+        name (str): Label used in metrics ("replica-1", ...).
+        engine (Engine): Engine connected to the replica.
+        healthy (bool): False while the replica is out of rotation.
+        retry_at (float): Monotonic time of the next health check when unhealthy.
+        reads (int): Number of requests (sessions) routed to the replica.
+        failures (int): Number of connection failures seen.
+    """
+
+    def __init__(self, name, engine):
+        self.name = name
+        self.engine = engine
+        self.healthy = True
+        self.retry_at = 0.0
+        self.reads = 0
+        self.failures = 0
+
+
+class ReplicaRouter:
+    """
+    Flask extension managing read replica engines.
+
+    Attributes:
+        replicas (list[Replica]): Configured replicas, in DATABASE_REPLICA_URLS order.
+        retry_interval (int): Seconds before a failed replica is checked again.
+    """
+
+    def __init__(self, app=None):
+        self.replicas = []
+        self.retry_interval = 30
+        self._cycle = itertools.cycle(())
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Create an engine per replica URL from config."""
+        options = app.config.get("DATABASE_REPLICA_ENGINE_OPTIONS", {})
+        self.retry_interval = app.config.get("REPLICA_RETRY_INTERVAL", 30)
+        self.replicas = []
+        for number, url in enumerate(app.config.get("DATABASE_REPLICA_URLS", []), start=1):
+            engine = create_engine(url, **options.get(url, {}))
+            replica = Replica(f"replica-{number}", engine)
+            event.listen(engine, "handle_error", self._error_listener(replica))
+            self.replicas.append(replica)
+        self._cycle = itertools.cycle(self.replicas)
+        app.extensions["replicas"] = self
+
+    @property
+    def engines(self):
+        """Return the replica engines."""
+        return [replica.engine for replica in self.replicas]
+
+    def _error_listener(self, replica):
+        def on_error(context):
+            # Only connection failures count; a bad query says nothing about the replica
+            if context.is_disconnect or context.connection is None:
+                self.mark_unhealthy(replica)
+        return on_error
+
+    def mark_unhealthy(self, replica):
+        """Take a replica out of rotation until its next health check."""
+        with self._lock:
+            replica.healthy = False
+            replica.failures += 1
+            replica.retry_at = time.monotonic() + self.retry_interval
+
+    def record_read(self, replica):
+        """Count a request served by a replica."""
+        with self._lock:
+            replica.reads += 1
+
+    def mark_healthy(self, replica):
+        """Put a replica back into rotation."""
+        with self._lock:
+            replica.healthy = True
+
+    def _check(self, replica):
+        """Run ``SELECT 1`` on an unhealthy replica and restore it if it answers."""
+        try:
+            with replica.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+        except DBAPIError:
+            self.mark_unhealthy(replica)
+            return False
+        self.mark_healthy(replica)
+        return True
+
+    def next_replica(self):
+        """
+        Return the next replica in round-robin order, without checking it.
+
+        Returns:
+            tuple[Replica, bool]: The replica, and whether it is unhealthy
+            but due for a health check (the caller checks it, e.g. by
+            connecting, and marks it healthy or unhealthy).
+        """
+        with self._lock:
+            replica = next(self._cycle)
+            due = not replica.healthy and replica.retry_at <= time.monotonic()
+            if due:
+                # Push the next check out so concurrent requests skip it meanwhile
+                replica.retry_at = time.monotonic() + self.retry_interval
+        return replica, due
+
+    def choose(self):
+        """
+        Return the next healthy replica in round-robin order.
+
+        Returns:
+            Replica | None: The replica, or None if none is available.
+        """
+        for _ in range(len(self.replicas)):
+            replica, due = self.next_replica()
+            if replica.healthy or (due and self._check(replica)):
+                return replica
+        return None
+
+    def stats(self):
+        """Return the health and usage of each replica for the metrics endpoint."""
+        # Imported here to keep this module importable from extensions.py
+        from utils.pool import pool_stats
+        return [
+            {
+                "name": replica.name,
+                "url": replica.engine.url.render_as_string(hide_password=True),
+                "healthy": replica.healthy,
+                "reads": replica.reads,
+                "failures": replica.failures,
+                "pool": pool_stats(replica.engine),
+            }
+            for replica in self.replicas
+        ]
+
+
+class RoutingSession(FlaskSession):
+    """
+    Session routing the reads of GET/HEAD requests to a read replica.
+
+    The replica is chosen once per session (i.e. per request), so all reads
+    of a request see the same replica. If none can be reached the request
+    reads from the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._reads_from_replica():
+            if "replica" not in self.info:
+                self.info["replica"] = self._connect_replica()
+            replica = self.info["replica"]
+            if replica is not None and replica.healthy:
+                return replica.engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _connect_replica(self):
+        """
+        Choose a replica and open this session's connection to it.
+
+        Connecting up front means an unreachable replica is skipped (and
+        taken out of rotation) before any query is sent to it.
+
+        Returns:
+            Replica | None: The connected replica, or None to use the primary.
+        """
+        router = current_app.extensions["replicas"]
+        for _ in range(len(router.replicas)):
+            replica = router.choose()
+            if replica is None:
+                break
+            try:
+                self.connection(bind_arguments={"bind": replica.engine})
+            except DBAPIError:
+                # The engine's handle_error listener has usually marked it already
+                if replica.healthy:
+                    router.mark_unhealthy(replica)
+                continue
+            router.record_read(replica)
+            return replica
+        return None
+
+    def _reads_from_replica(self):
+        """Return True if this statement may run on a replica."""
+        return (
+            has_request_context()
+            and request.method in READ_METHODS
+            and not self.info.get("pinned_primary")
+            and not self._flushing
+            and not (self.new or self.dirty or self.deleted)
+            and bool(getattr(current_app.extensions.get("replicas"), "replicas", None))
+        )
+
+
+def _pin_after_flush(session, flush_context):
+    session.info["pinned_primary"] = True
+
+
+def _pin_on_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["pinned_primary"] = True
+
+
+event.listen(Session, "after_flush", _pin_after_flush)
+event.listen(Session, "do_orm_execute", _pin_on_write)
@@ -0,0 +1,177 @@
+"""
+Table Versions
+
+Keeps the version counters of the response cache and the ETags in the
+database, in the ``table_version`` table, instead of in each process:
+
+    - When a session commits, the versions of the tables it wrote
+      (including rows removed by ``ON DELETE CASCADE``, see
+      ``utils.cache``) are incremented in a short transaction of their own.
+      Writing transactions never touch ``table_version``, so concurrent
+      writers to a table do not queue on its counter row; each bump holds
+      the row only for its own one-statement transaction.
+    - DatabaseVersions reads the counters of the tables a request depends
+      on with one query, memoized for the rest of the request.
+
+A version is bumped just after the data it labels becomes visible. A
+request reading in between sees the new rows under the old version, which
+only caches fresh data under a key about to be replaced; a response is
+never cached (or tagged) under a version newer than its contents. If a
+process dies between its commit and the bump, the change shows once
+CACHE_DEFAULT_TTL expires the cached responses, or at the next write to
+the table.
+
+Writes made outside the app's sessions must bump the counters themselves:
+``flask db seed-scale`` and the migrations do, and other writers (psql,
+other services) run
+``UPDATE table_version SET version = version + 1 WHERE name = '<table>'``
+after committing.
+
+The counters are read through the request's session, so a GET routed to a
+read replica (see ``utils.replicas``) reads them from the same replica as
+its data. ``table_version`` replicates with the rows it counts, and the
+counters are read before the data, so a replica that lags behind the
+primary reports the version of the data it actually holds.
+
+The rows are created with the tables (``flask db create``) and added to
+existing databases by ``flask db migrate``.
+
+"""
+
+# Standard library imports
+import logging
+import time
+import uuid
+
+# Third-party imports
+from flask import g, has_request_context
+from sqlalchemy import column, select, table, text, update
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+VERSION_TABLE = "table_version"
+
+# Tables whose writes never change a cached response
+UNTRACKED_TABLES = {VERSION_TABLE, "idempotency_key"}
+
+# Versions of data that is not a table, bumped explicitly: "dashboard" by a
+# refresh of the materialized dashboard views (see utils.dashboard)
+DERIVED_VERSIONS = ("dashboard",)
+
+_versions = table(VERSION_TABLE, column("name"), column("version"))
+
+
+def versions_select(tables):
+    """Return the SELECT of the ``(name, version)`` counters of ``tables``."""
+    return select(_versions.c.name, _versions.c.version).where(_versions.c.name.in_(tables))
+
+
+def tracked_tables(metadata):
+    """Return the tables of ``metadata`` whose writes bump a version."""
+    return [t for t in metadata.sorted_tables if t.name not in UNTRACKED_TABLES]
+
+
+def install_version_rows(conn, metadata):
+    """
+    Create the version row of every tracked table and derived version (idempotent).
+
+    Also drops the version triggers created by earlier releases, which
+    bumped the counters inside every writing transaction.
+
+    Args:
+        conn (Connection): Connection in a transaction on the target database.
+        metadata (MetaData): Metadata listing the tables.
+    """
+    tables = tracked_tables(metadata)
+    # Versions start at a timestamp, so a recreated database never reuses them
+    start = time.time_ns() // 1000
+    for name in [*(tracked.name for tracked in tables), *DERIVED_VERSIONS]:
+        conn.execute(text(
+            f"INSERT INTO {VERSION_TABLE} (name, version) SELECT :name, :version "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {VERSION_TABLE} WHERE name = :name)"
+        ), {"name": name, "version": start})
+
+    if conn.dialect.name == "postgresql":
+        for tracked in tables:
+            conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {tracked.name}_version ON {tracked.name}")
+        conn.exec_driver_sql("DROP FUNCTION IF EXISTS bump_table_version()")
+    elif conn.dialect.name == "sqlite":
+        for tracked in tables:
+            for operation in ("insert", "update", "delete"):
+                conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {tracked.name}_version_{operation}")
+
+
+class DatabaseVersions:
+    """
+    Version store keeping the counters in the ``table_version`` table.
+
+    If the counters cannot be read (e.g. ``flask db migrate`` has not run
+    yet), every read returns fresh random versions, so nothing is served
+    from the cache and no ETag matches, instead of serving stale responses.
+    """
+
+    def __init__(self):
+        self._warned = False
+
+    def versions(self, tables):
+        memo = g.setdefault("_table_versions", {}) if has_request_context() else {}
+        missing = [name for name in tables if name not in memo]
+        if missing:
+            memo.update(self._read(missing))
+        return tuple(memo[name] for name in tables)
+
+    def _read(self, tables):
+        # Imported here because the extensions module imports utils.cache
+        from extensions import db
+        try:
+            # Through the session: the same database (replica) as the request's data
+            found = dict(db.session.execute(versions_select(tables)).all())
+        except DBAPIError as e:
+            db.session.rollback()
+            self.unavailable(e)
+            found = {}
+        return self.resolve(tables, found)
+
+    def resolve(self, tables, found):
+        """
+        Return the version of each table from the counters read.
+
+        Args:
+            tables (Iterable[str]): Table names.
+            found (dict[str, int]): Counters read with ``versions_select``.
+
+        Returns:
+            dict[str, int | str]: Version per table name.
+        """
+        # A table without a counter row can never be invalidated, so never match it
+        return {name: found.get(name, uuid.uuid4().hex) for name in tables}
+
+    def unavailable(self, error):
+        """Log (once) that the counters could not be read."""
+        if not self._warned:
+            logger.warning("Table versions unavailable, response cache bypassed: %s", error.orig)
+            self._warned = True
+
+    def epoch(self):
+        # Counters start at a timestamp, so they never restart at a used value
+        return "db"
+
+    def bump(self, tables):
+        # Imported here because the extensions module imports utils.cache
+        from extensions import db
+        if has_request_context():
+            # Versions read earlier in this request are now out of date
+            memo = g.get("_table_versions", {})
+            for name in tables:
+                memo.pop(name, None)
+        try:
+            # Its own transaction on the primary, after the write has committed
+            with db.engine.begin() as conn:
+                conn.execute(
+                    update(_versions)
+                    .where(_versions.c.name.in_(tables))
+                    .values(version=_versions.c.version + 1)
+                )
+        except DBAPIError as e:
+            logger.warning("Bumping the versions of %s failed: %s", ", ".join(tables), e.orig)
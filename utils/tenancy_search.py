@@ -0,0 +1,173 @@
+"""
+Tenancy Search
+
+Builds and runs the query behind GET /tenancies/search from parameters
+validated by ``TenancySearchSchema``.
+
+Filters:
+    - status: ``tenancy_status IN (...)`` (repeat the parameter or separate
+      values with commas).
+    - start_date / end_date: tenancies starting on or after / ending on or
+      before a date (the original search semantics).
+    - active_from / active_to: tenancies overlapping a date range, i.e.
+      ``start_date <= active_to AND (end_date IS NULL OR end_date >= active_from)``.
+    - property_id: tenancies of one property.
+
+Results are ordered by a sort key with ``id`` as tie-breaker and paginated
+with a keyset cursor, ``WHERE (sort_value, id) > (:value, :id)``, which the
+composite indexes on ``tenancy`` can seek into directly. The cursor is an
+opaque url-safe base64 token encoding the last row's sort value and id.
+
+"""
+
+# Standard library imports
+import datetime
+
+# Third-party imports
+from flask import request, abort
+from sqlalchemy import select, tuple_
+
+# Application modules
+from extensions import db
+from utils.pagination import get_limit, encode_cursor, decode_cursor
+from models.tenancy import Tenancy
+from schemas.tenancy_search_schema import tenancy_search_schema
+
+# Sort key -> (column, descending)
+SORT_COLUMNS = {
+    "id": (Tenancy.id, False),
+    "-id": (Tenancy.id, True),
+    "start_date": (Tenancy.start_date, False),
+    "-start_date": (Tenancy.start_date, True),
+}
+
+
+def get_search_args():
+    """
+    Read the search parameters from the query string and validate them.
+
+    Multi-valued ``status`` may be given as ``?status=a&status=b`` or
+    ``?status=a,b``.
+
+    Returns:
+        dict: Parameters loaded by ``tenancy_search_schema``.
+
+    Raises:
+        ValidationError: If a parameter is invalid.
+    """
+    args = request.args.to_dict()
+    statuses = [
+        status.strip()
+        for value in request.args.getlist("status")
+        for status in value.split(",")
+        if status.strip()
+    ]
+    if statuses:
+        args["status"] = statuses
+    else:
+        args.pop("status", None)
+    return tenancy_search_schema.load(args)
+
+
+def build_filters(params):
+    """
+    Translate validated search parameters into WHERE clauses.
+
+    Args:
+        params (dict): Parameters loaded by ``tenancy_search_schema`` or ``tenancy_filter_schema``.
+
+    Returns:
+        list[ColumnElement]: Clauses to pass to ``Select.where``.
+    """
+    clauses = []
+    if params.get("status"):
+        statuses = params["status"]
+        clauses.append(
+            Tenancy.tenancy_status == statuses[0] if len(statuses) == 1
+            else Tenancy.tenancy_status.in_(statuses)
+        )
+    if params.get("property_id") is not None:
+        clauses.append(Tenancy.property_id == params["property_id"])
+    if params.get("start_date") is not None:
+        clauses.append(Tenancy.start_date >= params["start_date"])
+    if params.get("end_date") is not None:
+        clauses.append(Tenancy.end_date <= params["end_date"])
+    if params.get("active_to") is not None:
+        clauses.append(Tenancy.start_date <= params["active_to"])
+    if params.get("active_from") is not None:
+        clauses.append(
+            Tenancy.end_date.is_(None) | (Tenancy.end_date >= params["active_from"])
+        )
+    return clauses
+
+
+def cursor_for(sort, tenancy):
+    """Return the opaque cursor pointing just after ``tenancy`` for a sort key."""
+    column, _ = SORT_COLUMNS[sort]
+    value = getattr(tenancy, column.key)
+    if isinstance(value, datetime.date):
+        value = value.isoformat()
+    return encode_cursor([sort, value, tenancy.id])
+
+
+def parse_cursor(sort, cursor):
+    """
+    Decode a cursor produced by ``cursor_for`` for the same sort key.
+
+    Returns:
+        tuple: The sort value and id of the last row of the previous page.
+
+    Raises:
+        BadRequest: If the cursor is malformed or was issued for another sort.
+    """
+    try:
+        cursor_sort, value, last_id = decode_cursor(cursor)
+        if cursor_sort != sort or not isinstance(last_id, int):
+            raise ValueError(cursor)
+        if SORT_COLUMNS[sort][0] is Tenancy.start_date:
+            value = datetime.date.fromisoformat(value)
+        elif not isinstance(value, int):
+            raise ValueError(cursor)
+    except (TypeError, ValueError):
+        abort(400, description="after must be a valid cursor")
+    return value, last_id
+
+
+def search(params, options=()):
+    """
+    Run a tenancy search and return one page of results.
+
+    Args:
+        params (dict): Parameters loaded by ``tenancy_search_schema``.
+        options (Iterable): Loader options for the rows (e.g. ``load_only``).
+
+    Returns:
+        tuple[list[Tenancy], str | None]: The tenancies for this page and the
+        cursor for the next page (None when this is the last page).
+    """
+    limit = get_limit(params.get("limit"))
+    sort = params["sort"]
+    column, descending = SORT_COLUMNS[sort]
+
+    stmt = select(Tenancy).where(*build_filters(params)).options(*options)
+    if params.get("after"):
+        value, last_id = parse_cursor(sort, params["after"])
+        if column is Tenancy.id:
+            position, last = Tenancy.id, last_id
+        else:
+            position, last = tuple_(column, Tenancy.id), tuple_(value, last_id)
+        stmt = stmt.where(position < last if descending else position > last)
+
+    if column is Tenancy.id:
+        order_by = [Tenancy.id.desc() if descending else Tenancy.id]
+    elif descending:
+        order_by = [column.desc(), Tenancy.id.desc()]
+    else:
+        order_by = [column, Tenancy.id]
+    stmt = stmt.order_by(*order_by).limit(limit + 1)
+
+    rows = db.session.scalars(stmt).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, cursor_for(sort, rows[-1])
+    return rows, None
@@ -0,0 +1,244 @@
+"""
+Text Search
+
+Ranked partial-match search over text columns, used by the ``/search?q=``
+endpoints of tenants, properties and support workers.
+
+On PostgreSQL the query runs in the database against the pg_trgm GIN
+indexes declared on the models:
+
+    WHERE col ILIKE '%q%' OR col %> 'q'
+    ORDER BY greatest(word_similarity('q', col), ...) DESC, id
+
+``%>`` matches rows whose column contains a word similar to ``q``
+(``pg_trgm.word_similarity_threshold``, 0.6 by default), so a misspelt
+fragment such as "jonson" still finds "Bob Johnson".
+
+Other databases (SQLite test runs) fall back to NGramIndex, an in-process
+inverted index of the same trigrams built from the searched columns. It is
+rebuilt when the table's version, bumped by the response cache on every
+commit, changes.
+
+Results are ranked by score (1.0 for a substring match) with ``id`` as
+tie-breaker and paginated with an opaque ``[score, id]`` cursor.
+
+"""
+
+# Standard library imports
+import re
+import threading
+
+# Third-party imports
+from flask import request, abort
+from sqlalchemy import Double, case, cast, func, or_, select
+
+# Application modules
+from extensions import db, cache
+from utils.pagination import get_limit, encode_cursor, decode_cursor
+
+# Minimum share of the query's trigrams a column must contain to match
+# (the fallback equivalent of pg_trgm.word_similarity_threshold)
+MATCH_THRESHOLD = 0.6
+MAX_QUERY_LENGTH = 100
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def get_search_query():
+    """
+    Read and validate the ``q`` query parameter.
+
+    Raises:
+        BadRequest: If ``q`` is missing, blank or too long.
+    """
+    query = request.args.get("q", "").strip()
+    if not query:
+        abort(400, description="q is required")
+    if len(query) > MAX_QUERY_LENGTH:
+        abort(400, description=f"q must be at most {MAX_QUERY_LENGTH} characters")
+    return query
+
+
+def trigrams(text):
+    """
+    Return the set of trigrams of a string, as pg_trgm extracts them.
+
+    Each lowercased word is padded with two spaces in front and one behind,
+    so "Ann" yields {"  a", " an", "ann", "nn "}.
+    """
+    grams = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class NGramIndex:
+    """
+    In-process trigram index over some text columns of a table.
+
+    Attributes:
+        postings (dict[str, set[int]]): Trigram -> ids of rows containing it.
+        texts (dict[int, list[tuple[str, set[str]]]]): Id -> lowercased
+            column values and their trigrams.
+    """
+
+    def __init__(self, rows):
+        """
+        Build the index.
+
+        Args:
+            rows (Iterable[tuple]): ``(id, value, value, ...)`` tuples.
+        """
+        self.postings = {}
+        self.texts = {}
+        for row_id, *values in rows:
+            entries = []
+            for value in values:
+                if not value:
+                    continue
+                grams = trigrams(value)
+                entries.append((value.lower(), grams))
+                for gram in grams:
+                    self.postings.setdefault(gram, set()).add(row_id)
+            self.texts[row_id] = entries
+
+    def score(self, row_id, query, query_grams):
+        """Return the best score of a row's columns (1.0 for a substring match)."""
+        best = 0.0
+        for text, grams in self.texts[row_id]:
+            if query in text:
+                return 1.0
+            if query_grams:
+                best = max(best, len(query_grams & grams) / len(query_grams))
+        return best
+
+    def search(self, query):
+        """
+        Return ``(score, id)`` pairs for matching rows, best match first.
+
+        Args:
+            query (str): Search text.
+        """
+        query = query.lower()
+        query_grams = trigrams(query)
+        if any(" " not in gram for gram in query_grams):
+            # A row containing the query contains its space-free trigrams, and
+            # a similar row shares at least one trigram with it
+            candidates = set().union(*(self.postings.get(gram, ()) for gram in query_grams))
+        else:
+            # Queries made only of one- and two-letter words ("jo") can only
+            # match as substrings
+            candidates = self.texts.keys()
+
+        results = []
+        for row_id in candidates:
+            score = self.score(row_id, query, query_grams)
+            if score >= MATCH_THRESHOLD:
+                results.append((score, row_id))
+        results.sort(key=lambda result: (-result[0], result[1]))
+        return results
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_ngram_index(model, columns):
+    """
+    Return the NGramIndex for a model's columns, rebuilding it if the table changed.
+
+    Args:
+        model (db.Model): Model to search.
+        columns (list[InstrumentedAttribute]): Text columns to index.
+    """
+    key = (model.__tablename__, tuple(column.key for column in columns))
+    stamp = cache.version_stamp((model.__tablename__,))
+    with _indexes_lock:
+        entry = _indexes.get(key)
+        if entry is None or entry[0] != stamp:
+            rows = db.session.execute(select(model.id, *columns)).all()
+            entry = (stamp, NGramIndex(rows))
+            _indexes[key] = entry
+    return entry[1]
+
+
+def _parse_cursor(cursor):
+    """Return the ``(score, id)`` of the last row of the previous page."""
+    values = decode_cursor(cursor)
+    if (
+        len(values) != 2
+        or not isinstance(values[0], (int, float))
+        or not isinstance(values[1], int)
+    ):
+        abort(400, description="after must be a valid cursor")
+    return float(values[0]), values[1]
+
+
+def _search_postgresql(model, columns, query, limit, after, options):
+    """Run the search in PostgreSQL using the pg_trgm indexes."""
+    substring = or_(*(column.icontains(query, autoescape=True) for column in columns))
+    similarities = [func.word_similarity(query, column) for column in columns]
+    similarity = func.greatest(*similarities) if len(similarities) > 1 else similarities[0]
+    match = or_(substring, *(column.op("%>", is_comparison=True)(query) for column in columns))
+    # A substring match ranks first, as in the fallback; double precision so
+    # the score round-trips exactly through the cursor
+    score = cast(case((substring, 1.0), else_=similarity), Double)
+
+    stmt = select(model, score.label("score")).where(match).options(*options)
+    if after is not None:
+        last_score, last_id = after
+        stmt = stmt.where((score < last_score) | ((score == last_score) & (model.id > last_id)))
+    stmt = stmt.order_by(score.desc(), model.id).limit(limit + 1)
+    return [(row.score, row[0]) for row in db.session.execute(stmt)]
+
+
+def _search_ngram(model, columns, query, limit, after, options):
+    """Run the search against the in-process NGramIndex."""
+    results = get_ngram_index(model, columns).search(query)
+    if after is not None:
+        last_score, last_id = after
+        results = [
+            (score, row_id) for score, row_id in results
+            if score < last_score or (score == last_score and row_id > last_id)
+        ]
+    results = results[:limit + 1]
+
+    ids = [row_id for _, row_id in results]
+    stmt = select(model).where(model.id.in_(ids)).options(*options)
+    rows = {row.id: row for row in db.session.scalars(stmt)}
+    # Rows deleted since the index was built are skipped
+    return [(score, rows[row_id]) for score, row_id in results if row_id in rows]
+
+
+def text_search(model, columns, options=()):
+    """
+    Return one page of rows whose columns match the ``q`` query parameter.
+
+    Args:
+        model (db.Model): Model to search.
+        columns (list[InstrumentedAttribute]): Text columns to match against.
+        options (Iterable): Loader options for the rows (e.g. ``load_only``).
+
+    Returns:
+        tuple[list[db.Model], str | None]: The rows for this page, best match
+        first, and the cursor for the next page.
+
+    Raises:
+        BadRequest: If ``q``, ``limit`` or ``after`` is invalid.
+    """
+    query = get_search_query()
+    limit = get_limit()
+    after = request.args.get("after")
+    after = _parse_cursor(after) if after else None
+
+    if db.session.get_bind().dialect.name == "postgresql":
+        results = _search_postgresql(model, columns, query, limit, after, options)
+    else:
+        results = _search_ngram(model, columns, query, limit, after, options)
+
+    if len(results) > limit:
+        results = results[:limit]
+        score, row = results[-1]
+        return [row for _, row in results], encode_cursor([score, row.id])
+    return [row for _, row in results], None
@@ -0,0 +1,97 @@
+"""
+Optimistic Concurrency
+
+Every entity model maps an integer ``version_id`` column as SQLAlchemy's
+``version_id_col``; the junction tables are only inserted and deleted, so
+they have none. Each ORM UPDATE or DELETE of a row adds
+``AND version_id = :loaded_version`` to its WHERE clause (and an UPDATE
+increments it), so a write based on a row another request changed in the
+meantime matches nothing and raises ``StaleDataError`` instead of silently
+overwriting it. No row locks are taken, so writers can run on any number
+of workers.
+
+Clients send the version they last read with a PUT (or DELETE), either as
+an ``If-Match`` header (``If-Match: "3"``, several values allowed) or as a
+``version_id`` field in the JSON body. The handler answers ``409 Conflict``
+when the row's current version differs; without either, the update is
+only protected against changes made between its own read and write.
+
+Set-based UPDATEs (``utils.bulk``) bypass the ORM's version check, so
+they increment ``version_id`` explicitly with ``version_bump``.
+
+"""
+
+# Third-party imports
+from flask import abort, request
+from marshmallow import ValidationError
+
+
+def expected_versions(payload=None):
+    """
+    Read the versions a write was based on from If-Match and the body.
+
+    Args:
+        payload (dict, optional): Request body; its "version_id" field is
+            removed so the rest can be loaded by the resource schema.
+
+    Returns:
+        tuple[dict | None, set[int] | None, int | None]: The body without
+        "version_id", the versions listed in If-Match (None if absent or
+        ``*``) and the version from the body (None if absent).
+
+    Raises:
+        ValidationError: If "version_id" or an If-Match value is not an integer.
+    """
+    header_versions = None
+    if request.if_match and not request.if_match.star_tag:
+        try:
+            header_versions = {int(tag) for tag in request.if_match.as_set(include_weak=True)}
+        except ValueError:
+            raise ValidationError({"If-Match": ["Must list integer versions."]})
+
+    body_version = None
+    if isinstance(payload, dict) and "version_id" in payload:
+        payload = dict(payload)
+        body_version = payload.pop("version_id")
+        if not isinstance(body_version, int) or isinstance(body_version, bool):
+            raise ValidationError({"version_id": ["Must be an integer."]})
+    return payload, header_versions, body_version
+
+
+def check_version(obj, header_versions, body_version):
+    """
+    Abort with 409 Conflict if ``obj`` is not at an expected version.
+
+    Args:
+        obj (db.Model): Row loaded for the write.
+        header_versions (set[int] | None): Versions from If-Match.
+        body_version (int | None): Version from the body.
+    """
+    if (
+        header_versions is not None and obj.version_id not in header_versions
+        or body_version is not None and obj.version_id != body_version
+    ):
+        abort(409, description=(
+            f"{type(obj).__name__} {obj.id} has been modified (current version "
+            f"{obj.version_id}); reload it and retry"
+        ))
+
+
+def stale(model, object_id):
+    """Abort with 409 Conflict for a row changed by another request during a write."""
+    abort(409, description=(
+        f"{model.__name__} {object_id} was modified by another request; reload it and retry"
+    ))
+
+
+def version_bump(model):
+    """
+    Return the SET clause incrementing ``version_id`` for a set-based UPDATE.
+
+    Returns:
+        dict: ``{"version_id": version_id + 1}``, or ``{}`` for an unversioned model.
+    """
+    column = model.__mapper__.version_id_col
+    if column is None:
+        return {}
+    return {column.key: column + 1}